@@ -1,7 +1,7 @@
 import streamlit as st
 import os
-from PIL import Image
 import config
+from utils.result_store_utils import restore_session_state
 
 # 상단 빈 박스 제거 (파일 상단에 추가)
 st.markdown("""
@@ -42,6 +42,9 @@ if "generated_paper" not in st.session_state:
 if "niche_topics" not in st.session_state:
     st.session_state.niche_topics = []
 
+# 새로고침/재시작 후에는 저장된 결과 복원
+restore_session_state()
+
 # 사이드바 - 진행 단계 표시 (시각적으로 개선)
 st.sidebar.title("연구 주제 선정 도우미")
 if os.path.exists(config.APP_ICON):
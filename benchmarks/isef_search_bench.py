@@ -0,0 +1,314 @@
+"""
+ISEF 검색 속도/품질 벤치마크.
+
+사용 예:
+    python -m benchmarks.isef_search_bench --out bench_isef.json
+    python -m benchmarks.isef_search_bench --engines hybrid bm25 --compare bench_isef_old.json
+
+측정 항목:
+    - 콜드 로드: 새 프로세스에서 load_isef_data (원본 xlsx부터 / 디스크 스냅샷부터) 시간, 첫 검색 시간, 최대 RSS
+    - 웜 질의: 엔진별 질의 지연 p50/p99
+    - 품질: benchmarks/isef_queries.json의 라벨 기준 recall@k, nDCG@k, MRR (전체/언어별)
+    - 융합 점검: hybrid(벡터+BM25 순위 융합)와 bm25를 함께 측정하면 지표별 차이와 bm25 이상인지 여부
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import config
+from utils import data_utils
+from utils.vector_utils import IvfIndex, top_k_similar
+
+QUERIES_PATH = os.path.join(os.path.dirname(__file__), "isef_queries.json")
+
+def load_queries(path=QUERIES_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["queries"]
+
+def relevance_grades(titles, query):
+    """
+    제목별 관련도 (0: 무관, 1: required 일치, 2: required + bonus 일치)를 반환합니다.
+    """
+    required = titles.str.contains(query["required"], case=False, regex=True, na=False)
+    bonus = titles.str.contains(query["bonus"], case=False, regex=True, na=False)
+    grades = required.astype(int) + (required & bonus).astype(int)
+    return dict(zip(titles.str.lower(), grades))
+
+def recall_at_k(retrieved_grades, total_relevant, k):
+    if total_relevant == 0:
+        return None
+    return sum(1 for grade in retrieved_grades[:k] if grade > 0) / min(k, total_relevant)
+
+def ndcg_at_k(retrieved_grades, all_grades, k):
+    ideal = sorted((g for g in all_grades if g > 0), reverse=True)[:k]
+    if not ideal:
+        return None
+    dcg = sum((2 ** g - 1) / math.log2(i + 2) for i, g in enumerate(retrieved_grades[:k]))
+    idcg = sum((2 ** g - 1) / math.log2(i + 2) for i, g in enumerate(ideal))
+    return dcg / idcg
+
+def reciprocal_rank(retrieved_grades):
+    for i, grade in enumerate(retrieved_grades):
+        if grade > 0:
+            return 1.0 / (i + 1)
+    return 0.0
+
+# --- 검색 엔진 (질의 -> 제목 리스트) ---
+
+def _legacy_substring(df, query, k):
+    """
+    초기 구현과 같은 방식 (공백 분리 키워드의 제목 부분 문자열 일치 개수) - 비교 기준선.
+    """
+    titles = df[data_utils.find_title_column(df)].astype(str)
+    lowered = titles.str.lower()
+    scores = np.zeros(len(df), dtype=np.int32)
+    for keyword in query.lower().split():
+        scores += lowered.str.contains(keyword, regex=False).to_numpy(dtype=np.int32)
+    order = np.argsort(-scores, kind="stable")[:k]
+    return [titles.iloc[i] for i in order if scores[i] > 0]
+
+def _hybrid(df, query, k):
+    return [topic["title"] for topic in data_utils.search_similar_topics(df, query, max_results=k)]
+
+def _bm25(df, query, k):
+    index = data_utils.get_isef_index(df)
+    titles = df[data_utils.find_title_column(df)]
+    return [titles.iloc[i] for i, _ in index.search(data_utils.expand_isef_query(df, query), top_k=k)]
+
+def _vector_exact(df, query, k):
+    model, matrix = data_utils.get_isef_vectors(df)
+    titles = df[data_utils.find_title_column(df)]
+    query_vector = model.transform(data_utils.expand_isef_query(df, query))
+    return [titles.iloc[i] for i, _ in top_k_similar(matrix, query_vector, k)]
+
+_ivf_cache = {}
+
+def _vector_ivf(df, query, k):
+    model, matrix = data_utils.get_isef_vectors(df)
+    if _ivf_cache.get("matrix") is not matrix:
+        _ivf_cache.update({"matrix": matrix, "ann": IvfIndex.train(matrix, n_lists=config.ANN_LISTS)})
+    titles = df[data_utils.find_title_column(df)]
+    query_vector = model.transform(data_utils.expand_isef_query(df, query))
+    hits = _ivf_cache["ann"].search(query_vector, k, n_probe=config.ANN_PROBES)
+    return [titles.iloc[i] for i, _ in hits]
+
+ENGINES = {
+    "hybrid": _hybrid,
+    "bm25": _bm25,
+    "vector_exact": _vector_exact,
+    "vector_ivf": _vector_ivf,
+    "legacy_substring": _legacy_substring,
+}
+
+# --- 측정 ---
+
+def _max_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+def probe_cold_load(cache_dir=None):
+    """
+    (별도 프로세스에서 실행) 로드 시간, 첫 검색 시간, 메모리를 JSON으로 출력합니다.
+    """
+    if cache_dir:
+        config.ISEF_CACHE_DIR = cache_dir
+    start = time.perf_counter()
+    df = data_utils.load_isef_data()
+    load_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    data_utils.search_similar_topics(df, "microplastic pollution in rivers")
+    first_query_seconds = time.perf_counter() - start
+    
+    print(json.dumps({
+        "load_seconds": load_seconds,
+        "first_query_seconds": first_query_seconds,
+        "rows": len(df),
+        "dataframe_mb": df.memory_usage(deep=True).sum() / (1024 * 1024),
+        "max_rss_mb": _max_rss_mb(),
+    }))
+
+def _run_probe(cache_dir=None):
+    command = [sys.executable, "-m", "benchmarks.isef_search_bench", "--probe-load"]
+    if cache_dir:
+        command += ["--cache-dir", cache_dir]
+    completed = subprocess.run(command, capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    return {"error": completed.stderr.strip().splitlines()[-1:] or "no output"}
+
+def measure_cold_load():
+    """
+    원본부터(빈 캐시 디렉터리) / 디스크 스냅샷부터 각각 새 프로세스에서 측정합니다.
+    """
+    with tempfile.TemporaryDirectory() as empty_cache:
+        from_source = _run_probe(empty_cache)
+    _run_probe()  # 스냅샷/색인 캐시 준비
+    from_snapshot = _run_probe()
+    return {"from_source": from_source, "from_snapshot": from_snapshot}
+
+def _percentile(values, q):
+    return float(np.percentile(values, q)) * 1000 if values else None
+
+def evaluate_engine(engine, df, queries, k, repeat):
+    """
+    엔진별 웜 지연(ms)과 품질 지표를 계산합니다.
+    """
+    titles = df[data_utils.find_title_column(df)].astype(str)
+    engine(df, queries[0]["query"], k)  # 색인 준비 (웜 측정에서 제외)
+    
+    latencies = []
+    per_query = []
+    for query in queries:
+        grades = relevance_grades(titles, query)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            retrieved = engine(df, query["query"], k)
+            latencies.append(time.perf_counter() - start)
+        
+        retrieved_grades = [grades.get(str(title).lower(), 0) for title in retrieved]
+        all_grades = list(grades.values())
+        per_query.append({
+            "id": query["id"],
+            "lang": query["lang"],
+            "query": query["query"],
+            f"recall@{k}": recall_at_k(retrieved_grades, sum(1 for g in all_grades if g > 0), k),
+            f"ndcg@{k}": ndcg_at_k(retrieved_grades, all_grades, k),
+            "mrr": reciprocal_rank(retrieved_grades),
+        })
+    
+    def average(metric, lang=None):
+        values = [q[metric] for q in per_query if q[metric] is not None and (lang is None or q["lang"] == lang)]
+        return sum(values) / len(values) if values else None
+    
+    quality = {}
+    for metric in (f"recall@{k}", f"ndcg@{k}", "mrr"):
+        quality[metric] = average(metric)
+        for lang in sorted({q["lang"] for q in per_query}):
+            quality[f"{metric}_{lang}"] = average(metric, lang)
+    
+    return {
+        "latency_ms": {"p50": _percentile(latencies, 50), "p99": _percentile(latencies, 99),
+                       "mean": float(np.mean(latencies)) * 1000, "samples": len(latencies)},
+        "quality": quality,
+        "per_query": per_query,
+    }
+
+def compare_engines(report, engine, reference):
+    """
+    engine의 전체 품질 지표가 reference 이상인지 지표별 차이와 함께 반환합니다.
+    """
+    k = report["settings"]["k"]
+    engines = report["engines"]
+    if engine not in engines or reference not in engines:
+        return None
+    deltas = {}
+    for metric in (f"recall@{k}", f"ndcg@{k}", "mrr"):
+        deltas[metric] = (engines[engine]["quality"][metric] or 0) - (engines[reference]["quality"][metric] or 0)
+    return {"engine": engine, "reference": reference, "deltas": deltas,
+            "at_least_as_good": all(delta >= -1e-9 for delta in deltas.values())}
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _dataset_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def run(engines, k=10, repeat=5, cold=True):
+    df = data_utils.load_isef_data()
+    queries = load_queries()
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": _git_revision(),
+        "environment": {"python": platform.python_version(), "numpy": np.__version__,
+                        "pandas": pd.__version__, "platform": platform.platform()},
+        "dataset": {"path": config.ISEF_DATA_PATH, "rows": len(df),
+                    "sha256": _dataset_hash(config.ISEF_DATA_PATH)},
+        "settings": {"k": k, "repeat": repeat, "queries": len(queries),
+                     "ann_lists": config.ANN_LISTS, "ann_probes": config.ANN_PROBES},
+        "cold_load": measure_cold_load() if cold else None,
+        "engines": {},
+    }
+    for name in engines:
+        report["engines"][name] = evaluate_engine(ENGINES[name], df, queries, k, repeat)
+    report["hybrid_vs_bm25"] = compare_engines(report, "hybrid", "bm25")
+    return report
+
+def print_summary(report, baseline=None):
+    k = report["settings"]["k"]
+    cold = report.get("cold_load") or {}
+    for label, probe in cold.items():
+        if "load_seconds" in probe:
+            print(f"[cold:{label}] load {probe['load_seconds']:.2f}s, first query {probe['first_query_seconds']:.2f}s, "
+                  f"rss {probe['max_rss_mb'] or 0:.0f}MB")
+    
+    print(f"{'engine':<18}{'p50 ms':>9}{'p99 ms':>9}{'recall@' + str(k):>11}{'ndcg@' + str(k):>9}{'mrr':>7}"
+          + ("   vs baseline (p50 / ndcg)" if baseline else ""))
+    for name, result in report["engines"].items():
+        latency, quality = result["latency_ms"], result["quality"]
+        line = (f"{name:<18}{latency['p50']:>9.2f}{latency['p99']:>9.2f}"
+                f"{quality[f'recall@{k}'] or 0:>11.3f}{quality[f'ndcg@{k}'] or 0:>9.3f}{quality['mrr']:>7.3f}")
+        old = (baseline or {}).get("engines", {}).get(name)
+        if old:
+            line += (f"   {latency['p50'] - old['latency_ms']['p50']:+.2f}ms"
+                     f" / {(quality[f'ndcg@{k}'] or 0) - (old['quality'].get(f'ndcg@{k}') or 0):+.3f}")
+        print(line)
+    
+    check = report.get("hybrid_vs_bm25")
+    if check:
+        deltas = ", ".join(f"{metric} {delta:+.3f}" for metric, delta in check["deltas"].items())
+        print(f"hybrid vs bm25: {deltas} → {'bm25 이상' if check['at_least_as_good'] else 'bm25보다 낮음'}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ISEF 검색 벤치마크")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5, help="질의별 반복 횟수 (지연 측정)")
+    parser.add_argument("--no-cold", action="store_true", help="콜드 로드 측정 생략")
+    parser.add_argument("--out", help="JSON 리포트 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 JSON 리포트")
+    parser.add_argument("--probe-load", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--cache-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    if args.probe_load:
+        probe_cold_load(args.cache_dir)
+        return
+    
+    report = run(args.engines, k=args.k, repeat=args.repeat, cold=not args.no_cold)
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_summary(report, baseline)
+    
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"리포트 저장: {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+앱/페이지 시작 시간 벤치마크 (모듈별 import 시간).
+
+사용 예:
+    python -m benchmarks.startup_bench --out bench_startup.json
+    python -m benchmarks.startup_bench --compare bench_startup_old.json
+    python -m benchmarks.startup_bench --render  # AppTest로 페이지 첫 렌더링 시간도 측정
+
+측정 항목:
+    - 진입점(app.py, pages/*.py): 새 프로세스에서 파일의 최상위 import 문만 실행했을 때의 import 시간과
+      가장 무거운 최상위 모듈 목록 (python -X importtime 기준, 반복 측정의 중앙값)
+    - utils 모듈: 모듈 하나만 새 프로세스에서 불러올 때의 import 시간
+    - (--render) streamlit.testing AppTest로 새 프로세스에서 페이지를 처음 실행하는 시간
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINTS = ["app.py"] + sorted(os.path.relpath(path, ROOT) for path in glob.glob(os.path.join(ROOT, "pages", "[0-9]*.py")))
+
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+def entry_imports(path):
+    """
+    진입점 파일의 최상위 import 문 소스 (Streamlit 화면 코드는 실행하지 않음).
+    """
+    with open(os.path.join(ROOT, path), encoding="utf-8") as f:
+        source = f.read()
+    tree = ast.parse(source)
+    statements = [ast.get_source_segment(source, node) for node in tree.body
+                  if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(statements)
+
+def utils_modules():
+    names = sorted(os.path.splitext(os.path.basename(path))[0] for path in glob.glob(os.path.join(ROOT, "utils", "*.py")))
+    return [f"utils.{name}" for name in names if name != "__init__"]
+
+def parse_import_times(stderr):
+    """
+    -X importtime 출력에서 최상위(들여쓰기 없는) 모듈별 누적 시간(ms)을 읽습니다.
+    """
+    top_level = {}
+    for line in stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match and len(match.group(3)) <= 1:
+            top_level[match.group(4)] = int(match.group(2)) / 1000
+    return top_level
+
+def _probe_imports(code):
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                               capture_output=True, text=True)
+    top_level = parse_import_times(completed.stderr)
+    if completed.returncode != 0:
+        errors = [line for line in completed.stderr.splitlines() if line and not line.startswith("import time:")]
+        return {"error": errors[-1] if errors else f"exit {completed.returncode}", "modules": top_level}
+    return {"modules": top_level}
+
+def measure_imports(code, repeat, top=8):
+    """
+    새 프로세스에서 code를 repeat번 실행해 import 시간 중앙값(ms)과 무거운 최상위 모듈을 반환합니다.
+    """
+    runs = [_probe_imports(code) for _ in range(repeat)]
+    error = next((run["error"] for run in runs if "error" in run), None)
+    totals = [sum(run["modules"].values()) for run in runs]
+    modules = {}
+    for run in runs:
+        for name, ms in run["modules"].items():
+            modules.setdefault(name, []).append(ms)
+    heaviest = sorted(((name, statistics.median(values)) for name, values in modules.items()),
+                      key=lambda item: item[1], reverse=True)[:top]
+    result = {"import_ms": statistics.median(totals), "heaviest": [{"module": name, "ms": ms} for name, ms in heaviest]}
+    if error:
+        result["error"] = error
+    return result
+
+_RENDER_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+loaded = time.perf_counter()
+at = AppTest.from_file(sys.argv[1]).run(timeout=60)
+done = time.perf_counter()
+print(json.dumps({"streamlit_ms": (loaded - start) * 1000, "first_run_ms": (done - loaded) * 1000,
+                  "exceptions": [str(e.value) for e in at.exception]}))
+"""
+
+def measure_render(path):
+    """
+    새 프로세스에서 AppTest로 페이지를 한 번 실행하는 시간 (세션 상태가 비어 있는 첫 화면).
+    """
+    completed = subprocess.run([sys.executable, "-c", _RENDER_PROBE, path], cwd=ROOT, capture_output=True, text=True)
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    return {"error": (completed.stderr.strip().splitlines() or ["no output"])[-1]}
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(repeat=5, modules=True, render=False):
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": _git_revision(),
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "settings": {"repeat": repeat},
+        "entry_points": {},
+        "modules": {},
+        "render": {},
+    }
+    for path in ENTRY_POINTS:
+        report["entry_points"][path] = measure_imports(entry_imports(path), repeat)
+    if modules:
+        for name in utils_modules():
+            report["modules"][name] = measure_imports(f"import {name}", repeat, top=3)
+    if render:
+        for path in ENTRY_POINTS:
+            report["render"][path] = measure_render(path)
+    return report
+
+def print_summary(report, baseline=None):
+    for section in ("entry_points", "modules"):
+        if not report[section]:
+            continue
+        print(f"{section:<34}{'import ms':>10}" + ("   vs baseline" if baseline else "") + "   heaviest")
+        for name, result in report[section].items():
+            line = f"{name:<34}{result['import_ms']:>10.1f}"
+            old = (baseline or {}).get(section, {}).get(name)
+            if baseline:
+                line += f"   {result['import_ms'] - old['import_ms']:+9.1f}ms" if old else f"   {'-':>11}"
+            line += "   " + ", ".join(f"{item['module']} {item['ms']:.0f}" for item in result["heaviest"][:4])
+            if "error" in result:
+                line += f"   [오류: {result['error']}]"
+            print(line)
+        print()
+    
+    for path, result in report["render"].items():
+        if "error" in result:
+            print(f"[render] {path}: 오류 ({result['error']})")
+        else:
+            print(f"[render] {path}: streamlit {result['streamlit_ms']:.0f}ms, 첫 실행 {result['first_run_ms']:.0f}ms"
+                  + (f", 예외 {len(result['exceptions'])}건" if result["exceptions"] else ""))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="앱/페이지 시작 시간 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5, help="진입점/모듈별 반복 측정 횟수 (중앙값 사용)")
+    parser.add_argument("--no-modules", action="store_true", help="utils 모듈별 측정 생략")
+    parser.add_argument("--render", action="store_true", help="AppTest로 페이지 첫 실행 시간 측정")
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args(argv)
+    
+    report = run(repeat=args.repeat, modules=not args.no_modules, render=args.render)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_summary(report, baseline)
+    
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
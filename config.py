@@ -1,6 +1,9 @@
 import os
+import sys
 from dotenv import load_dotenv
-import streamlit as st
+
+# Streamlit 앱으로 실행 중일 때만 st.secrets 사용 (CLI/배치에서는 Streamlit을 불러오지 않음)
+st = sys.modules.get("streamlit")
 
 # 환경 변수 로드 (로컬 개발용)
 load_dotenv()
@@ -8,9 +11,11 @@ load_dotenv()
 # 필수 API 키
 try:
     # Streamlit Cloud에서 실행 중인 경우
+    if st is None:
+        raise KeyError("OPENAI_API_KEY")
     OPENAI_API_KEY = st.secrets["OPENAI_API_KEY"]
     CROSSREF_EMAIL = st.secrets["CROSSREF_EMAIL"]
-except (KeyError, TypeError):
+except (KeyError, TypeError, FileNotFoundError):
     # 로컬에서 실행 중인 경우
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     CROSSREF_EMAIL = os.getenv("CROSSREF_EMAIL", "")
@@ -23,15 +28,95 @@ GPT_MODEL = "gpt-4-turbo" # 또는 "gpt-3.5-turbo" (비용 절감)
 MAX_TOKENS = 4000
 TEMPERATURE = 0.7
 
+# 응답 시간 예산 (초)
+OPENAI_TIMEOUT = 90  # GPT 호출 1회 최대 대기 시간
+HTTP_TIMEOUT = 10  # 논문 검색 API 호출 1회 최대 대기 시간
+STEP_SLO = {  # 단계별 전체 응답 시간 목표
+    "analyze_topic": 120,
+    "similar_topics": 150,
+    "niche_topics": 120,
+    "paper_generation": 150,
+}
+GENERATION_RESERVE = 60  # 검색/평가 단계가 최종 생성 단계를 위해 남겨둘 시간
+MIN_CALL_BUDGET = 3  # 이보다 남은 시간이 적으면 호출을 건너뜀
+# 모든 세션이 함께 쓰는 외부 호출(GPT, 논문 검색 API) 동시 실행 상한 (세션별로 번갈아 실행)
+POOL_MAX_WORKERS = 8
+
 # 앱 설정
 APP_TITLE = "연구 주제 선정 도우미 AI"
 APP_ICON = "assets/logo.png"
 ISEF_DATA_PATH = "data/isef_data.xlsx"
+ISEF_CACHE_DIR = "data/.cache"  # 컬럼형 스냅샷 저장 위치
+ISEF_CATEGORY_RATIO = 0.5  # 고유값 비율이 이 이하인 문자열 컬럼은 category로 저장
+ISEF_TITLE_WEIGHT = 2.0  # BM25 점수에서 제목 필드 가중치 (초록 대비)
+ISEF_HASH_DIM = 2 ** 15  # 해시 n-gram 특성 공간 크기
+ISEF_VECTOR_DIM = 128  # SVD로 줄인 프로젝트 벡터 차원
+ISEF_RRF_K = 60  # 벡터/BM25 순위 융합(RRF) 상수 (클수록 상위 순위 간 차이가 줄어듦)
+ISEF_CANDIDATE_FACTOR = 2  # 융합 전에 벡터/BM25 각각에서 가져올 후보 수 (max_results의 배수)
+ISEF_MAX_SEGMENTS = 4  # 추가 세그먼트가 이보다 많아지면 적재 후 백그라운드 병합
+ISEF_MERGE_GRACE_SECONDS = 3600  # 아직 공개되지 않은 병합 세그먼트를 정리하지 않고 기다리는 시간
+GLOSSARY_PATH = "data/ko_en_glossary.json"  # 한국어 질의 번역용 한영 연구 용어집
+
+# 근사 최근접 이웃(IVF) 색인 - 행 수가 ANN_MIN_ROWS 이상일 때만 사용 (그 미만은 전수 비교)
+ANN_MIN_ROWS = 50000
+ANN_LISTS = 0  # 군집 수 (0이면 sqrt(행 수))
+ANN_PROBES = 16  # 질의 시 탐색할 군집 수 (클수록 재현율↑, 지연↑)
+# 벡터 유사도가 이 이상이면 GPT 관련성 평가 없이 관련 논문으로 판단
+VECTOR_RELEVANCE_THRESHOLD = 0.6
+
+# PDF 캐시 (논문 내용 해시 기준)
+PDF_CACHE_DIR = "data/.cache/pdf"
+PDF_CACHE_MEMORY_ITEMS = 32  # 메모리 LRU 최대 항목 수
+PDF_CACHE_DISK_MB = 200  # 디스크 캐시 최대 크기
+PDF_LAYOUT_CACHE_ITEMS = 512  # 섹션별 줄 배치 결과 LRU 최대 항목 수
+# 큰 PDF 미리보기를 base64로 페이지에 넣지 않고 Streamlit 정적 경로로 제공
+# (.streamlit/config.toml 의 [server] enableStaticServing = true 필요, 디렉터리는 static/ 아래여야 함)
+PDF_STATIC_PREVIEW = False
+PDF_STATIC_DIR = "static/pdf"
+PDF_INLINE_PREVIEW_MAX_KB = 1024  # 이보다 큰 PDF만 정적 경로로 제공
+
+# 단계별 생성 결과 저장소 (새로고침/재시작 후 복원, 세션 토큰 + 주제 기준)
+RESULT_STORE_PATH = "data/results.db"
+RESULT_STORE_MAX_AGE_DAYS = 30  # 이보다 오래된 결과는 삭제
+
+# 주제 일괄 처리 (python -m utils.batch_utils)
+BATCH_WORKERS = 4  # 동시에 처리할 (주제, 단계) 작업 수
+BATCH_GPT_CALLS_PER_MINUTE = 60  # GPT 호출 속도 상한
+BATCH_STEP_TIMEOUT = 900  # 호출 대기 시간을 포함한 단계별 시간 예산 (초)
 
 # 검색 설정
 MAX_SIMILAR_TOPICS = 10
 MAX_ARXIV_RESULTS = 5
 MAX_CROSSREF_RESULTS = 5
+# 주제별 근거 논문 (모든 단계가 한 번의 검색 결과를 나눠 씀)
+EVIDENCE_MAX_RESULTS = 10  # 제공처별 검색 건수
+EVIDENCE_MAX_TOTAL = 20  # 병합 후 보관할 최대 논문 수
+EVIDENCE_CACHE_SIZE = 200  # 보관할 주제 수
+EVIDENCE_TTL_SECONDS = 3600  # 이 시간이 지나면 다시 검색
+EVIDENCE_DEGRADED_TTL_SECONDS = 60  # 결과를 못 받은 제공처가 있던 부분 결과의 재사용 시간 (0이면 저장하지 않음)
+
+# 로컬 논문 색인 (python -m utils.paper_index_utils ingest 로 생성)
+LOCAL_PAPER_INDEX_PATH = "data/paper_index.db"
+# True이면 로컬 색인만 사용하고 arXiv/Crossref API를 호출하지 않음
+OFFLINE_SEARCH_ONLY = False
+
+# 심층 검색 (Crossref cursor / arXiv start 페이지네이션)
+DEEP_RETRIEVAL = False
+DEEP_PAGE_SIZE = 25
+DEEP_MAX_RECORDS = 200  # 제공처별 최대 수집 건수
+DEEP_TARGET_CANDIDATES = 8  # 이 개수만큼 고득점 후보가 모이면 조기 종료
+DEEP_MIN_SCORE = 0.7
+ARXIV_PAGE_INTERVAL = 3.0  # arXiv 페이지 요청 간격 (초)
+
+# 검색 제공처 서킷 브레이커
+BREAKER_WINDOW_SECONDS = 60  # 오류율/지연 집계 구간
+BREAKER_MIN_CALLS = 4  # 판단에 필요한 최소 호출 수
+BREAKER_ERROR_RATE = 0.5  # 이 비율 이상 실패하면 차단
+BREAKER_SLOW_CALL_SECONDS = 8  # 이보다 오래 걸린 호출은 지연 호출로 집계
+BREAKER_SLOW_CALL_RATE = 0.8  # 이 비율 이상 지연 호출이면 차단
+BREAKER_OPEN_SECONDS = 30  # 차단 유지 시간 (이후 시험 호출)
+BREAKER_HALF_OPEN_CALLS = 1  # 동시에 허용할 시험 호출 수
+RECENT_SEARCH_CACHE_SIZE = 200  # 차단 시 대체용 최근 검색 결과 수
 
 # 페이지 경로
 PAGES = {
@@ -2,6 +2,7 @@ import streamlit as st
 from utils.gpt_utils import analyze_topic
 import time
 import re
+from utils.result_store_utils import restore_session_state, set_session_topic, remember_result
 
 # 상단 빈 박스 제거
 st.markdown("""
@@ -80,6 +81,9 @@ def show_analysis_step(container, step_message, delay=0.6):
     container.markdown(f'<div class="analysis-step-message">{step_message}</div>', unsafe_allow_html=True)
     time.sleep(delay)
 
+# 새로고침/재시작 후에는 저장된 결과 복원
+restore_session_state()
+
 # 콘텐츠 컨테이너로 감싸기
 st.markdown('<div class="content-container">', unsafe_allow_html=True)
 
@@ -108,8 +112,8 @@ with st.form("topic_input_form"):
 st.markdown('</div>', unsafe_allow_html=True)
 
 if submit_button and topic:
-    # 입력 값 세션 상태에 저장
-    st.session_state.topic = topic
+    # 입력 값 세션 상태에 저장 (같은 주제로 저장된 결과가 있으면 함께 불러옴)
+    stored_results = set_session_topic(topic)
     
     # 분석 상태 컨테이너
     analysis_status = st.empty()
@@ -118,20 +122,23 @@ if submit_button and topic:
     result_title = st.empty()
     result_content = st.empty()
     
-    # 단계별 분석 상태 표시 - 시간 간격 조정
-    show_analysis_step(analysis_status, "🔍 주제 키워드를 추출하고 있습니다...", delay=0.7)
-    show_analysis_step(analysis_status, "📚 관련 학문 분야를 식별하고 있습니다...", delay=0.7)
-    show_analysis_step(analysis_status, "🧠 주제의 핵심 개념을 정의하고 있습니다...", delay=0.8)
-    show_analysis_step(analysis_status, "🔄 학술 데이터베이스에서 관련 자료를 검색하고 있습니다...", delay=0.9)
-    show_analysis_step(analysis_status, "⚙️ 수집된 정보를 종합적으로 분석하고 있습니다...", delay=0.8)
-    show_analysis_step(analysis_status, "📝 최종 분석 결과를 생성하고 있습니다...", delay=0.8)
-    
-    # GPT API를 통한 주제 분석
-    analysis_result = analyze_topic(topic)
+    # 이미 분석한 주제면 다시 생성하지 않고 저장된 결과 사용
+    analysis_result = stored_results.get("topic_analysis")
+    if not analysis_result:
+        # 단계별 분석 상태 표시 - 시간 간격 조정
+        show_analysis_step(analysis_status, "🔍 주제 키워드를 추출하고 있습니다...", delay=0.7)
+        show_analysis_step(analysis_status, "📚 관련 학문 분야를 식별하고 있습니다...", delay=0.7)
+        show_analysis_step(analysis_status, "🧠 주제의 핵심 개념을 정의하고 있습니다...", delay=0.8)
+        show_analysis_step(analysis_status, "🔄 학술 데이터베이스에서 관련 자료를 검색하고 있습니다...", delay=0.9)
+        show_analysis_step(analysis_status, "⚙️ 수집된 정보를 종합적으로 분석하고 있습니다...", delay=0.8)
+        show_analysis_step(analysis_status, "📝 최종 분석 결과를 생성하고 있습니다...", delay=0.8)
+        
+        # GPT API를 통한 주제 분석
+        analysis_result = analyze_topic(topic)
     
     if analysis_result:
-        # 분석 결과 저장
-        st.session_state.topic_analysis = analysis_result
+        # 분석 결과 저장 (새로고침/재시작 후 복원용으로 저장소에도 저장)
+        remember_result("topic_analysis", analysis_result)
         
         # 완료 메시지 표시
         analysis_status.markdown('<div class="analysis-complete">✅ 분석이 완료되었습니다!</div>', unsafe_allow_html=True)
@@ -163,4 +170,17 @@ elif "topic_analysis" in st.session_state and st.session_state.topic_analysis:
     original_text = st.session_state.topic_analysis["full_text"]
     formatted_text = format_text_with_section_titles(original_text)
     
-    st.markdown('<div class="analysis-result-title">주제 분석
+    st.markdown('<div class="analysis-result-title">주제 분석 결과</div>', unsafe_allow_html=True)
+    st.markdown(formatted_text, unsafe_allow_html=True)
+    
+    # 다음 단계로 이동 버튼
+    st.markdown('<div class="button-container">', unsafe_allow_html=True)
+    btn_col1, btn_col2, btn_col3 = st.columns([1, 2, 1])
+    with btn_col2:
+        if st.button("유사 주제 찾기 →", use_container_width=True):
+            st.session_state.step = 2
+            st.switch_page("pages/2_Similar_Topics.py")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+# 컨테이너 닫기
+st.markdown('</div>', unsafe_allow_html=True)
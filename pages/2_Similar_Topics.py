@@ -1,9 +1,14 @@
 import streamlit as st
-import pandas as pd
 import re
 import time
-from utils.data_utils import load_isef_data, search_similar_topics
-from utils.gpt_utils import generate_similar_topics, get_completion
+from utils.data_utils import load_isef_data, search_similar_topics, isef_facet_counts
+from utils.gpt_utils import generate_similar_topics, get_completion, unavailable_providers
+from utils.deadline_utils import Deadline
+from utils.breaker_utils import breaker_states
+from utils.pool_utils import pool_stats
+from utils.prompt_utils import prompt_cache_stats
+import config
+from utils.result_store_utils import restore_session_state, remember_result, forget_result
 
 # 관련성 배지 HTML 생성 함수
 def get_relevance_badge(score):
@@ -39,6 +44,9 @@ def typing_effect(container, text, speed=0.05, chunk_size=10):
             time.sleep(speed)
 
 # 메인 코드 시작
+# 새로고침/재시작 후에는 저장된 결과 복원
+restore_session_state()
+
 st.title("2. 유사 연구 주제")
 
 # 주제가 없으면 첫 페이지로 리다이렉트
@@ -51,6 +59,14 @@ else:
     
     # 유사 주제 검색 시작
     if "similar_topics" not in st.session_state or not st.session_state.similar_topics:
+        # 이 단계 전체의 응답 시간 예산 (상태 메시지 표시 시간 포함)
+        deadline = Deadline(config.STEP_SLO["similar_topics"])
+        
+        # 장애로 차단된 제공처 안내 (최근 결과/로컬 색인/ISEF로 대체)
+        blocked = unavailable_providers()
+        if blocked:
+            st.info(f"{', '.join(blocked)} 응답이 불안정하여 최근 검색 결과와 내부 데이터베이스로 대체합니다.")
+        
         # 검색 상태 컨테이너
         search_status = st.empty()
         
@@ -63,10 +79,10 @@ else:
         show_analysis_step(search_status, "🧠 인공지능으로 추가 유사 주제를 생성하고 있습니다...")
         
         # generate_similar_topics 함수 사용 (gpt_utils.py에서 제공)
-        similar_topics_result = generate_similar_topics(st.session_state.topic, count=5)
+        similar_topics_result = generate_similar_topics(st.session_state.topic, count=5, deadline=deadline)
         
-        # 모든 결과 저장
-        st.session_state.similar_topics = similar_topics_result
+        # 모든 결과 저장 (새로고침/재시작 후 복원용으로 저장소에도 저장)
+        remember_result("similar_topics", similar_topics_result)
         
         # 완료 메시지 표시
         search_status.markdown('<div class="analysis-complete">✅ 유사 주제 검색이 완료되었습니다!</div>', unsafe_allow_html=True)
@@ -191,7 +207,25 @@ else:
     st.markdown('<div class="section-title">내부 데이터베이스에서 발견된 유사 주제</div>', unsafe_allow_html=True)
     
     isef_data = load_isef_data()
-    isef_results = search_similar_topics(isef_data, st.session_state.topic)
+    
+    # 분야/연도 필터 (패싯 비트셋으로 검색 전에 후보 제한)
+    selected_categories = st.session_state.get("isef_categories") or None
+    selected_years = st.session_state.get("isef_years")
+    if selected_years:
+        selected_years = list(range(selected_years[0], selected_years[1] + 1))
+    facet_counts = isef_facet_counts(isef_data, categories=selected_categories, years=selected_years)
+    if facet_counts["year"]:
+        with st.expander("분야/연도 필터", expanded=False):
+            category_counts = facet_counts["category"]
+            st.multiselect("분야", sorted(category_counts), key="isef_categories",
+                           format_func=lambda c: f"{c} ({category_counts[c]})")
+            year_values = sorted(facet_counts["year"])
+            if year_values[0] < year_values[-1]:
+                st.slider("연도", year_values[0], year_values[-1], value=(year_values[0], year_values[-1]), key="isef_years")
+            st.caption(" · ".join(f"{year}: {count}건" for year, count in sorted(facet_counts["year"].items()) if count))
+    
+    isef_results = search_similar_topics(isef_data, st.session_state.topic,
+                                         categories=selected_categories, years=selected_years)
     
     if isef_results:
         # 관련성 평가
@@ -199,9 +233,8 @@ else:
             if 'relevance_score' not in result:
                 result['relevance_score'] = 0.5  # 기본값
         
-        # 관련성 점수로 정렬 및 필터링
+        # 관련성 점수로 필터링 (순서는 검색의 융합 순위를 그대로 사용)
         isef_results = [r for r in isef_results if r['relevance_score'] >= 0.5]
-        isef_results.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
         
         # ISEF 결과 표시 (최대 5개)
         for i, topic in enumerate(isef_results[:5], 1):
@@ -224,11 +257,23 @@ else:
     else:
         st.markdown('<div class="section-content">내부 데이터베이스에서 유사한 주제를 찾지 못했습니다.</div>', unsafe_allow_html=True)
     
+    # 검색 제공처 상태 (모니터링용)
+    states = breaker_states()
+    if states:
+        with st.expander("검색 제공처 상태", expanded=False):
+            st.dataframe(list(states.values()), hide_index=True)
+            pool = pool_stats()
+            st.caption(f"외부 호출 풀: 실행 {pool['running']}/{pool['max_workers']}, 대기 {pool['queued']}건 "
+                       f"({pool['queued_sessions']}개 세션), 큐 대기 p50 {pool['wait_p50']:.2f}초 / "
+                       f"p95 {pool['wait_p95']:.2f}초")
+            usage = prompt_cache_stats()["total"]
+            st.caption(f"GPT 프롬프트 캐시: 호출 {usage['calls']}회, 입력 토큰 {usage['prompt_tokens']:,}개 중 "
+                       f"{usage['cached_tokens']:,}개 캐시 ({usage['cache_ratio']:.0%})")
+    
     # 새로 검색하기 버튼
     if st.button("유사 주제 다시 검색", key="refresh_search", use_container_width=False):
         # 유사 주제 결과 초기화
-        if "similar_topics" in st.session_state:
-            del st.session_state.similar_topics
+        forget_result("similar_topics")
         st.experimental_rerun()
     
     # 되돌아가기 버튼
@@ -1,6 +1,10 @@
 import streamlit as st
 import time
 from utils.gpt_utils import generate_paper_structure
+from utils.result_store_utils import restore_session_state, remember_result
+
+# 새로고침/재시작 후에는 저장된 결과 복원
+restore_session_state()
 
 # 콘텐츠 컨테이너로 감싸기
 st.markdown('<div class="content-container">', unsafe_allow_html=True)
@@ -34,12 +38,12 @@ else:
         paper_result = generate_paper_structure(st.session_state.selected_topic)
         
         if paper_result and "content" in paper_result:
-            # 논문 콘텐츠 저장
-            st.session_state.generated_paper = {
+            # 논문 콘텐츠 저장 (새로고침/재시작 후 복원용으로 저장소에도 저장)
+            remember_result("generated_paper", {
                 "topic": st.session_state.selected_topic,
                 "content": paper_result["content"],
                 "papers": paper_result.get("papers", [])
-            }
+            })
             
             # A4 형식 논문 표시 컨테이너
             paper_container.empty()
@@ -1,7 +1,12 @@
 import streamlit as st
 import base64
-from utils.pdf_utils import create_research_paper_pdf
-import os
+from utils.pdf_utils import get_research_paper_pdf, get_pdf_static_url
+from utils.paper_parse_utils import parse_paper_markdown
+import config
+from utils.result_store_utils import restore_session_state
+
+# 새로고침/재시작 후에는 저장된 결과 복원
+restore_session_state()
 
 # 페이지 제목
 st.title("4. PDF 보기")
@@ -16,40 +21,33 @@ else:
     
     # PDF 파일 생성
     with st.spinner("PDF를 생성하고 있습니다..."):
-        # 논문 데이터 구조화 (실제 구현 시 파싱 필요)
-        # 간단화를 위해 임의 구조화
-        paper_data = {
-            'title': st.session_state.generated_paper['title'],
-            'authors': st.session_state.generated_paper['authors'],
-            'abstract': "이 연구는...",  # 실제 구현 시 파싱 필요
-            'introduction': "서론...",   # 실제 구현 시 파싱 필요
-            'methods': "연구 방법...",    # 실제 구현 시 파싱 필요
-            'results': "예상 결과...",    # 실제 구현 시 파싱 필요
-            'conclusion': "결론...",     # 실제 구현 시 파싱 필요
-            'references': ["참고문헌1", "참고문헌2"]  # 실제 구현 시 파싱 필요
-        }
+        # 생성된 논문 마크다운을 섹션별 논문 데이터로 구조화
+        generated_paper = st.session_state.generated_paper
+        paper_data = parse_paper_markdown(generated_paper['content'],
+                                          topic=generated_paper.get('topic', ''),
+                                          papers=generated_paper.get('papers'))
         
-        pdf_path = create_research_paper_pdf(paper_data)
+        # 같은 내용이면 캐시된 PDF를 그대로 사용 (재실행/버튼 클릭 시 다시 만들지 않음)
+        pdf_bytes = get_research_paper_pdf(paper_data)
     
-    if pdf_path and os.path.exists(pdf_path):
-        # PDF 파일 표시
-        with open(pdf_path, "rb") as f:
-            base64_pdf = base64.b64encode(f.read()).decode('utf-8')
+    if pdf_bytes:
+        # 큰 PDF는 정적 경로로 제공하고, 그 외에는 미리보기용 base64 인코딩
+        if config.PDF_STATIC_PREVIEW and len(pdf_bytes) > config.PDF_INLINE_PREVIEW_MAX_KB * 1024:
+            pdf_src = get_pdf_static_url(paper_data, pdf_bytes)
+        else:
+            pdf_src = f"data:application/pdf;base64,{base64.b64encode(pdf_bytes).decode('utf-8')}"
         
         # PDF 표시
-        pdf_display = f'<iframe src="data:application/pdf;base64,{base64_pdf}" width="100%" height="600" type="application/pdf"></iframe>'
+        pdf_display = f'<iframe src="{pdf_src}" width="100%" height="600" type="application/pdf"></iframe>'
         st.markdown(pdf_display, unsafe_allow_html=True)
         
-        # 다운로드 버튼
+        # 다운로드 버튼 (미리보기와 같은 bytes 객체를 그대로 사용)
         st.download_button(
             label="PDF 다운로드",
-            data=open(pdf_path, "rb"),
+            data=pdf_bytes,
             file_name=f"{st.session_state.selected_topic.replace(' ', '_')}.pdf",
             mime="application/pdf"
         )
-        
-        # 임시 파일 삭제 (선택 사항)
-        # os.remove(pdf_path)
     else:
         st.error("PDF 생성 중 오류가 발생했습니다.")
     
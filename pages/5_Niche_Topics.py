@@ -1,6 +1,10 @@
 import streamlit as st
 import time
 from utils.gpt_utils import generate_niche_topics
+from utils.result_store_utils import restore_session_state, remember_result, clear_session
+
+# 새로고침/재시작 후에는 저장된 결과 복원
+restore_session_state()
 
 # 페이지 제목
 st.title("5. 틈새 연구 주제 제안")
@@ -23,14 +27,14 @@ else:
         niche_topics_content = generate_niche_topics(st.session_state.selected_topic)
         
         if niche_topics_content:
-            # 틈새 주제 저장
-            st.session_state.niche_topics = niche_topics_content
+            # 틈새 주제 저장 (새로고침/재시작 후 복원용으로 저장소에도 저장)
+            remember_result("niche_topics", niche_topics_content)
             
             # 타이핑 효과 구현 (간단한 버전)
             niche_container.empty()
             typing_container = st.empty()
             
-            full_text = niche_topics_content
+            full_text = niche_topics_content["content"]
             displayed_text = ""
             
             # 실제 서비스에서는 WebSocket으로 스트리밍 구현
@@ -44,7 +48,7 @@ else:
     
     # 이미 생성된 틈새 주제가 있으면 표시
     else:
-        st.markdown(st.session_state.niche_topics)
+        st.markdown(st.session_state.niche_topics["content"])
     
     # 새로운 틈새 주제 연구 시작 버튼 (실제 구현 시 파싱 및 처리 필요)
     st.markdown("### 새로운 틈새 주제로 연구 시작하기")
@@ -77,9 +81,11 @@ else:
     
     # 처음으로 돌아가기 버튼
     if st.button("처음으로 돌아가기"):
-        # 세션 초기화
+        # 세션 초기화 (저장소의 현재 주제와 결과도 지워 새로고침 후 복원되지 않게 함)
+        clear_session()
         for key in list(st.session_state.keys()):
-            if key != "step":
+            # 결과 저장소 세션 토큰은 유지
+            if key not in ("step", "result_session"):
                 st.session_state.pop(key, None)
         st.session_state.step = 1
         st.switch_page("pages/1_Topic_Input.py")
@@ -88,93 +94,3 @@ else:
     if st.button("PDF 보기로 돌아가기"):
         st.session_state.step = 4
         st.switch_page("pages/4_PDF_View.py")
-
-/* 전체 앱 스타일 */
-.stApp {
-    font-family: 'Roboto', 'Noto Sans KR', sans-serif;
-}
-
-/* 사이드바 스타일 */
-.sidebar .sidebar-content {
-    background-color: #f8f9fa;
-}
-
-/* 타이핑 효과 애니메이션 */
-@keyframes typing {
-    from { width: 0 }
-    to { width: 100% }
-}
-
-.typing-effect {
-    overflow: hidden;
-    border-right: .15em solid #4CAF50;
-    white-space: nowrap;
-    margin: 0 auto;
-    animation: 
-        typing 3.5s steps(40, end),
-        blink-caret .75s step-end infinite;
-}
-
-/* 논문 스타일 - A4 형식 */
-.paper-container {
-    max-width: 800px;
-    margin: 0 auto;
-    padding: 40px;
-    background-color: white;
-    box-shadow: 0 0 10px rgba(0,0,0,0.1);
-}
-
-.paper-title {
-    font-size: 24px;
-    font-weight: bold;
-    text-align: center;
-    margin-bottom: 20px;
-}
-
-.paper-authors {
-    font-size: 16px;
-    font-style: italic;
-    text-align: center;
-    margin-bottom: 30px;
-}
-
-.paper-section-title {
-    font-size: 18px;
-    font-weight: bold;
-    margin-top: 25px;
-    margin-bottom: 10px;
-}
-
-.paper-content {
-    font-size: 14px;
-    line-height: 1.6;
-    text-align: justify;
-}
-
-/* 버튼 스타일 */
-.stButton > button {
-    border-radius: 20px;
-    padding: 10px 24px;
-    background-color: #4CAF50;
-    color: white;
-}
-
-.stButton > button:hover {
-    background-color: #45a049;
-}
-
-/* 진행 단계 표시 */
-.step-progress {
-    margin-bottom: 20px;
-}
-
-.step-item {
-    padding: 8px;
-    border-radius: 5px;
-}
-
-.step-active {
-    background-color: #e6f7e6;
-    border-left: 3px solid #4CAF50;
-    font-weight: bold;
-}
@@ -1,14 +1,15 @@
 import requests
 import time
-import arxiv
 import config
-from habanero import Crossref
 
 def search_arxiv(query, max_results=config.MAX_ARXIV_RESULTS):
     """
     arXiv API를 사용하여 학술 논문을 검색합니다.
     """
     try:
+        # arxiv 패키지는 처음 검색할 때 불러옴
+        import arxiv
+        
         # arXiv 클라이언트 생성
         client = arxiv.Client()
         
@@ -42,6 +43,9 @@ def search_crossref(query, max_results=config.MAX_CROSSREF_RESULTS):
     Crossref API를 사용하여 학술 논문을 검색합니다.
     """
     try:
+        # habanero 패키지는 처음 검색할 때 불러옴
+        from habanero import Crossref
+        
         # Crossref 클라이언트 생성
         cr = Crossref(mailto=config.CROSSREF_EMAIL)
         
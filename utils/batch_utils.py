@@ -0,0 +1,198 @@
+"""
+연구 주제 목록을 한 번에 분석합니다 (학교 온보딩용 사전 생성).
+
+사용 예:
+    python -m utils.batch_utils topics.csv -c checkpoint.jsonl
+    python -m utils.batch_utils topics.jsonl -c checkpoint.jsonl --workers 8 --rpm 120 --max-calls 2000
+
+입력은 CSV(topic 컬럼, 없으면 첫 번째 컬럼), JSONL({"topic": ...} 또는 문자열) 또는 한 줄에 주제 하나인 텍스트 파일입니다.
+끝난 (주제, 단계) 결과는 체크포인트 JSONL 파일에 바로 한 줄씩 추가되며, 같은 체크포인트로 다시 실행하면
+이미 끝난 단계는 건너뛰고(다시 과금하지 않고) 남은 단계만 실행합니다.
+"""
+import argparse
+import contextvars
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import config
+from utils.deadline_utils import Deadline
+from utils.rate_limit_utils import RateLimit, track_skipped_calls
+from utils.pipeline_utils import is_complete_result, run_step
+from utils.prompt_utils import prompt_cache_stats
+
+# 주제별로 실행하는 단계 (선택 주제가 없으므로 틈새 주제도 원래 주제 기준)
+BATCH_STEPS = ("topic_analysis", "similar_topics", "niche_topics")
+
+def read_topics(path):
+    """
+    CSV/JSONL/텍스트 파일에서 주제 목록을 읽습니다 (빈 값과 중복 제거, 순서 유지).
+    """
+    topics = []
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.reader(f))
+            header = [cell.strip().lower() for cell in rows[0]] if rows else []
+            if "topic" in header:
+                column = header.index("topic")
+                rows = rows[1:]
+            else:
+                column = 0
+            topics = [row[column] for row in rows if len(row) > column]
+        elif path.lower().endswith(".jsonl"):
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                topics.append(record.get("topic", "") if isinstance(record, dict) else str(record))
+        else:
+            topics = f.read().splitlines()
+    return list(dict.fromkeys(topic.strip() for topic in topics if topic and topic.strip()))
+
+def load_checkpoint(path):
+    """
+    체크포인트 파일에서 끝난 단계 결과를 {(주제, 단계): 결과}로 읽습니다.
+    중단 시 마지막 줄이 잘려 있을 수 있으므로 읽을 수 없는 줄은 건너뜁니다.
+    """
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            done[(record["topic"], record["step"])] = record["result"]
+    return done
+
+class CheckpointWriter:
+    """
+    끝난 단계 결과를 체크포인트 파일 끝에 한 줄씩 추가합니다 (여러 스레드에서 호출).
+    """
+    def __init__(self, path):
+        checkpoint_dir = os.path.dirname(path)
+        if checkpoint_dir:
+            os.makedirs(checkpoint_dir, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+    
+    def write(self, topic, step, result, elapsed):
+        line = json.dumps({"topic": topic, "step": step, "result": result, "elapsed": round(elapsed, 3),
+                           "finished_at": time.time()}, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+    
+    def close(self):
+        self._file.close()
+
+def _run_task(topic, step):
+    """
+    단계 하나를 실행합니다. 건너뛰거나 실패한 GPT 호출(예산 소진, 시간 초과, API 오류)이 있으면
+    불완전한 결과이므로 체크포인트에 남지 않도록 None을 반환합니다.
+    """
+    start = time.time()
+    with track_skipped_calls() as skipped, Deadline(config.BATCH_STEP_TIMEOUT) as deadline:
+        result = run_step(step, topic, deadline=deadline)
+    if skipped or not is_complete_result(step, result):
+        result = None
+    return result, time.time() - start
+
+def run_batch(topics, checkpoint_path, steps=BATCH_STEPS, workers=config.BATCH_WORKERS,
+              calls_per_minute=config.BATCH_GPT_CALLS_PER_MINUTE, max_calls=None, progress=None):
+    """
+    체크포인트에 없는 (주제, 단계) 작업을 workers개씩 동시에 실행하고, 성공한 단계를 체크포인트에 기록합니다.
+    GPT 호출은 모든 작업이 하나의 RateLimit(분당 calls_per_minute회, 최대 max_calls회)을 나눠 씁니다.
+    예산이 소진되면 새 작업을 시작하지 않고, GPT 호출을 건너뛰거나 실패해 불완전하게 끝난 단계는 기록하지 않습니다 (다음 실행에서 다시 처리).
+    {done, skipped, failed, remaining, calls, exhausted, elapsed}를 반환합니다.
+    """
+    completed = load_checkpoint(checkpoint_path)
+    tasks = [(topic, step) for topic in topics for step in steps if (topic, step) not in completed]
+    summary = {"done": 0, "skipped": len(topics) * len(steps) - len(tasks), "failed": [], "remaining": 0}
+    limit = RateLimit(calls_per_minute, max_calls=max_calls)
+    writer = CheckpointWriter(checkpoint_path)
+    start = time.time()
+    queue = iter(tasks)
+    
+    try:
+        with limit, ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {}
+            while True:
+                # 예산이 남아 있는 동안 동시 실행 수만큼 채움
+                while not limit.exhausted and len(pending) < workers:
+                    task = next(queue, None)
+                    if task is None:
+                        break
+                    # 작업 스레드에서도 같은 RateLimit을 쓰도록 현재 컨텍스트를 복사해 실행
+                    pending[executor.submit(contextvars.copy_context().run, _run_task, *task)] = task
+                if not pending:
+                    break
+                
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    topic, step = pending.pop(future)
+                    try:
+                        result, elapsed = future.result()
+                    except Exception as e:
+                        result, elapsed = None, 0.0
+                        print(f"일괄 처리 오류 ({topic}, {step}): {str(e)}", file=sys.stderr)
+                    
+                    if result:
+                        writer.write(topic, step, result, elapsed)
+                        summary["done"] += 1
+                    elif not limit.exhausted:
+                        summary["failed"].append((topic, step))
+                    if progress:
+                        progress(topic, step, result, elapsed)
+    finally:
+        writer.close()
+    
+    summary["remaining"] = len(tasks) - summary["done"] - len(summary["failed"])
+    summary.update(calls=limit.calls, exhausted=limit.exhausted, elapsed=time.time() - start,
+                   prompt_cache=prompt_cache_stats()["total"])
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="연구 주제 일괄 분석 (체크포인트/재개 지원)")
+    parser.add_argument("input", help="주제 목록 파일 (CSV, JSONL 또는 텍스트)")
+    parser.add_argument("-c", "--checkpoint", default="batch_checkpoint.jsonl", help="체크포인트 JSONL 파일")
+    parser.add_argument("--steps", default=",".join(BATCH_STEPS),
+                        help=f"실행할 단계 (쉼표 구분, 기본: {','.join(BATCH_STEPS)})")
+    parser.add_argument("--workers", type=int, default=config.BATCH_WORKERS, help="동시 작업 수")
+    parser.add_argument("--rpm", type=float, default=config.BATCH_GPT_CALLS_PER_MINUTE, help="분당 GPT 호출 수 상한")
+    parser.add_argument("--max-calls", type=int, default=None, help="이번 실행에서 쓸 최대 GPT 호출 수")
+    args = parser.parse_args(argv)
+    
+    steps = [step.strip() for step in args.steps.split(",") if step.strip()]
+    unknown = [step for step in steps if step not in BATCH_STEPS]
+    if unknown:
+        parser.error(f"알 수 없는 단계: {', '.join(unknown)}")
+    
+    topics = read_topics(args.input)
+    if not topics:
+        print("처리할 주제가 없습니다.")
+        return 0
+    
+    def report(topic, step, result, elapsed):
+        status = "완료" if result else "실패"
+        print(f"[{status}] {topic} / {step} ({elapsed:.1f}초)", file=sys.stderr)
+    
+    summary = run_batch(topics, args.checkpoint, steps=steps, workers=args.workers,
+                        calls_per_minute=args.rpm, max_calls=args.max_calls, progress=report)
+    print(f"완료 {summary['done']}건, 이전 실행분 {summary['skipped']}건, 실패 {len(summary['failed'])}건, "
+          f"남음 {summary['remaining']}건 (GPT 호출 {summary['calls']}회, {summary['elapsed']:.1f}초) → {args.checkpoint}")
+    usage = summary["prompt_cache"]
+    print(f"GPT 입력 토큰 {usage['prompt_tokens']:,}개 중 {usage['cached_tokens']:,}개 캐시 ({usage['cache_ratio']:.0%})")
+    if summary["exhausted"]:
+        print("호출 예산이 소진되어 중단했습니다. 같은 명령으로 다시 실행하면 이어서 처리합니다.")
+    for topic, step in summary["failed"]:
+        print(f"  실패: {topic} / {step}")
+    return 0 if not summary["failed"] and not summary["remaining"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
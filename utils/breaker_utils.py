@@ -0,0 +1,159 @@
+import threading
+import time
+from collections import deque
+import config
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """
+    외부 제공처(arXiv, Crossref 등)별 서킷 브레이커.
+    최근 window_seconds 동안의 오류율/지연 호출 비율이 기준을 넘으면 열림(open) 상태가 되어
+    open_seconds 동안 호출을 즉시 거절하고, 이후 소수의 시험 호출(half-open)로 복구 여부를 판단합니다.
+    """
+    def __init__(self, name,
+                 window_seconds=config.BREAKER_WINDOW_SECONDS,
+                 min_calls=config.BREAKER_MIN_CALLS,
+                 error_rate=config.BREAKER_ERROR_RATE,
+                 slow_call_seconds=config.BREAKER_SLOW_CALL_SECONDS,
+                 slow_call_rate=config.BREAKER_SLOW_CALL_RATE,
+                 open_seconds=config.BREAKER_OPEN_SECONDS,
+                 half_open_calls=config.BREAKER_HALF_OPEN_CALLS):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+
+        self.state = CLOSED
+        self.opened_at = None
+        self.rejected = 0
+        self._half_open_in_flight = 0
+        self._calls = deque()  # (시각, 성공 여부, 지연 시간)
+        self._lock = threading.Lock()
+
+    def _trim(self, now):
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def _transition(self, state, now):
+        if state != self.state:
+            print(f"[breaker] {self.name}: {self.state} -> {state}")
+        self.state = state
+        if state == OPEN:
+            self.opened_at = now
+        elif state == CLOSED:
+            self.opened_at = None
+            self._calls.clear()
+        self._half_open_in_flight = 0
+
+    def allow(self):
+        """
+        호출을 시도해도 되는지 반환합니다. 열림 상태에서는 즉시 False를 반환합니다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN:
+                if now - self.opened_at < self.open_seconds:
+                    self.rejected += 1
+                    return False
+                self._transition(HALF_OPEN, now)
+
+            if self.state == HALF_OPEN:
+                if self._half_open_in_flight >= self.half_open_calls:
+                    self.rejected += 1
+                    return False
+                self._half_open_in_flight += 1
+
+            return True
+
+    def release(self):
+        """
+        allow()로 받은 호출을 보내지 않고 포기한 경우 시험 호출(half-open) 자리를 돌려줍니다.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN and self._half_open_in_flight > 0:
+                self._half_open_in_flight -= 1
+
+    def record_success(self, latency):
+        self._record(True, latency)
+
+    def record_failure(self, latency):
+        self._record(False, latency)
+
+    def _record(self, ok, latency):
+        with self._lock:
+            now = time.monotonic()
+            slow = latency >= self.slow_call_seconds
+
+            if self.state == HALF_OPEN:
+                # 시험 호출 결과로 바로 판단
+                self._transition(CLOSED if ok and not slow else OPEN, now)
+                return
+
+            self._calls.append((now, ok, latency))
+            self._trim(now)
+
+            if self.state == CLOSED and len(self._calls) >= self.min_calls:
+                failures = sum(1 for _, call_ok, _ in self._calls if not call_ok)
+                slow_calls = sum(1 for _, _, call_latency in self._calls if call_latency >= self.slow_call_seconds)
+                if (failures / len(self._calls) >= self.error_rate
+                        or slow_calls / len(self._calls) >= self.slow_call_rate):
+                    self._transition(OPEN, now)
+
+    def snapshot(self):
+        """
+        모니터링용 현재 상태를 반환합니다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            calls = len(self._calls)
+            latencies = sorted(latency for _, _, latency in self._calls)
+            failures = sum(1 for _, ok, _ in self._calls if not ok)
+            return {
+                'name': self.name,
+                'state': self.state,
+                'calls': calls,
+                'error_rate': failures / calls if calls else 0.0,
+                'p50_latency': latencies[len(latencies) // 2] if latencies else None,
+                'p95_latency': latencies[int(len(latencies) * 0.95)] if latencies else None,
+                'rejected': self.rejected,
+                'open_for': now - self.opened_at if self.opened_at is not None else None,
+            }
+
+_breakers = {}
+_registry_lock = threading.Lock()
+
+def get_breaker(name):
+    """
+    제공처 이름에 해당하는 프로세스 공용 서킷 브레이커를 반환합니다.
+    """
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+def breaker_states():
+    """
+    모든 제공처의 브레이커 상태를 반환합니다.
+    """
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+def is_available(name):
+    """
+    제공처가 현재 호출 가능한 상태(열림 아님)인지 상태를 바꾸지 않고 확인합니다.
+    """
+    breaker = get_breaker(name)
+    with breaker._lock:
+        if breaker.state != OPEN:
+            return True
+        return time.monotonic() - breaker.opened_at >= breaker.open_seconds
@@ -1,15 +1,174 @@
-import pandas as pd
+import numpy as np
 import os
+import json
+import hashlib
+import pickle
+import shutil
+import threading
 import config
+from utils.search_index_utils import InvertedIndex, NgramIndex, tokenize
+from utils.glossary_utils import translate_query
+from utils.facet_utils import FacetIndex
+from utils.vector_utils import IvfIndex, LsaModel, top_k_similar
+
+# 프로세스 공용 ISEF 스냅샷 (모든 세션/재실행이 공유하므로 수정 금지)
+# base: 원본 xlsx 데이터, df: base + 추가 세그먼트를 합친 현재 버전, parts: [(행 오프셋, 세그먼트), ...]
+# failed: 세그먼트를 읽지 못한 매니페스트 스탬프 (매니페스트가 다시 바뀔 때까지 재시도하지 않음)
+_snapshot = {"signature": None, "sha256": None, "base": None,
+             "manifest": None, "pending": None, "failed": None, "df": None, "parts": None}
+_snapshot_lock = threading.Lock()
+
+# 버전 교체 직전의 데이터 (교체 중 검색 중이던 세션용)
+_previous = {"df": None, "parts": None}
+
+# 이름별로 읽어 둔 추가 세그먼트 (버전이 바뀌어도 그대로 재사용)
+_segment_cache = {}
+
+# 데이터프레임별 검색 색인 (스냅샷 교체 시 다시 생성)
+_index_cache = {"df": None, "index": None}
+_index_lock = threading.Lock()
+
+# 데이터프레임별 벡터 모델/행렬 (스냅샷 교체 시 다시 생성)
+_vector_cache = {"df": None, "model": None, "matrix": None}
+_vector_lock = threading.Lock()
+
+# 검색 색인 어휘에 대한 문자 n-gram 색인 (부분 일치 질의 확장용)
+_term_index_cache = {"index": None, "ngrams": None}
+
+# 데이터프레임별 분야/연도 패싯 비트셋 (스냅샷 교체 시 다시 생성)
+_facet_cache = {"df": None, "facets": None}
+_facet_lock = threading.Lock()
+
+# 데이터프레임별 근사 최근접 이웃 색인 (행 수가 적으면 None)
+_ann_cache = {"df": None, "ann": None}
+_ann_lock = threading.Lock()
+
+def _file_signature(path):
+    """
+    파일 변경 감지용 (수정 시각, 크기)를 반환합니다.
+    """
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+def _file_hash(path):
+    """
+    파일 내용의 SHA-256 해시를 반환합니다.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _snapshot_paths(source_path):
+    """
+    원본 파일에 대응하는 컬럼형 스냅샷/메타데이터 경로를 반환합니다.
+    """
+    base = os.path.splitext(os.path.basename(source_path))[0]
+    return (os.path.join(config.ISEF_CACHE_DIR, f"{base}.parquet"),
+            os.path.join(config.ISEF_CACHE_DIR, f"{base}.pkl"),
+            os.path.join(config.ISEF_CACHE_DIR, f"{base}.meta.json"))
+
+def compact_dataframe(df):
+    """
+    반복 값이 많은 문자열 컬럼을 category 타입으로 바꿔 메모리 사용량을 줄입니다.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object:
+            # 엑셀에서 숫자/문자가 섞여 읽힌 컬럼은 문자열로 통일
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+            if df[col].nunique(dropna=True) <= len(df) * config.ISEF_CATEGORY_RATIO:
+                df[col] = df[col].astype("category")
+    return df
+
+def _read_snapshot(parquet_path, pickle_path):
+    import pandas as pd  # 데이터를 실제로 읽을 때만 불러옴
+    
+    if os.path.exists(parquet_path):
+        try:
+            return pd.read_parquet(parquet_path)
+        except ImportError:
+            pass
+    if os.path.exists(pickle_path):
+        return pd.read_pickle(pickle_path)
+    return None
+
+def _write_snapshot(df, parquet_path, pickle_path):
+    """
+    Parquet(pyarrow)으로 저장하고, 사용할 수 없으면 pickle로 저장합니다.
+    """
+    os.makedirs(config.ISEF_CACHE_DIR, exist_ok=True)
+    try:
+        tmp_path = parquet_path + ".tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+    except ImportError:
+        tmp_path = pickle_path + ".tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, pickle_path)
+
+def _load_snapshot(source_path, signature):
+    """
+    디스크 스냅샷을 읽거나, 원본이 바뀌었으면 원본을 읽어 스냅샷을 다시 만듭니다.
+    """
+    import pandas as pd
+    
+    parquet_path, pickle_path, meta_path = _snapshot_paths(source_path)
+    
+    meta = {}
+    if os.path.exists(meta_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    
+    if meta.get("signature") == signature:
+        df = _read_snapshot(parquet_path, pickle_path)
+        if df is not None:
+            return df, meta.get("sha256")
+    
+    # 수정 시각만 바뀐 경우(복사/touch) 내용 해시가 같으면 스냅샷 재사용
+    content_hash = _file_hash(source_path)
+    df = None
+    if meta.get("sha256") == content_hash:
+        df = _read_snapshot(parquet_path, pickle_path)
+    
+    if df is None:
+        df = compact_dataframe(pd.read_excel(source_path))
+        _write_snapshot(df, parquet_path, pickle_path)
+    
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({"signature": signature, "sha256": content_hash}, f)
+    return df, content_hash
 
 def load_isef_data():
     """
     ISEF 데이터셋을 로드합니다.
+    원본 xlsx는 처음 한 번만 읽어 컬럼형 스냅샷으로 변환하고, 이후에는 프로세스 메모리의 데이터를 공유합니다.
+    추가 적재된 세그먼트(python -m utils.isef_ingest_utils add)는 매니페스트가 바뀌면 백그라운드에서 읽어
+    준비가 끝난 뒤 한 번에 교체하며, 그동안에는 이전 버전을 반환합니다.
+    반환된 데이터프레임은 공유 객체이므로 수정하지 마세요.
     """
+    import pandas as pd
+    
     try:
         if os.path.exists(config.ISEF_DATA_PATH):
-            df = pd.read_excel(config.ISEF_DATA_PATH)
-            return df
+            signature = _file_signature(config.ISEF_DATA_PATH)
+            stamp = _manifest_stamp()
+            if _snapshot["signature"] == signature:
+                if _snapshot["manifest"] != stamp and stamp not in (_snapshot["pending"], _snapshot["failed"]):
+                    # 세그먼트만 바뀐 경우: 기다리지 않고 현재 버전을 반환 (교체는 백그라운드)
+                    _snapshot["pending"] = stamp
+                    threading.Thread(target=_publish_version_in_background, args=(stamp,), daemon=True).start()
+                return _snapshot["df"]
+            
+            with _snapshot_lock:
+                if _snapshot["signature"] != signature:
+                    _snapshot["base"], _snapshot["sha256"] = _load_snapshot(config.ISEF_DATA_PATH, signature)
+                    # 원본이 바뀌면 세그먼트 벡터도 새 모델 기준으로 다시 읽어야 함
+                    _segment_cache.clear()
+                    _publish_version(stamp)
+                    _snapshot["signature"] = signature
+                return _snapshot["df"]
         else:
             print(f"ISEF 데이터 파일을 찾을 수 없습니다: {config.ISEF_DATA_PATH}")
             return pd.DataFrame()  # 빈 데이터프레임 반환
@@ -17,48 +176,557 @@ def load_isef_data():
         print(f"ISEF 데이터 로드 오류: {str(e)}")
         return pd.DataFrame()
 
-def search_similar_topics(df, query, max_results=10):
+def find_title_column(df):
     """
-    ISEF 데이터셋에서 유사한 주제를 검색합니다.
+    제목 컬럼 이름을 찾습니다 (없으면 첫 번째 컬럼).
     """
-    if df.empty:
-        return []
+    for col in ("Title", "Project Title"):
+        if col in df.columns:
+            return col
+    for col in df.columns:
+        if "title" in str(col).lower():
+            return col
+    return df.columns[0]
+
+def find_abstract_column(df):
+    """
+    초록 컬럼 이름을 찾습니다 (없으면 None).
+    """
+    for col in df.columns:
+        if str(col).lower() in ("abstract", "summary") or "abstract" in str(col).lower():
+            return col
+    return None
+
+def build_isef_index(df):
+    """
+    ISEF 제목(및 초록)으로 BM25 역색인을 만듭니다. 문서 ID는 데이터프레임의 행 위치입니다.
+    """
+    title_column = find_title_column(df)
+    abstract_column = find_abstract_column(df)
     
-    # 검색 쿼리 키워드 분리
-    keywords = query.lower().split()
+    field_weights = {"title": config.ISEF_TITLE_WEIGHT}
+    if abstract_column is not None:
+        field_weights["abstract"] = 1.0
     
-    # 제목 컬럼 이름 (실제 데이터셋에 맞게 조정 필요)
-    title_column = "Title"  # 또는 실제 컬럼명으로 변경
+    index = InvertedIndex(field_weights)
+    titles = df[title_column].tolist()
+    abstracts = df[abstract_column].tolist() if abstract_column is not None else [None] * len(df)
+    for title, abstract in zip(titles, abstracts):
+        index.add({"title": title, "abstract": abstract})
+    return index
+
+def _index_cache_path():
+    base = os.path.splitext(os.path.basename(config.ISEF_DATA_PATH))[0]
+    return os.path.join(config.ISEF_CACHE_DIR, f"{base}.bm25.pkl")
+
+def _load_or_build_snapshot_index(df):
+    """
+    스냅샷 데이터의 색인은 디스크에 저장해 두고 원본 해시가 같으면 재사용합니다.
+    """
+    path = _index_cache_path()
+    content_hash = _snapshot["sha256"]
+    if content_hash and os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                cached = pickle.load(f)
+            if cached.get("sha256") == content_hash and cached["index"].doc_count == len(df):
+                return cached["index"]
+        except Exception as e:
+            print(f"ISEF 색인 캐시 로드 오류: {str(e)}")
     
-    if title_column not in df.columns:
-        # 첫 번째 컬럼을 제목으로 가정
-        title_column = df.columns[0]
+    index = build_isef_index(df)
+    if content_hash:
+        os.makedirs(config.ISEF_CACHE_DIR, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"sha256": content_hash, "index": index}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    return index
+
+def get_isef_index(df):
+    """
+    데이터프레임에 대한 검색 색인을 반환합니다. 같은 데이터프레임이면 한 번만 생성합니다.
+    """
+    if _index_cache["df"] is df:
+        return _index_cache["index"]
     
-    # 점수 계산을 위한 컬럼 추가
-    df['search_score'] = 0
+    with _index_lock:
+        if _index_cache["df"] is not df:
+            if df is _snapshot["base"]:
+                index = _load_or_build_snapshot_index(df)
+            else:
+                index = build_isef_index(df)
+            _index_cache["index"] = index
+            _index_cache["df"] = df
+        return _index_cache["index"]
+
+def _get_term_ngrams(index):
+    """
+    BM25 색인 어휘의 문자 n-gram 색인을 반환합니다. 같은 색인이면 한 번만 생성합니다.
+    """
+    if _term_index_cache["index"] is not index:
+        vocabulary = set()
+        for postings in index.postings.values():
+            vocabulary.update(postings)
+        _term_index_cache.update({"index": index, "ngrams": NgramIndex(sorted(vocabulary))})
+    return _term_index_cache["ngrams"]
+
+def expand_isef_query(df, query):
+    """
+    검색 질의를 ISEF 색인 어휘에 맞게 확장합니다 (LLM 호출 없음).
+    한국어는 로컬 용어집으로 영어 용어로 바꾸고, 색인에 없는 영어 토큰은 문자 n-gram이 가장 비슷한 어휘를 덧붙입니다.
+    """
+    query = translate_query(query)
+    index = _isef_parts(df)[0][1]["index"]
+    vocabulary = index.postings.get("title", {})
     
-    # 각 키워드에 대해 제목에 포함되어 있으면 점수 증가
-    for keyword in keywords:
-        df.loc[df[title_column].str.lower().str.contains(keyword, na=False), 'search_score'] += 1
+    expansions = []
+    for token in set(tokenize(query)):
+        if len(token) >= 4 and token not in vocabulary:
+            expansions.extend(term for term, _ in _get_term_ngrams(index).lookup(token, top_k=2))
+    return " ".join([query] + expansions)
+
+def build_isef_facets(df):
+    """
+    분야(category)와 연도(year) 값별 행 비트셋을 만듭니다. 헤더가 반복된 행 등 잘못된 값은 제외합니다.
+    """
+    import pandas as pd
     
-    # 점수 기준으로 정렬하여 상위 결과 반환
-    results = df.sort_values('search_score', ascending=False).head(max_results)
+    columns = {}
+    for col in df.columns:
+        if col.lower() == "category":
+            values = df[col].astype(str).str.strip()
+            columns["category"] = [v if v and v.lower() not in ("category", "nan") else None for v in values]
+        elif col.lower() == "year":
+            years = pd.to_numeric(df[col].astype(str), errors="coerce")
+            columns["year"] = [int(y) if pd.notna(y) else None for y in years]
+    return FacetIndex.build(columns) if columns else FacetIndex(len(df), {})
+
+def _load_or_build_snapshot_facets(df):
+    """
+    스냅샷 데이터의 패싯은 디스크에 저장해 두고 원본 해시가 같으면 재사용합니다.
+    """
+    base = os.path.splitext(os.path.basename(config.ISEF_DATA_PATH))[0]
+    path = os.path.join(config.ISEF_CACHE_DIR, f"{base}.facets.pkl")
+    content_hash = _snapshot["sha256"]
+    if content_hash and os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                cached = pickle.load(f)
+            if cached.get("sha256") == content_hash and cached["facets"].size == len(df):
+                return cached["facets"]
+        except Exception as e:
+            print(f"ISEF 패싯 캐시 로드 오류: {str(e)}")
+    
+    facets = build_isef_facets(df)
+    if content_hash:
+        os.makedirs(config.ISEF_CACHE_DIR, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"sha256": content_hash, "facets": facets}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    return facets
+
+def get_isef_facets(df):
+    """
+    데이터프레임에 대한 패싯 색인을 반환합니다. 같은 데이터프레임이면 한 번만 생성합니다.
+    """
+    if _facet_cache["df"] is df:
+        return _facet_cache["facets"]
+    
+    with _facet_lock:
+        if _facet_cache["df"] is not df:
+            if df is _snapshot["base"]:
+                facets = _load_or_build_snapshot_facets(df)
+            else:
+                facets = build_isef_facets(df)
+            _facet_cache.update({"df": df, "facets": facets})
+        return _facet_cache["facets"]
+
+def isef_facet_counts(df, categories=None, years=None):
+    """
+    필터 조건에서의 분야별/연도별 프로젝트 수를 반환합니다.
+    분야 개수는 연도 조건만, 연도 개수는 분야 조건만 적용해 셉니다 (자기 필드 조건은 제외).
+    """
+    counts = {"category": {}, "year": {}}
+    for _, segment in _isef_parts(df):
+        facets = segment["facets"]
+        for field, within in (("category", facets.select({"year": years})),
+                              ("year", facets.select({"category": categories}))):
+            for value, count in facets.counts(field, within=within).items():
+                counts[field][value] = counts[field].get(value, 0) + count
+    return counts
+
+def _project_texts(df):
+    """
+    벡터화에 사용할 프로젝트별 텍스트 (제목 + 초록)를 반환합니다.
+    """
+    texts = df[find_title_column(df)].astype(str)
+    abstract_column = find_abstract_column(df)
+    if abstract_column is not None:
+        texts = texts + " " + df[abstract_column].fillna("").astype(str)
+    return texts.tolist()
+
+def _vector_prefix():
+    return os.path.splitext(os.path.basename(config.ISEF_DATA_PATH))[0]
+
+def _load_or_build_snapshot_vectors(df):
+    """
+    스냅샷 데이터의 벡터 행렬은 .npy로 저장해 두고 메모리 매핑으로 읽습니다 (원본 해시가 같을 때).
+    """
+    prefix = _vector_prefix()
+    matrix_path = os.path.join(config.ISEF_CACHE_DIR, f"{prefix}.vectors.npy")
+    meta_path = os.path.join(config.ISEF_CACHE_DIR, f"{prefix}.vectors.json")
+    content_hash = _snapshot["sha256"]
+    settings = {"sha256": content_hash, "rows": len(df),
+                "hash_dim": config.ISEF_HASH_DIM, "rank": config.ISEF_VECTOR_DIM}
+    
+    if content_hash and os.path.exists(meta_path) and os.path.exists(matrix_path):
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                if json.load(f) == settings:
+                    model = LsaModel.load(config.ISEF_CACHE_DIR, prefix)
+                    return model, np.load(matrix_path, mmap_mode="r")
+        except Exception as e:
+            print(f"ISEF 벡터 캐시 로드 오류: {str(e)}")
+    
+    model, matrix = LsaModel.fit(_project_texts(df), config.ISEF_HASH_DIM, config.ISEF_VECTOR_DIM)
+    if content_hash:
+        model.save(config.ISEF_CACHE_DIR, prefix)
+        np.save(matrix_path, matrix)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(settings, f)
+        matrix = np.load(matrix_path, mmap_mode="r")
+    return model, matrix
+
+def get_isef_vectors(df):
+    """
+    데이터프레임에 대한 (벡터 모델, 프로젝트 벡터 행렬)을 반환합니다. 같은 데이터프레임이면 한 번만 생성합니다.
+    """
+    if _vector_cache["df"] is df:
+        return _vector_cache["model"], _vector_cache["matrix"]
+    
+    with _vector_lock:
+        if _vector_cache["df"] is not df:
+            if df is _snapshot["base"]:
+                model, matrix = _load_or_build_snapshot_vectors(df)
+            else:
+                model, matrix = LsaModel.fit(_project_texts(df), config.ISEF_HASH_DIM, config.ISEF_VECTOR_DIM)
+            _vector_cache.update({"df": df, "model": model, "matrix": matrix})
+        return _vector_cache["model"], _vector_cache["matrix"]
+
+def _load_or_build_snapshot_ann(matrix):
+    """
+    스냅샷 벡터의 IVF 색인은 디렉터리에 저장해 두고 메모리 매핑으로 읽습니다 (원본 해시가 같을 때).
+    """
+    directory = os.path.join(config.ISEF_CACHE_DIR, f"{_vector_prefix()}.ivf")
+    meta_path = os.path.join(directory, "meta.json")
+    settings = {"sha256": _snapshot["sha256"], "rows": len(matrix),
+                "rank": config.ISEF_VECTOR_DIM, "lists": config.ANN_LISTS}
+    
+    if os.path.exists(meta_path) and IvfIndex.exists(directory):
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                if json.load(f) == settings:
+                    return IvfIndex.load(directory)
+        except Exception as e:
+            print(f"ISEF ANN 색인 로드 오류: {str(e)}")
+    
+    ann = IvfIndex.train(matrix, n_lists=config.ANN_LISTS)
+    if _snapshot["sha256"]:
+        ann.save(directory)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(settings, f)
+        ann = IvfIndex.load(directory)
+    return ann
+
+def get_isef_ann(df):
+    """
+    데이터프레임에 대한 IVF 색인을 반환합니다. 행 수가 config.ANN_MIN_ROWS 미만이면 None (전수 비교 사용).
+    """
+    if _ann_cache["df"] is df:
+        return _ann_cache["ann"]
+    
+    _, matrix = get_isef_vectors(df)
+    with _ann_lock:
+        if _ann_cache["df"] is not df:
+            ann = None
+            if len(matrix) >= config.ANN_MIN_ROWS:
+                if df is _snapshot["base"]:
+                    ann = _load_or_build_snapshot_ann(matrix)
+                else:
+                    ann = IvfIndex.train(matrix, n_lists=config.ANN_LISTS)
+            _ann_cache.update({"df": df, "ann": ann})
+        return _ann_cache["ann"]
+
+def get_text_model():
+    """
+    ISEF 데이터로 학습한 텍스트 벡터 모델을 반환합니다 (데이터가 없으면 None).
+    논문/주제 간 유사도 계산에 같은 벡터 공간을 사용하기 위한 것입니다.
+    """
+    load_isef_data()
+    base = _snapshot["base"]
+    if base is None or base.empty:
+        return None
+    model, _ = get_isef_vectors(base)
+    return model
+
+def text_model_id():
+    """
+    get_text_model()이 반환하는 모델의 식별자 (학습에 쓴 원본 데이터 해시, 데이터가 없으면 None).
+    원본 데이터가 바뀌면 같은 차원이라도 다른 벡터 공간이므로, 논문 벡터 색인이 같은 모델로 만들어졌는지 확인하는 데 씁니다.
+    """
+    load_isef_data()
+    return _snapshot["sha256"]
+
+def _manifest_path():
+    return os.path.join(config.ISEF_CACHE_DIR, "isef_manifest.json")
+
+def _segment_dir(name):
+    return os.path.join(config.ISEF_CACHE_DIR, "segments", name)
+
+def _manifest_stamp():
+    """
+    매니페스트 변경 감지용 수정 시각 (없으면 None).
+    """
+    try:
+        return os.stat(_manifest_path()).st_mtime_ns
+    except OSError:
+        return None
+
+def read_manifest():
+    """
+    추가 세그먼트 매니페스트를 읽습니다.
+    segments는 현재 버전을 이루는 세그먼트 목록, retired는 병합되어 곧 삭제될 세그먼트 목록입니다.
+    """
+    path = _manifest_path()
+    if not os.path.exists(path):
+        return {"version": 0, "segments": [], "retired": []}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def write_manifest(manifest):
+    """
+    매니페스트를 원자적으로 교체합니다 (실행 중인 프로세스는 다음 조회 때 새 버전을 봅니다).
+    """
+    os.makedirs(config.ISEF_CACHE_DIR, exist_ok=True)
+    tmp_path = _manifest_path() + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, _manifest_path())
+
+def write_isef_segment(df, name):
+    """
+    추가 레코드를 세그먼트 디렉터리로 저장합니다.
+    레코드와 함께 BM25 색인, 패싯, 현재 벡터 모델 기준 벡터(행이 많으면 IVF 색인)를 미리 만들어 두므로
+    앱 프로세스는 다시 계산하지 않고 읽기만 합니다. 임시 디렉터리에 만든 뒤 이름을 바꿔 원자적으로 공개합니다.
+    """
+    model = get_text_model()
+    directory = _segment_dir(name)
+    tmp_dir = directory + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    
+    df = df.reset_index(drop=True)
+    df.to_pickle(os.path.join(tmp_dir, "records.pkl"))
+    with open(os.path.join(tmp_dir, "bm25.pkl"), "wb") as f:
+        pickle.dump(build_isef_index(df), f, protocol=pickle.HIGHEST_PROTOCOL)
+    with open(os.path.join(tmp_dir, "facets.pkl"), "wb") as f:
+        pickle.dump(build_isef_facets(df), f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    matrix = np.vstack([model.transform(text) for text in _project_texts(df)]).astype(np.float32)
+    np.save(os.path.join(tmp_dir, "vectors.npy"), matrix)
+    if len(df) >= config.ANN_MIN_ROWS:
+        IvfIndex.train(matrix, n_lists=config.ANN_LISTS).save(os.path.join(tmp_dir, "ivf"))
+    
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"rows": len(df), "model_sha256": _snapshot["sha256"]}, f)
+    os.replace(tmp_dir, directory)
+
+def read_isef_segment_records(name):
+    import pandas as pd
+    
+    return pd.read_pickle(os.path.join(_segment_dir(name), "records.pkl"))
+
+def _load_isef_segment(name):
+    """
+    세그먼트 디렉터리를 읽습니다. 벡터는 메모리 매핑하며, 원본 데이터(벡터 모델)가 바뀐 뒤라면 다시 계산합니다.
+    """
+    if name in _segment_cache:
+        return _segment_cache[name]
+    
+    directory = _segment_dir(name)
+    df = read_isef_segment_records(name)
+    with open(os.path.join(directory, "bm25.pkl"), "rb") as f:
+        index = pickle.load(f)
+    with open(os.path.join(directory, "facets.pkl"), "rb") as f:
+        facets = pickle.load(f)
+    with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    
+    ann = None
+    if meta.get("model_sha256") == _snapshot["sha256"]:
+        matrix = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r")
+        if IvfIndex.exists(os.path.join(directory, "ivf")):
+            ann = IvfIndex.load(os.path.join(directory, "ivf"))
+    else:
+        model, _ = get_isef_vectors(_snapshot["base"])
+        matrix = np.vstack([model.transform(text) for text in _project_texts(df)]).astype(np.float32)
+    
+    segment = {"name": name, "df": df, "index": index, "matrix": matrix, "ann": ann, "facets": facets}
+    _segment_cache[name] = segment
+    return segment
+
+def _dataframe_segment(df):
+    """
+    단일 데이터프레임(원본 스냅샷 또는 임의 데이터)을 검색용 세그먼트로 만듭니다.
+    """
+    model, matrix = get_isef_vectors(df)
+    return {"name": "base", "df": df, "model": model, "index": get_isef_index(df), "matrix": matrix,
+            "ann": get_isef_ann(df), "facets": get_isef_facets(df)}
+
+def _publish_version(stamp):
+    """
+    원본 스냅샷과 매니페스트의 세그먼트로 새 버전을 만들어 현재 버전으로 교체합니다.
+    """
+    import pandas as pd
+    
+    base = _snapshot["base"]
+    parts = [(0, _dataframe_segment(base))]
+    frames = [base]
+    offset = len(base)
+    for name in read_manifest()["segments"]:
+        segment = _load_isef_segment(name)
+        parts.append((offset, segment))
+        frames.append(segment["df"])
+        offset += len(segment["df"])
+    
+    if len(frames) == 1:
+        df = base
+    else:
+        # category 컬럼은 세그먼트마다 범주가 달라 object로 합친 뒤 다시 압축
+        df = compact_dataframe(pd.concat([frame.astype(object) for frame in frames], ignore_index=True))
+    _previous.update({"df": _snapshot["df"], "parts": _snapshot["parts"]})
+    _snapshot.update({"df": df, "parts": parts, "manifest": stamp, "pending": None})
+    
+    # 현재 버전에 없는 세그먼트는 캐시에서 제거
+    for name in list(_segment_cache):
+        if all(segment is not _segment_cache[name] for _, segment in parts):
+            del _segment_cache[name]
+
+def _publish_version_in_background(stamp):
+    try:
+        with _snapshot_lock:
+            if _snapshot["pending"] == stamp and _snapshot["manifest"] != stamp:
+                _publish_version(stamp)
+    except Exception as e:
+        # 같은 매니페스트로는 매 재실행마다 다시 실패하므로 매니페스트가 바뀔 때까지 이전 버전 유지
+        print(f"ISEF 세그먼트 로드 오류: {str(e)}")
+        _snapshot.update({"pending": None, "failed": stamp})
+
+def _isef_parts(df):
+    """
+    데이터프레임을 이루는 (행 오프셋, 세그먼트) 목록을 반환합니다.
+    """
+    if df is _snapshot["df"] and _snapshot["parts"] is not None:
+        return _snapshot["parts"]
+    if df is _previous["df"] and _previous["parts"] is not None:
+        return _previous["parts"]
+    return [(0, _dataframe_segment(df))]
+
+def isef_segment_names(df):
+    """
+    데이터프레임 버전에 포함된 추가 세그먼트 이름 목록을 반환합니다.
+    """
+    return [segment["name"] for _, segment in _isef_parts(df)[1:]]
+
+def _search_segment(segment, query, query_vector, max_results, categories=None, years=None):
+    """
+    세그먼트 하나에서 벡터 상위 + BM25 상위 후보를 찾아 {행 위치: (코사인 유사도, BM25 점수 또는 None)}로 반환합니다.
+    """
+    matrix = segment["matrix"]
+    
+    # 패싯 필터 (점수 계산 전에 후보 행 제한)
+    allowed = None
+    facets = segment["facets"]
+    selected = facets.select({"category": categories, "year": years})
+    if selected is not None:
+        allowed = facets.to_mask(selected)
+        if not allowed.any():
+            return {}
+    
+    # 후보: 벡터 유사도 상위 + BM25 상위 (힙 선택)
+    if allowed is not None and allowed.sum() < config.ANN_MIN_ROWS:
+        # 필터 후 행이 적으면 남은 행만 전수 비교
+        vector_hits = top_k_similar(matrix, query_vector, max_results, allowed=np.flatnonzero(allowed))
+    elif segment["ann"] is not None:
+        vector_hits = segment["ann"].search(query_vector, max_results, n_probe=config.ANN_PROBES, allowed=allowed)
+    else:
+        vector_hits = top_k_similar(matrix, query_vector, max_results)
+    keyword_hits = dict(segment["index"].search(query, top_k=max_results, allowed=allowed))
+    
+    candidates = {position for position, _ in vector_hits} | set(keyword_hits)
+    if not candidates:
+        return {}
+    positions = np.fromiter(candidates, dtype=np.int64)
+    similarities = np.asarray(matrix[positions] @ query_vector)
+    return {position: (similarity, keyword_hits.get(position))
+            for position, similarity in zip(positions.tolist(), similarities.tolist())}
+
+def search_similar_topics(df, query, max_results=10, categories=None, years=None):
+    """
+    ISEF 데이터셋에서 유사한 주제를 검색합니다.
+    벡터 유사도 상위 결과와 BM25 키워드 상위 결과를 합쳐 두 순위의 RRF(reciprocal rank fusion) 점수로 정렬합니다.
+    relevance_score(표시/필터용)는 코사인 유사도, score는 BM25 점수(키워드 후보가 아니면 0)입니다.
+    행 수가 많으면 벡터 후보는 IVF 근사 검색으로 찾습니다. 데이터프레임은 수정하지 않습니다.
+    categories/years가 주어지면 패싯 비트셋으로 해당 행만 후보로 삼아 점수를 계산합니다.
+    한국어 질의는 용어집과 문자 n-gram 색인으로 영어 검색어로 확장한 뒤 검색합니다.
+    """
+    if df.empty:
+        return []
+    
+    query = expand_isef_query(df, query)
+    title_column = find_title_column(df)
+    parts = _isef_parts(df)
+    query_vector = parts[0][1]["model"].transform(query)
+    if not query_vector.any():
+        return []
+    
+    # 세그먼트(원본 + 추가분)별로 후보를 찾아 전체 행 위치 기준으로 합침
+    candidate_count = max_results * config.ISEF_CANDIDATE_FACTOR
+    similarities = {}
+    keyword_hits = {}
+    for offset, segment in parts:
+        for position, (similarity, keyword_score) in _search_segment(segment, query, query_vector,
+                                                                     candidate_count, categories, years).items():
+            similarities[offset + position] = similarity
+            if keyword_score is not None:
+                keyword_hits[offset + position] = keyword_score
+    
+    # 순위 융합: 코사인 순위와 BM25 순위의 역수 합 (BM25 후보가 아닌 행은 벡터 순위만 반영)
+    fused = dict.fromkeys(similarities, 0.0)
+    for scores in (similarities, keyword_hits):
+        for rank, position in enumerate(sorted(scores, key=scores.get, reverse=True), 1):
+            fused[position] += 1.0 / (config.ISEF_RRF_K + rank)
+    ranked = sorted(fused, key=fused.get, reverse=True)
     
     # 필요한 정보만 추출하여 리스트로 변환
     similar_topics = []
-    for _, row in results.iterrows():
-        if row['search_score'] > 0:  # 최소 1개 이상의 키워드가 일치하는 경우만
-            topic_info = {
-                'title': row[title_column],
-                'score': row['search_score'],
-                'source': 'ISEF',
-            }
-            
-            # 다른 컬럼도 있다면 추가
-            for col in df.columns:
-                if col != title_column and col != 'search_score':
-                    topic_info[col.lower()] = row[col]
-            
-            similar_topics.append(topic_info)
+    for position in ranked[:max_results]:
+        similarity = similarities[position]
+        row = df.iloc[position]
+        topic_info = {
+            'title': row[title_column],
+            'score': keyword_hits.get(position, 0.0),
+            'relevance_score': round(max(0.0, min(1.0, similarity)), 3),
+            'source': 'ISEF',
+        }
+        
+        # 다른 컬럼도 있다면 추가
+        for col in df.columns:
+            if col != title_column:
+                topic_info[col.lower()] = row[col]
+        
+        similar_topics.append(topic_info)
     
     return similar_topics
@@ -0,0 +1,75 @@
+import contextvars
+import time
+
+_current_deadline = contextvars.ContextVar("deadline", default=None)
+
+class BudgetExhausted(Exception):
+    """
+    남은 응답 시간 예산이 없어 외부 호출을 보내지 않았음 (제공처 장애가 아니므로 브레이커에 기록하지 않음).
+    """
+
+class Deadline:
+    """
+    한 단계(주제 분석, 유사 주제 생성 등)의 전체 응답 시간 예산.
+    with 블록 안에서 호출되는 모든 하위 작업이 남은 시간을 여기서 계산합니다.
+    """
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+        # 상위 예산이 있으면 그보다 길어질 수 없음
+        parent = _current_deadline.get()
+        if parent is not None:
+            self.expires_at = min(self.expires_at, parent.expires_at)
+
+        self._tokens = []
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def has_budget(self, seconds, reserve=0.0):
+        """
+        reserve초를 남겨두고도 seconds초 이상 쓸 수 있는지 확인합니다.
+        """
+        return self.remaining() - reserve >= seconds
+
+    def timeout(self, cap, reserve=0.0):
+        """
+        하위 호출에 사용할 타임아웃 (cap과 남은 시간 - reserve 중 작은 값).
+        """
+        return max(0.0, min(cap, self.remaining() - reserve))
+
+    def __enter__(self):
+        self._tokens.append(_current_deadline.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_deadline.reset(self._tokens.pop())
+        return False
+
+def current_deadline():
+    """
+    현재 적용 중인 Deadline을 반환합니다 (없으면 None).
+    """
+    return _current_deadline.get()
+
+def request_timeout(cap, reserve=0.0):
+    """
+    현재 예산 기준으로 외부 호출 타임아웃을 계산합니다. 예산이 없으면 cap을 그대로 사용합니다.
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return cap
+    return deadline.timeout(cap, reserve)
+
+def has_budget(seconds, reserve=0.0):
+    """
+    현재 예산 안에서 seconds초짜리 작업을 시작할 수 있는지 확인합니다. 예산이 없으면 항상 True입니다.
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return True
+    return deadline.has_budget(seconds, reserve)
@@ -0,0 +1,75 @@
+import numpy as np
+
+# 바이트별 1비트 개수 (popcount 조회표)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+def popcount(bits):
+    """
+    압축 비트셋(np.packbits 결과)에서 1인 비트 수를 셉니다.
+    """
+    return int(_POPCOUNT[bits].sum())
+
+class FacetIndex:
+    """
+    필드(분야, 연도 등)의 값마다 해당 행을 표시한 비트셋을 보관하는 패싯 색인.
+    필터는 같은 필드 안에서는 OR, 필드끼리는 AND로 결합하며 개수는 popcount로 계산합니다.
+    """
+    def __init__(self, size, facets):
+        self.size = size
+        # field -> value -> np.packbits 비트셋
+        self.facets = facets
+    
+    @classmethod
+    def build(cls, columns):
+        """
+        {필드명: 행별 값 리스트}로 색인을 만듭니다. 값이 None인 행은 어느 비트셋에도 포함되지 않습니다.
+        """
+        size = None
+        facets = {}
+        for field, values in columns.items():
+            values = list(values)
+            size = len(values) if size is None else size
+            rows_by_value = {}
+            for row, value in enumerate(values):
+                if value is not None:
+                    rows_by_value.setdefault(value, []).append(row)
+            facets[field] = {}
+            for value, rows in rows_by_value.items():
+                mask = np.zeros(size, dtype=bool)
+                mask[rows] = True
+                facets[field][value] = np.packbits(mask)
+        return cls(size or 0, facets)
+    
+    def values(self, field):
+        return sorted(self.facets.get(field, {}))
+    
+    def select(self, filters):
+        """
+        {필드명: 허용 값 목록} 조건에 맞는 행의 비트셋을 반환합니다. 조건이 없으면 None (전체 행).
+        """
+        selected = None
+        for field, allowed_values in filters.items():
+            if allowed_values is None:
+                continue
+            field_bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+            for value in allowed_values:
+                bits = self.facets.get(field, {}).get(value)
+                if bits is not None:
+                    field_bits |= bits
+            selected = field_bits if selected is None else selected & field_bits
+        return selected
+    
+    def to_mask(self, bits):
+        """
+        비트셋을 행별 불리언 마스크로 변환합니다.
+        """
+        return np.unpackbits(bits, count=self.size).astype(bool)
+    
+    def counts(self, field, within=None):
+        """
+        필드 값별 행 수를 반환합니다. within(비트셋)이 주어지면 그 안에서만 셉니다.
+        """
+        counts = {}
+        for value, bits in self.facets.get(field, {}).items():
+            counts[value] = popcount(bits if within is None else bits & within)
+        return counts
@@ -0,0 +1,103 @@
+import os
+import re
+import threading
+from fpdf.ttfonts import TTFontFile
+
+# TTF 경로 -> (수정 시각, 폰트 메트릭), 프로세스마다 한 번만 파싱
+_font_metrics_cache = {}
+_font_metrics_lock = threading.Lock()
+
+def load_font_metrics(path):
+    """
+    TTF 파일의 메트릭(글자 폭, 디스크립터)을 읽어 프로세스 메모리에 보관합니다.
+    fpdf의 add_font와 달리 폰트 옆에 .pkl 캐시 파일을 만들지 않습니다.
+    """
+    mtime = os.path.getmtime(path)
+    with _font_metrics_lock:
+        cached = _font_metrics_cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        ttf = TTFontFile()
+        ttf.getMetrics(path)
+        metrics = {
+            'name': re.sub('[ ()]', '', ttf.fullName),
+            'desc': {
+                'Ascent': int(round(ttf.ascent, 0)),
+                'Descent': int(round(ttf.descent, 0)),
+                'CapHeight': int(round(ttf.capHeight, 0)),
+                'Flags': ttf.flags,
+                'FontBBox': "[%s %s %s %s]" % tuple(int(round(v, 0)) for v in ttf.bbox),
+                'ItalicAngle': int(ttf.italicAngle),
+                'StemV': int(round(ttf.stemV, 0)),
+                'MissingWidth': int(round(ttf.defaultWidth, 0)),
+            },
+            'up': round(ttf.underlinePosition),
+            'ut': round(ttf.underlineThickness),
+            'cw': ttf.charWidths,
+            'originalsize': os.path.getsize(path),
+        }
+        _font_metrics_cache[path] = (mtime, metrics)
+    return metrics
+
+def register_font(pdf, family, style, path):
+    """
+    캐시된 메트릭으로 PDF 문서에 유니코드 TTF 폰트를 등록합니다 (FPDF.add_font(uni=True) 대체).
+    실제 글꼴 데이터는 출력할 때 문서에서 사용한 글자만 골라 서브셋으로 포함됩니다.
+    """
+    fontkey = family.lower() + style.upper()
+    if fontkey in pdf.fonts:
+        return
+    metrics = load_font_metrics(path)
+    pdf.fonts[fontkey] = {
+        'i': len(pdf.fonts) + 1, 'type': 'TTF', 'name': metrics['name'],
+        'desc': metrics['desc'], 'up': metrics['up'], 'ut': metrics['ut'],
+        'cw': metrics['cw'], 'ttffile': path, 'fontkey': fontkey,
+        # 페이지 번호 치환용 숫자는 항상 서브셋에 포함
+        'subset': list(range(0, 57 if hasattr(pdf, 'str_alias_nb_pages') else 32)),
+        'unifilename': None,
+    }
+    pdf.font_files[fontkey] = {'length1': metrics['originalsize'], 'type': 'TTF', 'ttffile': path}
+
+def subset_widths(cw, subset):
+    """
+    서브셋에 포함된 글자(CID)의 폭만 담은 PDF /W 배열을 만듭니다. 나머지 글자는 /DW(기본 폭)를 씁니다.
+    """
+    runs = []
+    for cid in sorted(set(subset)):
+        if cid <= 0 or cid >= len(cw) or cw[cid] == 0:
+            continue
+        width = 0 if cw[cid] == 65535 else cw[cid]
+        if runs and runs[-1][0] + len(runs[-1][1]) == cid:
+            runs[-1][1].append(width)
+        else:
+            runs.append((cid, [width]))
+    return '/W [%s]' % ''.join(' %d [ %s ]' % (start, ' '.join(str(int(w)) for w in widths))
+                               for start, widths in runs)
+
+# 폰트 -> {문자: 폭(1000분의 1 em)}, 처음 쓰인 글자만 계산해 기억
+_glyph_width_cache = {}
+_glyph_width_lock = threading.Lock()
+
+def glyph_widths(font):
+    """
+    FPDF 폰트(pdf.current_font)의 글자 폭 조회표를 반환합니다 (프로세스 공용, 글자 단위로 채워짐).
+    """
+    key = (font.get('ttffile') or font['name'], id(font['cw']))
+    table = _glyph_width_cache.get(key)
+    if table is None:
+        with _glyph_width_lock:
+            table = _glyph_width_cache.setdefault(key, {})
+    return table
+
+def char_width(font, char):
+    """
+    글자 하나의 폭 (FPDF.get_string_width와 같은 규칙, 1000분의 1 em 단위).
+    """
+    cw = font['cw']
+    if isinstance(cw, dict):
+        return cw.get(char, 0)
+    code = ord(char)
+    if code < len(cw):
+        return cw[code]
+    return font['desc'].get('MissingWidth') or 500
@@ -0,0 +1,84 @@
+import json
+import os
+import re
+import threading
+import config
+from utils.search_index_utils import NgramIndex
+
+_HANGUL_RUN = re.compile(r'[가-힣]+')
+
+# 용어집 캐시 (파일 수정 시각이 바뀌면 다시 읽음)
+_glossary_cache = {"mtime": None, "terms": {}, "max_length": 0, "ngrams": None}
+_glossary_lock = threading.Lock()
+
+def load_glossary(path=None):
+    """
+    로컬 한영 연구 용어집({한국어: 영어})을 읽어 캐시합니다. 파일이 없으면 빈 용어집을 사용합니다.
+    """
+    path = path or config.GLOSSARY_PATH
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return _glossary_cache
+    
+    if _glossary_cache["mtime"] == mtime:
+        return _glossary_cache
+    
+    with _glossary_lock:
+        if _glossary_cache["mtime"] != mtime:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    terms = {key.replace(" ", ""): value for key, value in json.load(f).items()}
+            except (OSError, ValueError) as e:
+                print(f"용어집 로드 오류: {str(e)}")
+                return _glossary_cache
+            _glossary_cache.update({
+                "mtime": mtime,
+                "terms": terms,
+                "max_length": max((len(key) for key in terms), default=0),
+                "ngrams": NgramIndex(terms),
+            })
+        return _glossary_cache
+
+def _segment(run, terms, max_length):
+    """
+    한글 덩어리를 용어집 최장 일치로 분해합니다. 일치하지 않는 음절(조사 등)은 건너뜁니다.
+    한 음절 용어는 오분해를 막기 위해 덩어리 맨 앞에서만 인정합니다.
+    """
+    matches = []
+    start = 0
+    while start < len(run):
+        match = None
+        for length in range(min(max_length, len(run) - start), 0, -1):
+            if length == 1 and start > 0:
+                break
+            if run[start:start + length] in terms:
+                match = run[start:start + length]
+                break
+        if match:
+            matches.append(match)
+            start += len(match)
+        else:
+            start += 1
+    return matches
+
+def translate_query(query):
+    """
+    질의의 한국어 부분을 용어집으로 영어 검색어로 바꿉니다 (LLM 호출 없음).
+    최장 일치로 찾지 못한 덩어리는 문자 n-gram 부분 일치로 가장 가까운 용어를 사용합니다.
+    영어 등 한글이 아닌 부분은 그대로 유지합니다.
+    """
+    glossary = load_glossary()
+    terms = glossary["terms"]
+    if not terms or not _HANGUL_RUN.search(query):
+        return query
+    
+    translated = []
+    for run in _HANGUL_RUN.findall(query):
+        pieces = _segment(run, terms, glossary["max_length"])
+        if not pieces and len(run) >= 2:
+            pieces = [term for term, _ in glossary["ngrams"].lookup(run, top_k=1)]
+        translated.extend(terms[piece] for piece in pieces)
+    
+    remainder = _HANGUL_RUN.sub(" ", query)
+    return " ".join(part for part in [remainder.strip()] + translated if part)
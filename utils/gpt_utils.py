@@ -1,52 +1,52 @@
+import contextvars
 import requests
 import json
 import time
 import config
-import streamlit as st
 import re
 import xml.etree.ElementTree as ET
+from utils.deadline_utils import BudgetExhausted, Deadline, has_budget, request_timeout
+from utils.breaker_utils import get_breaker, is_available
+from utils.pool_utils import run_in_pool
+from utils.rate_limit_utils import acquire_call, report_failed_call, report_rate_limited
+from utils.ui_utils import show_error, show_warning, spinner
+from utils.prompt_utils import SYSTEM_PROMPT, build_prompt, record_usage
+from collections import OrderedDict
+import threading
 
-def get_completion(prompt, model=config.GPT_MODEL, temperature=config.TEMPERATURE, max_tokens=config.MAX_TOKENS):
+def _pooled_request(method, url, timeout_cap, reserve=0.0, **kwargs):
+    """
+    전역 공정 풀(utils.pool_utils)에서 HTTP 요청을 보냅니다.
+    타임아웃은 풀에서 실제로 실행될 때 남은 예산으로 계산하며, (응답, 요청 시작 시각)을 반환해
+    서킷 브레이커가 재는 지연 시간에 큐 대기 시간이 들어가지 않게 합니다.
+    큐에서 기다리는 동안 예산이 소진되면 요청을 보내지 않고 BudgetExhausted를 발생시킵니다.
+    요청 중 예외에는 요청 시작 시각(request_started)을 붙입니다 (_failure_latency).
+    """
+    def send():
+        if not has_budget(config.MIN_CALL_BUDGET, reserve=reserve):
+            raise BudgetExhausted()
+        started = time.monotonic()
+        try:
+            response = requests.request(method, url, timeout=request_timeout(timeout_cap, reserve=reserve), **kwargs)
+        except Exception as e:
+            e.request_started = started
+            raise
+        return response, started
+    return run_in_pool(send)
+
+def _failure_latency(error, queued_at):
+    """
+    실패한 요청의 지연 시간 (풀에서 실제로 보낸 시각부터, 보내기 전 실패면 요청을 맡긴 시각부터).
+    """
+    return time.monotonic() - getattr(error, "request_started", queued_at)
+
+def get_completion(prompt, model=config.GPT_MODEL, temperature=config.TEMPERATURE, max_tokens=config.MAX_TOKENS, reserve=0.0,
+                   prompt_name="other"):
     """
     GPT 모델로부터 응답을 받아옵니다. OpenAI 라이브러리 대신 직접 API 호출을 사용합니다.
+    현재 Deadline에서 reserve초를 남기고 남은 시간만큼만 기다리며, 예산이 없으면 호출하지 않습니다.
+    응답의 토큰 사용량(캐시된 입력 토큰 포함)은 prompt_name별로 집계합니다 (utils.prompt_utils.prompt_cache_stats).
     """
-    system_prompt = """당신은 학생과 연구자를 위한 연구 주제 선정 전문가입니다.  
-주어진 연구 주제에 대해 학술적 분석을 제공하고, 신뢰할 수 있는 출처 및 참고문헌을 포함하여 연구자가 가치 있는 연구를 수행하도록 돕습니다.  
-### 🧪 역할  
-- 연구 주제 분석 전문가  
-- 복잡한 연구 내용을 쉽게 설명  
-- 최신 연구 동향 반영  
-- 명확하고 구체적인 연구 주제 및 논문 구조 제안  
-### 📚 주요 기능  
-✅ 논문 검색 API를 활용해 **실제 논문만 인용** (가짜 논문 생성 금지)  
-✅ 과학적 깊이 + 명확한 구조 + 최신 연구 동향 반영  
-✅ 답변은 **구조화된 마크다운 형식**으로 제공  
-🔹 **답변 구성**  
-- 🧠 개요  
-- 🔬 메커니즘 
-- 🧩 핵심 변수 또는 요인  
-- 📊 논문 비교 및 근거 요약  
-- 🧾 결론  
-- 🔗 출처 테이블  
-### 🎯 연구 주제 커버 분야  
-🔹 생명과학  
-🔹 물리학, 천문학  
-🔹 화학, 재료과학  
-🔹 환경과학, 기후과학  
-🔹 컴퓨터과학, 데이터과학  
-🔹 심리학, 사회과학  
-🔹 공학 및 응용기술  
-### ⚡ 행동 기준  
-1️⃣ 복잡한 연구 주제를 쉽게 설명  
-2️⃣ 실용적이고 실현 가능한 연구 주제 제안  
-3️⃣ 최신 연구 동향과 학계의 관심사 반영  
-4️⃣ 명확하고 구체적인 조언 제공 (모호한 표현 금지)  
-5️⃣ 학술적 표준과 관행을 따르는 논문 구조 제안  
-6️⃣ 정확한 인용 형식 사용  
-### 🚫 금지사항  
-❌ 논문 제목, 저자, 연도 등을 임의로 생성 금지  
-❌ 인용은 반드시 **API를 통해 가져온 실제 논문만 사용**"""
-    
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {config.OPENAI_API_KEY}"
@@ -55,106 +55,72 @@ def get_completion(prompt, model=config.GPT_MODEL, temperature=config.TEMPERATUR
     payload = {
         "model": model,
         "messages": [
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ],
         "temperature": temperature,
         "max_tokens": max_tokens
     }
     
+    if not has_budget(config.MIN_CALL_BUDGET, reserve=reserve):
+        print("GPT 호출 건너뜀: 응답 시간 예산 소진")
+        report_failed_call()
+        return None
+    
+    if not acquire_call():
+        print("GPT 호출 건너뜀: 호출 예산 소진")
+        return None
+    
     try:
-        response = requests.post(
+        response, _ = _pooled_request(
+            "POST",
             "https://api.openai.com/v1/chat/completions",
+            config.OPENAI_TIMEOUT,
+            reserve=reserve,
             headers=headers,
             data=json.dumps(payload)
         )
         
         if response.status_code == 200:
-            return response.json()["choices"][0]["message"]["content"]
+            data = response.json()
+            record_usage(prompt_name, data.get("usage"))
+            return data["choices"][0]["message"]["content"]
         else:
-            st.error(f"GPT API 오류: {response.status_code}, {response.text}")
+            if response.status_code == 429:
+                report_rate_limited(response)
+            show_error(f"GPT API 오류: {response.status_code}, {response.text}")
+            report_failed_call()
             return None
+    except BudgetExhausted:
+        print("GPT 호출 건너뜀: 응답 시간 예산 소진")
+        report_failed_call()
+        return None
     except Exception as e:
-        st.error(f"GPT API 오류: {str(e)}")
+        show_error(f"GPT API 오류: {str(e)}")
+        report_failed_call()
         time.sleep(1)
         return None
 
-def analyze_topic(topic):
+def analyze_topic(topic, deadline=None):
     """
     입력된 주제를 분석하여 정의, 의미, 문제점, 해결 사례 등을 제공합니다.
+    deadline이 없으면 config.STEP_SLO 기준으로 새로 만듭니다.
     """
-    # 먼저 실제 논문 검색
-    arxiv_papers = search_arxiv(topic, max_results=5)
-    crossref_papers = search_crossref(topic, max_results=5)
-    all_papers = merge_search_results(arxiv_papers, crossref_papers, max_total=7)
-    
-    # 검색된 논문 정보를 포함한 프롬프트 생성
-    paper_info = ""
-    if all_papers:
-        paper_info = "다음은 해당 주제와 관련된 실제 논문 정보입니다:\n\n"
-        for i, paper in enumerate(all_papers, 1):
-            paper_info += f"{i}. 제목: {paper['title']}\n"
-            paper_info += f"   저자: {paper['authors']}\n"
-            paper_info += f"   발행: {paper['published']}\n"
-            paper_info += f"   출처: {paper['source']}\n"
-            if paper['summary'] and paper['summary'] != "요약 정보 없음":
-                paper_info += f"   요약: {paper['summary']}\n"
-            paper_info += "\n"
-    
-    prompt = f"""
-    당신은 고등학생과 일반인들이 좋은 연구 논문을 작성할 수 있도록 도와주는 최고의 연구 전문가입니다.
-    다음 연구 주제에 대해 상세히 분석해주세요: "{topic}"
-    
-    이 분석은 과학적 정확성, 깊이 있는 설명, 교육적 가치가 필수적입니다. 단순히 일반적인 정보가 아닌, 실제 연구자가 학생에게 제공할 법한 구체적이고 깊이 있는 정보를 제공해주세요.
-    
-    분석은 다음 구조로 작성해주세요:
-    
-    ## 🧠 개요
-    [주제 정의 및 현재 연구 동향 개요 - 4-5문장으로 명확하게 설명]
-    - 이 주제의 핵심 개념과 중요성
-    - 관련된 학문 분야와 주요 연구 영역
-    - 이 분야의 최근 핵심 발전 사항
-    
-    ## 🔬 기전 또는 작동 원리
-    [주제와 관련된 핵심 과학적 원리 설명 - 상세하고 교육적으로]
-    - 구체적인 메커니즘과 과정 설명
-    - 관련된 중요 이론이나 모델
-    - 실제 예시나 사례를 통한 원리 설명
-    
-    ## 🧩 핵심 변수 또는 요인
-    [주제를 이해하는 데 중요한 핵심 요소들 - 구체적으로 나열하고 설명]
-    - 각 요소의 정의와 중요성
-    - 요소들 간의 상호작용과 관계
-    - 요소들이 연구 결과에 미치는 영향
-    
-    ## 📊 논문 비교 및 근거 요약
-    [주요 연구 논문들의 결과 비교 및 주요 발견 - 구체적인 데이터와 수치 포함]
-    - 핵심 연구 결과와 발견
-    - 상반된 견해나 논쟁점
-    - 연구 방법론 비교
-    
-    ## 🧾 결론
-    [현재 연구 상황 요약 및 향후 연구 방향 제안 - 5-6문장으로 종합적으로]
-    - 현재까지의 연구 성과 종합
-    - 해결되지 않은 질문이나 과제
-    - 향후 유망한 연구 방향 제안
-    - 이 주제가 가지는 실용적/학문적 의의
-    
-    ## 🔗 출처 테이블
-    [정확한 인용 형식으로 출처 나열 - 실제 존재하는 논문만]
-    
-    {paper_info}
+    with deadline or Deadline(config.STEP_SLO["analyze_topic"]):
+        return _analyze_topic(topic)
+
+def _analyze_topic(topic):
+    # 주제별 근거 논문에서 상위 논문 선택 (이후 단계도 같은 검색 결과를 재사용)
+    all_papers = topic_evidence(topic, 7)
+    paper_info = format_paper_info(all_papers, "다음은 해당 주제와 관련된 실제 논문 정보입니다:", summary_limit=None)
     
-    각 섹션은 최소 3-4개의 단락으로 구성하고, 각 단락은 4-5개의 문장을 포함해주세요. 고등학생도 이해할 수 있도록 명확하게 설명하되, 내용의 학술적 깊이는 유지해주세요.
-    예시나 구체적인 사례, 수치 데이터를 포함하면 내용 이해에 도움이 됩니다.
-    실제 존재하는 논문만 인용하고, 가짜 논문이나 정보를 생성하지 마세요.
-    특히 주제의 기본 개념뿐만 아니라 최신 연구 동향이나 발전 방향도 함께 제시해주세요.
-    """
+    # 고정 지시문이 앞, 주제와 논문 정보가 뒤에 오도록 구성 (프롬프트 캐시)
+    prompt = build_prompt("topic_analysis", topic=topic, paper_info=paper_info)
     
     # 로딩 표시
-    with st.spinner("주제를 분석 중입니다..."):
+    with spinner("주제를 분석 중입니다..."):
         # max_tokens와 temperature 조정 - 더 상세하고 창의적인 응답을 위해
-        result = get_completion(prompt, temperature=0.7, max_tokens=2500)
+        result = get_completion(prompt, temperature=0.7, max_tokens=2500, prompt_name="topic_analysis")
     
     # 반환 값을 정형화된 데이터로 변환
     if result:
@@ -182,180 +148,462 @@ def extract_keywords(query, min_length=3, max_keywords=7):
     # 최대 키워드 수 제한
     return words[:max_keywords]
 
+ARXIV_NAMESPACES = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'arxiv': 'http://arxiv.org/schemas/atom'
+}
+
+def build_arxiv_query(query):
+    """
+    arXiv 검색 쿼리를 구성합니다.
+    유사성을 높이기 위해 다양한 검색 방식 중 하나를 선택합니다.
+    """
+    # 키워드 추출
+    keywords = extract_keywords(query)
+    
+    # 키워드가 충분하지 않은 경우 원본 쿼리 사용
+    if len(keywords) < 2:
+        return query
+    
+    # 다양한 검색 방식 시도
+    search_queries = [
+        # 원본 쿼리
+        query,
+        # AND 검색 (모든 키워드 포함)
+        " AND ".join(keywords[:3]),
+        # OR 검색 (넓은 범위)
+        " OR ".join(keywords[:3])
+    ]
+    
+    # 무작위로 하나 선택 (다양성 확보)
+    import random
+    return random.choice(search_queries)
+
+def parse_arxiv_feed(content):
+    """
+    arXiv API의 Atom 응답을 검색 결과 리스트로 변환합니다.
+    """
+    root = ET.fromstring(content)
+    
+    results = []
+    for entry in root.findall('.//atom:entry', ARXIV_NAMESPACES):
+        title_elem = entry.find('atom:title', ARXIV_NAMESPACES)
+        title = title_elem.text.strip() if title_elem is not None else "제목 없음"
+        
+        summary_elem = entry.find('atom:summary', ARXIV_NAMESPACES)
+        summary = summary_elem.text.strip() if summary_elem is not None else "요약 없음"
+        
+        published_elem = entry.find('atom:published', ARXIV_NAMESPACES)
+        published = published_elem.text[:10] if published_elem is not None else "날짜 없음"
+        
+        # 저자 추출
+        authors = []
+        for author in entry.findall('.//atom:author/atom:name', ARXIV_NAMESPACES):
+            authors.append(author.text)
+        
+        # PDF 링크 추출
+        pdf_url = None
+        for link in entry.findall('atom:link', ARXIV_NAMESPACES):
+            if link.get('title') == 'pdf':
+                pdf_url = link.get('href')
+                break
+        
+        if pdf_url is None:
+            # 대체 링크 검색
+            for link in entry.findall('atom:link', ARXIV_NAMESPACES):
+                if link.get('rel') == 'alternate':
+                    pdf_url = link.get('href')
+                    break
+        
+        # 결과 추가
+        results.append({
+            'title': title,
+            'authors': ', '.join(authors),
+            'summary': summary[:300] + "..." if len(summary) > 300 else summary,
+            'published': published,
+            'url': pdf_url,
+            'source': 'arXiv'
+        })
+    
+    return results
+
+# 제공처별 최근 성공 검색 결과 (브레이커가 열렸을 때 즉시 대체용)
+_recent_search_results = OrderedDict()
+_recent_search_lock = threading.Lock()
+
+def _remember_search_results(provider, query, max_results, results):
+    with _recent_search_lock:
+        key = (provider, query, max_results)
+        _recent_search_results[key] = results
+        _recent_search_results.move_to_end(key)
+        while len(_recent_search_results) > config.RECENT_SEARCH_CACHE_SIZE:
+            _recent_search_results.popitem(last=False)
+
+def _recent_results_for(provider, query, max_results):
+    with _recent_search_lock:
+        return list(_recent_search_results.get((provider, query, max_results), []))
+
+# get_topic_evidence가 검색하는 동안 결과를 못 받은 제공처 목록 (부분 결과인지 판단용)
+_search_failures = contextvars.ContextVar("search_failures", default=None)
+
+def _report_search_failure(provider):
+    """
+    제공처 검색 결과를 받지 못했음(예산 소진, 브레이커 열림, 오류 응답)을 기록합니다.
+    """
+    failures = _search_failures.get()
+    if failures is not None:
+        failures.append(provider)
+
+def _is_provider_failure(status_code):
+    """
+    제공처 장애로 볼 응답 코드인지 확인합니다 (과부하/서버 오류).
+    """
+    return status_code == 429 or status_code >= 500
+
 def search_arxiv(query, max_results=5):
     """
     arXiv API를 사용하여 학술 논문을 검색합니다.
     유사성을 높이기 위해 다양한 검색 방식을 시도합니다.
+    서킷 브레이커가 열려 있으면 호출하지 않고 최근 결과(없으면 빈 리스트)를 반환합니다.
     """
+    if not has_budget(config.MIN_CALL_BUDGET, reserve=config.GENERATION_RESERVE):
+        _report_search_failure("arxiv")
+        return []
+    
+    breaker = get_breaker("arxiv")
+    if not breaker.allow():
+        _report_search_failure("arxiv")
+        return _recent_results_for("arxiv", query, max_results)
+    
+    started = time.monotonic()
     try:
-        # 키워드 추출
-        keywords = extract_keywords(query)
-        
-        # 키워드가 충분하지 않은 경우 원본 쿼리 사용
-        if len(keywords) < 2:
-            search_query = query
-        else:
-            # 다양한 검색 방식 시도
-            search_queries = [
-                # 원본 쿼리
-                query,
-                # AND 검색 (모든 키워드 포함)
-                " AND ".join(keywords[:3]),
-                # OR 검색 (넓은 범위)
-                " OR ".join(keywords[:3])
-            ]
-            
-            # 무작위로 하나 선택 (다양성 확보)
-            import random
-            search_query = random.choice(search_queries)
+        search_query = build_arxiv_query(query)
         
         # arXiv API 요청 URL
         url = f"http://export.arxiv.org/api/query?search_query=all:{search_query}&start=0&max_results={max_results}"
         
         # API 요청
-        response = requests.get(url)
+        response, started = _pooled_request("GET", url, config.HTTP_TIMEOUT, reserve=config.GENERATION_RESERVE)
         
         if response.status_code == 200:
-            # XML 파싱
-            # 네임스페이스 정의
-            namespaces = {
-                'atom': 'http://www.w3.org/2005/Atom',
-                'arxiv': 'http://arxiv.org/schemas/atom'
-            }
-            
-            # XML 파싱
-            root = ET.fromstring(response.content)
-            
-            # 결과 추출
-            results = []
-            for entry in root.findall('.//atom:entry', namespaces):
-                title_elem = entry.find('atom:title', namespaces)
-                title = title_elem.text.strip() if title_elem is not None else "제목 없음"
-                
-                summary_elem = entry.find('atom:summary', namespaces)
-                summary = summary_elem.text.strip() if summary_elem is not None else "요약 없음"
-                
-                published_elem = entry.find('atom:published', namespaces)
-                published = published_elem.text[:10] if published_elem is not None else "날짜 없음"
-                
-                # 저자 추출
-                authors = []
-                for author in entry.findall('.//atom:author/atom:name', namespaces):
-                    authors.append(author.text)
-                
-                # PDF 링크 추출
-                pdf_url = None
-                for link in entry.findall('atom:link', namespaces):
-                    if link.get('title') == 'pdf':
-                        pdf_url = link.get('href')
-                        break
-                
-                if pdf_url is None:
-                    # 대체 링크 검색
-                    for link in entry.findall('atom:link', namespaces):
-                        if link.get('rel') == 'alternate':
-                            pdf_url = link.get('href')
-                            break
-                
-                # 결과 추가
-                results.append({
-                    'title': title,
-                    'authors': ', '.join(authors),
-                    'summary': summary[:300] + "..." if len(summary) > 300 else summary,
-                    'published': published,
-                    'url': pdf_url,
-                    'source': 'arXiv'
-                })
-            
+            results = parse_arxiv_feed(response.content)
+            breaker.record_success(time.monotonic() - started)
+            _remember_search_results("arxiv", query, max_results, results)
             return results
         else:
-            st.error(f"arXiv API 오류: {response.status_code}")
+            if _is_provider_failure(response.status_code):
+                breaker.record_failure(time.monotonic() - started)
+            else:
+                breaker.record_success(time.monotonic() - started)
+            show_error(f"arXiv API 오류: {response.status_code}")
+            _report_search_failure("arxiv")
             return []
     
+    except BudgetExhausted:
+        # 풀 대기 중 예산 소진: 요청을 보내지 않았으므로 브레이커에 실패로 기록하지 않음
+        breaker.release()
+        _report_search_failure("arxiv")
+        return []
     except Exception as e:
-        st.error(f"arXiv 검색 오류: {str(e)}")
+        breaker.record_failure(_failure_latency(e, started))
+        show_error(f"arXiv 검색 오류: {str(e)}")
+        _report_search_failure("arxiv")
         return []
 
+def build_crossref_query(query):
+    """
+    Crossref 검색 쿼리를 구성합니다.
+    """
+    keywords = extract_keywords(query)
+    
+    if len(keywords) < 2:
+        return query
+    return " ".join(keywords[:3])
+
+def parse_crossref_items(data):
+    """
+    Crossref API의 JSON 응답을 검색 결과 리스트로 변환합니다.
+    """
+    results = []
+    if 'message' in data and 'items' in data['message']:
+        for item in data['message']['items']:
+            # 제목 추출
+            title = "제목 없음"
+            if 'title' in item and item['title']:
+                title = item['title'][0]
+            
+            # 저자 추출
+            authors = []
+            if 'author' in item:
+                for author in item['author']:
+                    name_parts = []
+                    if 'given' in author:
+                        name_parts.append(author['given'])
+                    if 'family' in author:
+                        name_parts.append(author['family'])
+                    if name_parts:
+                        authors.append(' '.join(name_parts))
+            
+            # 발행일 추출
+            published = "날짜 없음"
+            if 'published-print' in item and 'date-parts' in item['published-print']:
+                date_parts = item['published-print']['date-parts'][0]
+                if len(date_parts) >= 1:
+                    published = str(date_parts[0])
+            
+            # URL 추출
+            url = None
+            if 'URL' in item:
+                url = item['URL']
+            
+            # 요약 (없는 경우가 많음)
+            summary = "요약 정보 없음"
+            if 'abstract' in item:
+                summary = item['abstract']
+            
+            # 결과 추가
+            results.append({
+                'title': title,
+                'authors': ', '.join(authors),
+                'summary': summary[:300] + "..." if len(summary) > 300 else summary,
+                'published': published,
+                'url': url,
+                'source': 'Crossref'
+            })
+    
+    return results
+
 def search_crossref(query, max_results=5):
     """
     Crossref API를 사용하여 학술 논문을 검색합니다.
+    서킷 브레이커가 열려 있으면 호출하지 않고 최근 결과(없으면 빈 리스트)를 반환합니다.
     """
+    if not has_budget(config.MIN_CALL_BUDGET, reserve=config.GENERATION_RESERVE):
+        _report_search_failure("crossref")
+        return []
+    
+    breaker = get_breaker("crossref")
+    if not breaker.allow():
+        _report_search_failure("crossref")
+        return _recent_results_for("crossref", query, max_results)
+    
+    started = time.monotonic()
     try:
-        # 키워드 추출
-        keywords = extract_keywords(query)
-        
-        # 검색 쿼리 준비
-        if len(keywords) < 2:
-            search_query = query
-        else:
-            search_query = " ".join(keywords[:3])
+        search_query = build_crossref_query(query)
         
         # API 요청 URL
         email = getattr(config, 'CROSSREF_EMAIL', 'example@example.com')
         url = f"https://api.crossref.org/works?query={search_query}&rows={max_results}&mailto={email}"
         
         # API 요청
-        response = requests.get(url)
+        response, started = _pooled_request("GET", url, config.HTTP_TIMEOUT, reserve=config.GENERATION_RESERVE)
         
         if response.status_code == 200:
-            data = response.json()
-            
-            results = []
-            if 'message' in data and 'items' in data['message']:
-                for item in data['message']['items']:
-                    # 제목 추출
-                    title = "제목 없음"
-                    if 'title' in item and item['title']:
-                        title = item['title'][0]
-                    
-                    # 저자 추출
-                    authors = []
-                    if 'author' in item:
-                        for author in item['author']:
-                            name_parts = []
-                            if 'given' in author:
-                                name_parts.append(author['given'])
-                            if 'family' in author:
-                                name_parts.append(author['family'])
-                            if name_parts:
-                                authors.append(' '.join(name_parts))
-                    
-                    # 발행일 추출
-                    published = "날짜 없음"
-                    if 'published-print' in item and 'date-parts' in item['published-print']:
-                        date_parts = item['published-print']['date-parts'][0]
-                        if len(date_parts) >= 1:
-                            published = str(date_parts[0])
-                    
-                    # URL 추출
-                    url = None
-                    if 'URL' in item:
-                        url = item['URL']
-                    
-                    # 요약 (없는 경우가 많음)
-                    summary = "요약 정보 없음"
-                    if 'abstract' in item:
-                        summary = item['abstract']
-                    
-                    # 결과 추가
-                    results.append({
-                        'title': title,
-                        'authors': ', '.join(authors),
-                        'summary': summary[:300] + "..." if len(summary) > 300 else summary,
-                        'published': published,
-                        'url': url,
-                        'source': 'Crossref'
-                    })
-            
+            results = parse_crossref_items(response.json())
+            breaker.record_success(time.monotonic() - started)
+            _remember_search_results("crossref", query, max_results, results)
             return results
         else:
-            st.error(f"Crossref API 오류: {response.status_code}")
+            if _is_provider_failure(response.status_code):
+                breaker.record_failure(time.monotonic() - started)
+            else:
+                breaker.record_success(time.monotonic() - started)
+            show_error(f"Crossref API 오류: {response.status_code}")
+            _report_search_failure("crossref")
             return []
     
+    except BudgetExhausted:
+        # 풀 대기 중 예산 소진: 요청을 보내지 않았으므로 브레이커에 실패로 기록하지 않음
+        breaker.release()
+        _report_search_failure("crossref")
+        return []
     except Exception as e:
-        st.error(f"Crossref 검색 오류: {str(e)}")
+        breaker.record_failure(_failure_latency(e, started))
+        show_error(f"Crossref 검색 오류: {str(e)}")
+        _report_search_failure("crossref")
         return []
 
+def iter_arxiv_pages(query, page_size=config.DEEP_PAGE_SIZE, max_records=config.DEEP_MAX_RECORDS):
+    """
+    arXiv 검색 결과를 start 오프셋으로 페이지를 넘기며 한 건씩 생성합니다.
+    소비자가 중단하면 다음 페이지는 요청하지 않습니다.
+    """
+    search_query = build_arxiv_query(query)
+    start = 0
+    
+    while start < max_records:
+        if start > 0:
+            # arXiv API 이용 규칙: 연속 요청 사이 간격 유지
+            if not has_budget(config.ARXIV_PAGE_INTERVAL + config.MIN_CALL_BUDGET, reserve=config.GENERATION_RESERVE):
+                return
+            time.sleep(config.ARXIV_PAGE_INTERVAL)
+        elif not has_budget(config.MIN_CALL_BUDGET, reserve=config.GENERATION_RESERVE):
+            return
+        
+        breaker = get_breaker("arxiv")
+        if not breaker.allow():
+            return
+        
+        rows = min(page_size, max_records - start)
+        started = time.monotonic()
+        try:
+            response, started = _pooled_request(
+                "GET",
+                "http://export.arxiv.org/api/query",
+                config.HTTP_TIMEOUT,
+                reserve=config.GENERATION_RESERVE,
+                params={
+                    "search_query": f"all:{search_query}",
+                    "start": start,
+                    "max_results": rows,
+                    "sortBy": "relevance"
+                }
+            )
+            if response.status_code != 200:
+                if _is_provider_failure(response.status_code):
+                    breaker.record_failure(time.monotonic() - started)
+                else:
+                    breaker.record_success(time.monotonic() - started)
+                print(f"arXiv API 오류: {response.status_code}")
+                return
+            page = parse_arxiv_feed(response.content)
+            breaker.record_success(time.monotonic() - started)
+        except BudgetExhausted:
+            breaker.release()
+            return
+        except Exception as e:
+            breaker.record_failure(_failure_latency(e, started))
+            print(f"arXiv 검색 오류: {str(e)}")
+            return
+        
+        for record in page:
+            yield record
+        
+        if len(page) < rows:
+            return
+        start += rows
+
+def iter_crossref_pages(query, page_size=config.DEEP_PAGE_SIZE, max_records=config.DEEP_MAX_RECORDS):
+    """
+    Crossref 검색 결과를 cursor로 페이지를 넘기며 한 건씩 생성합니다.
+    소비자가 중단하면 다음 페이지는 요청하지 않습니다.
+    """
+    search_query = build_crossref_query(query)
+    email = getattr(config, 'CROSSREF_EMAIL', 'example@example.com')
+    cursor = "*"
+    fetched = 0
+    
+    while fetched < max_records:
+        if not has_budget(config.MIN_CALL_BUDGET, reserve=config.GENERATION_RESERVE):
+            return
+        
+        breaker = get_breaker("crossref")
+        if not breaker.allow():
+            return
+        
+        rows = min(page_size, max_records - fetched)
+        started = time.monotonic()
+        try:
+            response, started = _pooled_request(
+                "GET",
+                "https://api.crossref.org/works",
+                config.HTTP_TIMEOUT,
+                reserve=config.GENERATION_RESERVE,
+                params={"query": search_query, "rows": rows, "cursor": cursor, "mailto": email}
+            )
+            if response.status_code != 200:
+                if _is_provider_failure(response.status_code):
+                    breaker.record_failure(time.monotonic() - started)
+                else:
+                    breaker.record_success(time.monotonic() - started)
+                print(f"Crossref API 오류: {response.status_code}")
+                return
+            data = response.json()
+            page = parse_crossref_items(data)
+            breaker.record_success(time.monotonic() - started)
+        except BudgetExhausted:
+            breaker.release()
+            return
+        except Exception as e:
+            breaker.record_failure(_failure_latency(e, started))
+            print(f"Crossref 검색 오류: {str(e)}")
+            return
+        
+        for record in page:
+            yield record
+        
+        fetched += len(page)
+        next_cursor = data.get('message', {}).get('next-cursor')
+        if len(page) < rows or not next_cursor:
+            return
+        cursor = next_cursor
+
+def unavailable_providers():
+    """
+    서킷 브레이커가 열려 현재 호출하지 않는 외부 제공처 목록을 반환합니다.
+    """
+    return [name for name in ("arxiv", "crossref") if not is_available(name)]
+
+def interleave_streams(*streams):
+    """
+    여러 결과 스트림을 번갈아 가며 한 건씩 생성합니다.
+    """
+    active = [iter(s) for s in streams]
+    while active:
+        for stream in list(active):
+            try:
+                yield next(stream)
+            except StopIteration:
+                active.remove(stream)
+
+def keyword_relevance(keywords, result):
+    """
+    제목의 키워드 일치 비율로 GPT 호출 없이 관련성 점수를 계산합니다.
+    filter_results_by_relevance와 같은 기준을 사용하며, 기준 미달이면 None을 반환합니다.
+    """
+    if not keywords:
+        return None
+    title = result['title'].lower()
+    keyword_match = sum(1 for kw in keywords if kw.lower() in title) / len(keywords)
+    if keyword_match >= 0.4:
+        return 0.7 + (keyword_match * 0.3)
+    return None
+
+def deep_search_papers(query, keywords, target=config.DEEP_TARGET_CANDIDATES,
+                       min_score=config.DEEP_MIN_SCORE, max_total=20):
+    """
+    arXiv/Crossref를 페이지 단위로 깊게 검색하면서 결과를 스트리밍으로 순위화합니다.
+    min_score 이상인 후보가 target개 모이면 남은 페이지는 요청하지 않고 중단합니다.
+    """
+    streams = [search_local(query, max_results=config.DEEP_PAGE_SIZE)]
+    if not config.OFFLINE_SEARCH_ONLY:
+        streams += [iter_arxiv_pages(query), iter_crossref_pages(query)]
+    
+    seen_titles = set()
+    candidates = []
+    strong_count = 0
+    
+    for result in interleave_streams(*streams):
+        title_lower = result['title'].lower()
+        # 짧은 제목/중복 제외 (merge_search_results와 동일 기준)
+        if len(title_lower) < 10 or title_lower in seen_titles:
+            continue
+        seen_titles.add(title_lower)
+        
+        score = keyword_relevance(keywords, result)
+        if score is not None:
+            result['relevance_score'] = score
+            if score >= min_score:
+                strong_count += 1
+        candidates.append(result)
+        
+        if strong_count >= target:
+            break
+    
+    # 키워드 점수가 있는 후보를 앞에, 나머지는 수집 순서대로
+    candidates.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
+    return candidates[:max_total]
+
 def merge_search_results(arxiv_results, crossref_results, max_total=10):
     """
     여러 API에서 가져온 검색 결과를 병합합니다.
@@ -372,7 +620,7 @@ def merge_search_results(arxiv_results, crossref_results, max_total=10):
         # 짧은 제목 제외 (너무 일반적인 제목일 가능성)
         if len(title_lower) < 10:
             continue
-            
+        
         if title_lower not in seen_titles:
             seen_titles.add(title_lower)
             
@@ -410,18 +658,120 @@ def merge_search_results(arxiv_results, crossref_results, max_total=10):
     # 최대 개수만큼 반환
     return sorted_results[:max_total]
 
-def extract_core_keywords(topic):
+def search_local(query, max_results=5):
     """
-    주제에서 핵심 키워드를 추출합니다.
+    로컬 논문 색인에서 학술 논문을 검색합니다 (FTS5 키워드 결과 + 벡터 색인이 있으면 근사 이웃 결과).
+    네트워크를 사용하지 않으며, 색인이 없으면 빈 리스트를 반환합니다.
     """
-    prompt = f"""
-    다음 연구 주제에서 가장 핵심적인 키워드 5개를 추출하고 중요도 순으로 나열해주세요:
-    "{topic}"
+    # numpy/pandas를 쓰는 색인 모듈은 첫 검색 때 불러옴 (페이지 시작 시간 단축)
+    from utils.paper_index_utils import search_local_index, search_local_vectors, has_paper_vectors
+    
+    keyword_results = search_local_index(query, max_results=max_results)
+    # 벡터 모델(ISEF 데이터 전체 로드)은 논문 벡터 색인이 있을 때만 불러옴
+    if not has_paper_vectors():
+        return keyword_results
+    from utils.data_utils import get_text_model, text_model_id
+    model = get_text_model()
+    if model is None:
+        return keyword_results
+    vector_results = search_local_vectors(model.transform(query), text_model_id(), max_results=max_results)
+    return merge_search_results(keyword_results, vector_results, max_total=max_results)
+
+def search_papers(query, max_results=5, max_total=10):
+    """
+    로컬 색인, arXiv, Crossref에서 논문을 검색하고 결과를 병합합니다.
+    OFFLINE_SEARCH_ONLY 설정 시 로컬 색인 결과만 사용합니다.
+    장애로 브레이커가 열린 제공처는 기다리지 않고 최근 결과로 대체됩니다.
+    """
+    local_results = search_local(query, max_results=max_results)
+    if config.OFFLINE_SEARCH_ONLY:
+        return merge_search_results(local_results, [], max_total=max_total)
     
-    결과는 쉼표로 구분된 단일 라인으로 제공해주세요. 예: 키워드1, 키워드2, 키워드3, 키워드4, 키워드5
+    arxiv_results = search_arxiv(query, max_results=max_results)
+    crossref_results = search_crossref(query, max_results=max_results)
+    return merge_search_results(local_results + arxiv_results, crossref_results, max_total=max_total)
+
+# 주제별 근거 논문 (주제 -> (만료 시각, 논문 목록)), 프로세스 공용 LRU
+# 주제 분석/유사 주제/논문/틈새 주제 단계가 같은 주제로 검색을 반복하지 않도록 한 번 넓게 검색해 나눠 씀
+_topic_evidence_cache = OrderedDict()
+_topic_evidence_lock = threading.Lock()
+_topic_evidence_fetching = {}
+
+def get_topic_evidence(topic):
+    """
+    주제의 근거 논문 전체(관련성 순)를 반환합니다. 처음 요청될 때만 검색하며,
+    같은 주제를 여러 스레드가 동시에 요청해도 검색은 한 번만 실행됩니다.
+    결과를 받지 못한 제공처가 있으면(부분 결과) config.EVIDENCE_DEGRADED_TTL_SECONDS 동안만 재사용합니다.
+    """
+    key = topic.strip()
+    with _topic_evidence_lock:
+        entry = _topic_evidence_cache.get(key)
+        if entry and time.time() < entry[0]:
+            _topic_evidence_cache.move_to_end(key)
+            return entry[1]
+        fetch_lock = _topic_evidence_fetching.setdefault(key, threading.Lock())
+    
+    with fetch_lock:
+        with _topic_evidence_lock:
+            entry = _topic_evidence_cache.get(key)
+            if entry and time.time() < entry[0]:
+                return entry[1]
+        
+        failures = []
+        token = _search_failures.set(failures)
+        try:
+            papers = search_papers(topic, max_results=config.EVIDENCE_MAX_RESULTS, max_total=config.EVIDENCE_MAX_TOTAL)
+        finally:
+            _search_failures.reset(token)
+        ttl = config.EVIDENCE_DEGRADED_TTL_SECONDS if failures else config.EVIDENCE_TTL_SECONDS
+        with _topic_evidence_lock:
+            # 검색 결과가 없으면 저장하지 않음 (다음 단계에서 다시 시도)
+            if papers and ttl > 0:
+                _topic_evidence_cache[key] = (time.time() + ttl, papers)
+                _topic_evidence_cache.move_to_end(key)
+                while len(_topic_evidence_cache) > config.EVIDENCE_CACHE_SIZE:
+                    _topic_evidence_cache.popitem(last=False)
+            _topic_evidence_fetching.pop(key, None)
+    return papers
+
+def topic_evidence(topic, limit):
+    """
+    주제의 근거 논문 중 상위 limit개를 반환합니다 (단계별로 점수를 덧붙여도 공유 목록이 바뀌지 않게 복사본).
+    """
+    return [dict(paper) for paper in get_topic_evidence(topic)[:limit]]
+
+def format_paper_info(papers, header, summary_limit=150, include_source=True):
+    """
+    프롬프트에 넣을 논문 정보 블록을 만듭니다 (논문이 없으면 빈 문자열).
+    summary_limit이 None이면 요약 전체를 넣습니다.
+    """
+    if not papers:
+        return ""
+    paper_info = header + "\n\n"
+    for i, paper in enumerate(papers, 1):
+        paper_info += f"{i}. 제목: {paper['title']}\n"
+        if paper.get('authors'):
+            paper_info += f"   저자: {paper['authors']}\n"
+        if paper.get('published'):
+            paper_info += f"   발행: {paper['published']}\n"
+        if include_source and paper.get('source'):
+            paper_info += f"   출처: {paper['source']}\n"
+        summary = paper.get('summary')
+        if summary and summary != "요약 정보 없음":
+            paper_info += f"   요약: {summary}\n" if summary_limit is None else f"   요약: {summary[:summary_limit]}...\n"
+        paper_info += "\n"
+    return paper_info
+
+def extract_core_keywords(topic):
     """
+    주제에서 핵심 키워드를 추출합니다.
+    """
+    prompt = build_prompt("core_keywords", topic=topic)
     
-    response = get_completion(prompt)
+    response = get_completion(prompt, max_tokens=100, reserve=config.GENERATION_RESERVE, prompt_name="core_keywords")
+    if not response:
+        # 예산 소진 또는 오류 시 로컬 키워드 추출로 대체
+        return extract_keywords(topic, max_keywords=5)
     keywords = [kw.strip() for kw in response.split(',')]
     return keywords
 
@@ -429,44 +779,43 @@ def identify_academic_domain(topic):
     """
     주제의 학문 분야를 식별합니다.
     """
-    prompt = f"""
-    다음 연구 주제가 속하는 학문 분야를 가장 구체적으로 식별해주세요:
-    "{topic}"
+    prompt = build_prompt("academic_domain", topic=topic)
     
-    다음 중 하나를 선택하고, 가능하면 더 구체적인 하위 분야를 명시해주세요:
-    - 물리학 (예: 플라즈마 물리학, 양자역학, 열역학)
-    - 화학 (예: 유기화학, 생화학, 재료화학)
-    - 생물학 (예: 분자생물학, 생태학, 유전학)
-    - 의학 (예: 면역학, 신경과학, 종양학)
-    - 공학 (예: 전기공학, 기계공학, 화학공학)
-    - 컴퓨터 과학 (예: 인공지능, 데이터베이스, 사이버보안)
-    - 수학 (예: 대수학, 통계학, 확률론)
-    - 사회과학 (예: 경제학, 심리학, 사회학)
-    - 인문학 (예: 철학, 역사학, 언어학)
-    - 환경 과학 (예: 기후학, 생태학, 환경화학)
-    
-    응답은 간결하게 분야와 하위분야만 제공해주세요. 예: "물리학: 플라즈마 물리학"
-    """
-    
-    response = get_completion(prompt)
-    return response.strip()
+    response = get_completion(prompt, max_tokens=100, reserve=config.GENERATION_RESERVE, prompt_name="academic_domain")
+    return response.strip() if response else ""
 
 def filter_results_by_relevance(topic, keywords, results, threshold=0.5):
     """
     검색 결과에서 주제와 관련성이 높은 항목만 필터링합니다.
     """
     filtered_results = []
+    model = topic_vector = None
+    model_loaded = False
     
     for result in results:
-        # 1. 제목에 키워드 포함 여부 확인
-        title = result['title'].lower()
-        keyword_match = sum(1 for kw in keywords if kw.lower() in title) / len(keywords)
+        # 1. 제목에 키워드 포함 여부 확인 (40% 이상 포함되면 0.7 ~ 1.0)
+        relevance_score = keyword_relevance(keywords, result)
         
-        # 2. GPT를 통한 관련성 평가 (키워드 매칭만으로 충분히 관련성이 높으면 건너뜀)
-        if keyword_match >= 0.4:  # 40% 이상의 키워드가 제목에 포함되면 관련성 높음
-            relevance_score = 0.7 + (keyword_match * 0.3)  # 최소 0.7, 최대 1.0
-        else:
-            relevance_score = assess_relevance_with_gpt(topic, result)
+        # 벡터 모델(ISEF 데이터 전체 로드)은 키워드만으로 판단할 수 없는 결과가 처음 나올 때 불러옴
+        if relevance_score is None and not model_loaded:
+            from utils.data_utils import get_text_model
+            model = get_text_model()
+            topic_vector = model.transform(topic) if model is not None else None
+            model_loaded = True
+        
+        # 2. 벡터 유사도가 충분히 높으면 그대로 사용 (GPT 호출 없음)
+        if relevance_score is None and topic_vector is not None and topic_vector.any():
+            similarity = float(model.transform(f"{result['title']} {result.get('summary', '')}") @ topic_vector)
+            if similarity >= config.VECTOR_RELEVANCE_THRESHOLD:
+                relevance_score = round(min(1.0, similarity), 3)
+        
+        # 3. GPT를 통한 관련성 평가 (키워드/벡터 매칭만으로 충분히 관련성이 높으면 건너뜀)
+        if relevance_score is None:
+            if has_budget(config.MIN_CALL_BUDGET, reserve=config.GENERATION_RESERVE):
+                relevance_score = assess_relevance_with_gpt(topic, result)
+            else:
+                # 예산 소진 시 GPT 평가 생략 (기본값)
+                relevance_score = 0.5
         
         # 관련성 점수 저장
         result['relevance_score'] = relevance_score
@@ -490,19 +839,10 @@ def assess_relevance_with_gpt(topic, paper):
     if paper.get('summary') and paper['summary'] != "요약 정보 없음":
         paper_info += f"요약: {paper['summary']}\n"
     
-    prompt = f"""
-    다음 연구 주제와 논문 간의 관련성을 0.0에서 1.0 사이의 숫자로 평가해주세요:
-    
-    연구 주제: "{topic}"
-    
-    논문 정보:
-    {paper_info}
-    
-    관련성 점수 (0.0 ~ 1.0)만 숫자로 응답해주세요. 다른 설명은 필요하지 않습니다.
-    """
+    prompt = build_prompt("relevance", topic=topic, paper_info=paper_info)
     
     try:
-        response = get_completion(prompt)
+        response = get_completion(prompt, max_tokens=10, reserve=config.GENERATION_RESERVE, prompt_name="relevance")
         # 숫자만 추출
         score_match = re.search(r'(\d+\.\d+|\d+)', response)
         if score_match:
@@ -521,85 +861,46 @@ def verify_generated_topics(original_topic, ai_generated_text):
     # 이미 검증이 충분히 잘 되었으면 그대로 반환
     return ai_generated_text
 
-def generate_similar_topics(topic, count=5):
+def generate_similar_topics(topic, count=5, deep_retrieval=None, deadline=None):
     """
     입력된 주제와 유사한 연구 주제를 생성합니다.
     GPT의 내장 지식을 최대한 활용하여 풍부한 관련 주제 제공
+    deep_retrieval이 True이면 여러 페이지를 깊게 검색합니다 (기본값: config.DEEP_RETRIEVAL).
+    deadline이 없으면 config.STEP_SLO 기준으로 새로 만듭니다.
     """
+    if deep_retrieval is None:
+        deep_retrieval = config.DEEP_RETRIEVAL
+    
+    with deadline or Deadline(config.STEP_SLO["similar_topics"]):
+        return _generate_similar_topics(topic, count, deep_retrieval)
+
+def _generate_similar_topics(topic, count, deep_retrieval):
     # 주제의 핵심 키워드와 분야 식별 (기존 코드 유지)
     topic_keywords = extract_core_keywords(topic)
     domain = identify_academic_domain(topic)
     
     # 외부 API 검색 부분 (기존 코드 유지)
-    with st.spinner("학술 데이터베이스에서 관련 연구를 검색 중입니다..."):
+    with spinner("학술 데이터베이스에서 관련 연구를 검색 중입니다..."):
         try:
-            arxiv_results = search_arxiv(topic, max_results=10)
-            crossref_results = search_crossref(topic, max_results=10)
-            all_results = merge_search_results(arxiv_results, crossref_results, max_total=20)
+            if deep_retrieval:
+                all_results = deep_search_papers(topic, topic_keywords, max_total=20)
+            else:
+                all_results = topic_evidence(topic, config.EVIDENCE_MAX_TOTAL)
             api_results = filter_results_by_relevance(topic, topic_keywords, all_results)
         except Exception as e:
-            st.warning(f"외부 학술 데이터베이스 검색 중 오류가 발생했습니다. GPT 지식을 활용합니다.")
+            show_warning(f"외부 학술 데이터베이스 검색 중 오류가 발생했습니다. GPT 지식을 활용합니다.")
             api_results = []
     
-    # 검색된 논문 정보 구성 (기존 코드 유지)
-    paper_info = ""
-    if api_results:
-        paper_info = "다음은 해당 주제와 관련된 실제 논문 정보입니다. 이를 참고하되 이에 국한되지 않고 더 풍부한 주제를 생성해주세요:\n\n"
-        for i, paper in enumerate(api_results, 1):
-            paper_info += f"{i}. 제목: {paper['title']}\n"
-            if 'authors' in paper and paper['authors']:
-                paper_info += f"   저자: {paper['authors']}\n"
-            if 'published' in paper:
-                paper_info += f"   발행: {paper['published']}\n"
-            if paper.get('summary') and paper['summary'] != "요약 정보 없음":
-                paper_info += f"   요약: {paper['summary'][:150]}...\n"
-            paper_info += "\n"
-    
-    # 개선된 GPT 프롬프트: 더 구체적이고 자세한 설명 요구
-    prompt = f"""
-    당신은 '{domain}' 분야의 세계적인 전문가로 20년 이상의 연구 경험을 가지고 있습니다.
-    연구 주제 "{topic}"와 관련된 유사하면서도 독창적인 연구 주제 {count}개를 생성해야 합니다.
-    
-    {paper_info if paper_info else ""}
-    
-    각 유사 주제는 다음 구조로 상세히 설명해주세요:
-    
-    ## 주제 1: [주제명 - 명확하고 학술적인 제목으로 작성]
-    
-    ✅ **개념 정의 및 개요**
-    - 이 연구 주제가 무엇인지 3-4문장으로 명확하게 정의하고 개략적으로 설명
-    - 이 주제가 다루는 핵심 현상이나 문제를 구체적으로 설명
-    - 이 주제의 학문적 배경과 연구 맥락 제시
-    
-    ✅ **원주제와의 관련성**
-    - 이 주제가 원래 주제인 "{topic}"와 어떻게 연관되는지 구체적으로 설명
-    - 두 주제 간의 이론적/방법론적 연결고리 제시
-    - 원 주제에서 파생되거나 확장된 측면 설명
+    # 검색된 논문 정보 구성
+    paper_info = format_paper_info(
+        api_results, "다음은 해당 주제와 관련된 실제 논문 정보입니다. 이를 참고하되 이에 국한되지 않고 더 풍부한 주제를 생성해주세요:",
+        include_source=False)
     
-    ✅ **연구 방법론 또는 접근법**
-    - 이 주제를 연구하기 위한 2-3가지 구체적인 연구 방법 제안
-    - 필요한 데이터, 실험 설계, 분석 방법 등 구체적 방법론 설명
-    - 해당 방법론이 이 주제 연구에 적합한 이유 설명
+    # 고정 지시문이 앞, 분야/주제/논문 정보가 뒤에 오도록 구성 (프롬프트 캐시)
+    prompt = build_prompt("similar_topics", domain=domain, topic=topic, count=count, paper_info=paper_info)
     
-    ✅ **학술적 중요성 및 잠재적 영향**
-    - 이 연구가 학계에 기여할 수 있는 이론적 가치 설명
-    - 이 연구가 실용적/산업적 측면에서 가질 수 있는 응용 가치 설명
-    - 이 연구를 통해 해결할 수 있는 실제 문제나 질문 제시
-    
-    ✅ **관련 연구자 또는 논문**
-    - 이 주제와 관련된 실제 연구자나 논문 2-3개 언급 (있는 경우)
-    - 관련 연구의 핵심 발견이나 한계점 간략 설명
-    
-    ## 주제 2: [주제명]
-    ...
-    
-    각 주제는 실제로 연구될 가치가 있는 구체적이고 명확한 주제여야 합니다.
-    최신 연구 동향을 반영하되, 너무 일반적이거나 모호한 주제는 피해주세요.
-    주제들은 원래 주제인 "{topic}"와 명확하게 연관되어야 하지만, 단순히 동일한 주제의 다른 표현이 아닌 새로운 연구 방향을 제시해야 합니다.
-    """
-    
-    with st.spinner("유사 주제를 생성 중입니다..."):
-        ai_result = get_completion(prompt)
+    with spinner("유사 주제를 생성 중입니다..."):
+        ai_result = get_completion(prompt, prompt_name="similar_topics")
     
     # API 결과와 GPT 생성 결과 통합
     combined_results = []
@@ -619,7 +920,7 @@ def generate_similar_topics(topic, count=5):
             })
     
     # 파싱된 GPT 생성 결과 추가
-    gpt_topics = parse_gpt_generated_topics(ai_result)
+    gpt_topics = parse_gpt_generated_topics(ai_result) if ai_result else []
     for gpt_topic in gpt_topics:
         # API 결과가 너무 적거나, 최대 개수에 도달하지 않았으면 GPT 생성 주제 추가
         if len(combined_results) < count:
@@ -630,23 +931,10 @@ def generate_similar_topics(topic, count=5):
     
     # 결과가 여전히 부족하면 더 많은 GPT 생성 주제 추가
     if len(combined_results) < 3:
-        additional_prompt = f"""
-        당신은 '{domain}' 분야의 전문가입니다. 
-        연구 주제 "{topic}"와 관련된 추가적인 연구 주제 3개를 더 생성해주세요.
-        앞서 생성한 주제와 겹치지 않고, 더 폭넓은 관점에서 연관된 주제를 제안해주세요.
-        
-        각 주제는 다음 형식으로 제시해주세요:
-        
-        ## 주제: [주제명]
-        **설명**: [주제에 대한 간략한 설명]
-        **관련성**: [원래 주제와의 관련성]
-        **중요성**: [연구의 중요성]
-        
-        주제는 구체적이고 실행 가능해야 하며, 현대 연구 동향을 반영해야 합니다.
-        """
+        additional_prompt = build_prompt("additional_topics", domain=domain, topic=topic)
         
         try:
-            additional_result = get_completion(additional_prompt)
+            additional_result = get_completion(additional_prompt, prompt_name="additional_topics")
             additional_topics = parse_additional_topics(additional_result)
             
             for topic in additional_topics:
@@ -667,59 +955,50 @@ def generate_similar_topics(topic, count=5):
         "api_results": api_results,
         "combined_results": combined_results[:count]
     }
-def generate_niche_topics(topic, count=4):
+def generate_niche_topics(topic, count=4, deadline=None):
     """
     선택된 주제와 관련된 틈새 연구 주제를 제안합니다.
+    deadline이 없으면 config.STEP_SLO 기준으로 새로 만듭니다.
     """
-    # 먼저 실제 논문 검색
-    arxiv_papers = search_arxiv(topic, max_results=3)
-    crossref_papers = search_crossref(topic, max_results=3)
-    all_papers = merge_search_results(arxiv_papers, crossref_papers, max_total=5)
-    
-    # 검색된 논문 정보를 포함한 프롬프트 생성
-    paper_info = ""
-    if all_papers:
-        paper_info = "다음은 해당 주제와 관련된 실제 논문 정보입니다. 이를 참고하여 틈새 주제를 제안해주세요:\n\n"
-        for i, paper in enumerate(all_papers, 1):
-            paper_info += f"{i}. 제목: {paper['title']}\n"
-            paper_info += f"   저자: {paper['authors']}\n"
-            paper_info += f"   발행: {paper['published']}\n"
-            paper_info += f"   출처: {paper['source']}\n"
-            if paper['summary'] and paper['summary'] != "요약 정보 없음":
-                paper_info += f"   요약: {paper['summary'][:150]}...\n"
-            paper_info += "\n"
-    
-    prompt = f"""
-    다음 연구 주제와 관련된 틈새 연구 주제 {count}개를 제안해주세요: "{topic}"
-    
-    {paper_info}
-    
-    틈새 주제란 아직 충분히 연구되지 않았지만 잠재적으로 가치 있는 연구 영역입니다.
-    
-    각 틈새 주제는 다음 형식으로 제시해주세요:
-    
-    ## 틈새 주제 1: [주제명]
-    
-    **배경**: [이 분야에서 현재까지의 연구 상황]
-    
-    **틈새 영역으로 고려되는 이유**: 
-    [왜 이 주제가 충분히 연구되지 않았는지, 어떤 측면이 간과되고 있는지]
-    
-    **연구 가치와 영향력**: 
-    [이 주제 연구가 학문적/실용적으로 어떤 가치가 있는지]
+    with deadline or Deadline(config.STEP_SLO["niche_topics"]):
+        return _generate_niche_topics(topic, count)
+
+def _generate_niche_topics(topic, count):
+    # 주제별 근거 논문에서 상위 논문 선택 (같은 주제를 이미 검색했으면 추가 검색 없음)
+    all_papers = topic_evidence(topic, 5)
+    paper_info = format_paper_info(all_papers, "다음은 해당 주제와 관련된 실제 논문 정보입니다. 이를 참고하여 틈새 주제를 제안해주세요:")
     
-    **제안 연구 방법**: 
-    [어떤 방법론과 접근 방식으로 연구할 수 있는지]
+    prompt = build_prompt("niche_topics", topic=topic, count=count, paper_info=paper_info)
     
-    **관련 논문**: 
-    [위 목록에서 관련 있는 논문 참조]
+    with spinner("틈새 주제를 생성 중입니다..."):
+        result = get_completion(prompt, prompt_name="niche_topics")
     
-    실제 논문을 기반으로 하되, 새롭고 혁신적인 연구 틈새를 찾아내주세요.
-    각 틈새 주제는 실행 가능하고, 구체적이며, 학술적 가치가 있어야 합니다.
+    if result:
+        return {
+            "content": result,
+            "papers": all_papers
+        }
+    else:
+        return None
+
+def generate_paper_structure(topic, deadline=None):
     """
+    선택된 주제로 연구 논문 초안(마크다운)을 생성합니다.
+    섹션 제목 형식은 utils.paper_parse_utils.parse_paper_markdown이 PDF용으로 나눌 수 있게 고정합니다.
+    deadline이 없으면 config.STEP_SLO 기준으로 새로 만듭니다.
+    """
+    with deadline or Deadline(config.STEP_SLO["paper_generation"]):
+        return _generate_paper_structure(topic)
+
+def _generate_paper_structure(topic):
+    # 주제별 근거 논문에서 상위 논문 선택 (같은 주제를 이미 검색했으면 추가 검색 없음)
+    all_papers = topic_evidence(topic, 5)
+    paper_info = format_paper_info(all_papers, "다음은 해당 주제와 관련된 실제 논문 정보입니다. 참고문헌은 이 목록에서만 인용해주세요:")
+    
+    prompt = build_prompt("paper_generation", topic=topic, paper_info=paper_info)
     
-    with st.spinner("틈새 주제를 생성 중입니다..."):
-        result = get_completion(prompt)
+    with spinner("논문 초안을 생성 중입니다..."):
+        result = get_completion(prompt, prompt_name="paper_generation")
     
     if result:
         return {
@@ -0,0 +1,233 @@
+"""
+ISEF 원본(xlsx)을 다시 만들지 않고 새 프로젝트 레코드를 추가 세그먼트로 적재합니다.
+
+사용 예:
+    python -m utils.isef_ingest_utils add isef_2025.xlsx
+    python -m utils.isef_ingest_utils add new_projects.csv more_projects.jsonl
+    python -m utils.isef_ingest_utils merge
+    python -m utils.isef_ingest_utils status
+
+실행 중인 앱은 매니페스트가 바뀐 것을 감지해 새 세그먼트를 백그라운드에서 읽은 뒤 한 번에 교체합니다.
+매니페스트를 고치는 작업은 잠금 파일로 한 번에 하나씩만 실행됩니다.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+import pandas as pd
+import config
+from utils.data_utils import (load_isef_data, find_title_column, compact_dataframe, read_manifest,
+                              write_manifest, write_isef_segment, read_isef_segment_records,
+                              isef_segment_names)
+
+def _lock_path():
+    return os.path.join(config.ISEF_CACHE_DIR, "isef_manifest.lock")
+
+@contextmanager
+def manifest_lock(timeout=60, stale_seconds=600):
+    """
+    매니페스트 수정용 프로세스 간 잠금 (잠금 파일 생성 방식).
+    """
+    os.makedirs(config.ISEF_CACHE_DIR, exist_ok=True)
+    path = _lock_path()
+    start = time.time()
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            break
+        except FileExistsError:
+            # 비정상 종료로 남은 잠금 파일은 제거
+            try:
+                if time.time() - os.path.getmtime(path) > stale_seconds:
+                    os.remove(path)
+                    continue
+            except OSError:
+                continue
+            if time.time() - start > timeout:
+                raise TimeoutError("다른 적재/병합 작업이 진행 중입니다.")
+            time.sleep(0.5)
+    try:
+        yield
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def read_records(path):
+    """
+    xlsx/CSV/JSONL 파일을 데이터프레임으로 읽습니다.
+    """
+    lower = path.lower()
+    if lower.endswith((".xlsx", ".xls")):
+        return pd.read_excel(path)
+    if lower.endswith(".csv"):
+        return pd.read_csv(path)
+    if lower.endswith((".jsonl", ".json")):
+        return pd.read_json(path, lines=lower.endswith(".jsonl"))
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {path}")
+
+def _record_keys(df, title_column):
+    """
+    중복 판단용 (연도, 제목) 키 집합을 반환합니다.
+    """
+    years = df["Year"].astype(str) if "Year" in df.columns else pd.Series([""] * len(df), index=df.index)
+    titles = df[title_column].astype(str).str.strip().str.lower()
+    return set(zip(years, titles))
+
+def prepare_records(frames, current):
+    """
+    새 레코드를 현재 데이터와 같은 컬럼으로 맞추고, 제목이 없거나 이미 있는 (연도, 제목) 레코드는 제외합니다.
+    """
+    title_column = find_title_column(current)
+    new_df = pd.concat(frames, ignore_index=True)
+    if title_column not in new_df.columns:
+        raise ValueError(f"제목 컬럼({title_column})이 없습니다.")
+    new_df = new_df.reindex(columns=current.columns)
+    new_df = new_df[new_df[title_column].notna() & (new_df[title_column].astype(str).str.strip() != "")]
+    
+    existing = _record_keys(current, title_column)
+    keys = list(zip(new_df["Year"].astype(str) if "Year" in new_df.columns else [""] * len(new_df),
+                    new_df[title_column].astype(str).str.strip().str.lower()))
+    keep = []
+    for key in keys:
+        keep.append(key not in existing)
+        existing.add(key)
+    return compact_dataframe(new_df[keep].reset_index(drop=True))
+
+def _merge_started_at(name):
+    """
+    병합 세그먼트 이름(merged-<밀리초>, 작성 중이면 .tmp)에서 병합 시작 시각을 읽습니다 (병합 세그먼트가 아니면 None).
+    """
+    if not name.startswith("merged-"):
+        return None
+    try:
+        return int(name[len("merged-"):].split(".")[0]) / 1000
+    except ValueError:
+        return None
+
+def _collect_garbage(manifest):
+    """
+    매니페스트의 현재/직전 목록 어디에도 없는 세그먼트 디렉터리를 삭제합니다.
+    잠금 밖에서 만드는 중이거나 공개를 기다리는 병합 세그먼트는 config.ISEF_MERGE_GRACE_SECONDS 동안 남겨 둡니다.
+    """
+    root = os.path.join(config.ISEF_CACHE_DIR, "segments")
+    if not os.path.isdir(root):
+        return
+    keep = set(manifest["segments"]) | set(manifest.get("retired", []))
+    for name in os.listdir(root):
+        if name in keep:
+            continue
+        started_at = _merge_started_at(name)
+        if started_at is not None and time.time() - started_at < config.ISEF_MERGE_GRACE_SECONDS:
+            continue
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+def add_files(paths):
+    """
+    파일의 레코드를 새 세그먼트로 적재하고 매니페스트에 추가합니다. 추가된 레코드 수를 반환합니다.
+    """
+    current = load_isef_data()
+    if current.empty:
+        raise ValueError(f"원본 ISEF 데이터가 없습니다: {config.ISEF_DATA_PATH}")
+    
+    with manifest_lock():
+        # 다른 프로세스가 방금 추가한 세그먼트까지 포함해 중복 검사
+        manifest = read_manifest()
+        frames = [current] + [read_isef_segment_records(name) for name in manifest["segments"]
+                              if name not in isef_segment_names(current)]
+        current = pd.concat(frames, ignore_index=True) if len(frames) > 1 else current
+        
+        new_df = prepare_records([read_records(path) for path in paths], current)
+        if new_df.empty:
+            return 0
+        
+        version = manifest["version"] + 1
+        name = f"seg-{version:06d}"
+        write_isef_segment(new_df, name)
+        manifest = {"version": version, "segments": manifest["segments"] + [name],
+                    "retired": manifest.get("retired", [])}
+        write_manifest(manifest)
+        _collect_garbage(manifest)
+    return len(new_df)
+
+def merge_segments():
+    """
+    추가 세그먼트들을 하나로 병합해 새 버전으로 공개합니다.
+    병합하는 동안 새로 추가된 세그먼트는 병합 결과 뒤에 그대로 유지합니다. 병합된 세그먼트 수를 반환합니다.
+    """
+    merged_names = read_manifest()["segments"]
+    if len(merged_names) < 2:
+        return 0
+    
+    # 세그먼트 생성은 잠금 밖에서 (그동안 적재는 계속 가능)
+    load_isef_data()
+    merged = compact_dataframe(pd.concat([read_isef_segment_records(name) for name in merged_names],
+                                         ignore_index=True))
+    name = f"merged-{int(time.time() * 1000)}"
+    write_isef_segment(merged, name)
+    
+    with manifest_lock():
+        manifest = read_manifest()
+        if manifest["segments"][:len(merged_names)] != merged_names:
+            # 다른 병합이 먼저 끝난 경우
+            shutil.rmtree(os.path.join(config.ISEF_CACHE_DIR, "segments", name), ignore_errors=True)
+            return 0
+        if not os.path.isdir(os.path.join(config.ISEF_CACHE_DIR, "segments", name)):
+            # 유예 시간보다 오래 걸려 정리된 경우 공개하지 않음
+            return 0
+        manifest = {"version": manifest["version"] + 1,
+                    "segments": [name] + manifest["segments"][len(merged_names):],
+                    # 직전 버전을 읽고 있는 프로세스를 위해 한 세대 동안 보관
+                    "retired": merged_names}
+        write_manifest(manifest)
+        _collect_garbage(manifest)
+    return len(merged_names)
+
+def start_background_merge():
+    """
+    별도 프로세스에서 병합을 시작합니다 (적재 명령은 기다리지 않고 종료).
+    """
+    return subprocess.Popen([sys.executable, "-m", "utils.isef_ingest_utils", "merge"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            start_new_session=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ISEF 추가 데이터 적재")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    add_parser = subparsers.add_parser("add", help="xlsx/CSV/JSONL 레코드 추가")
+    add_parser.add_argument("paths", nargs="+")
+    add_parser.add_argument("--no-merge", action="store_true", help="세그먼트가 많아도 병합하지 않음")
+    
+    subparsers.add_parser("merge", help="추가 세그먼트 병합")
+    subparsers.add_parser("status", help="매니페스트 상태 출력")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == "add":
+        start = time.time()
+        added = add_files(args.paths)
+        manifest = read_manifest()
+        print(f"{added}건 추가 ({time.time() - start:.1f}초, 버전 {manifest['version']}, "
+              f"세그먼트 {len(manifest['segments'])}개)")
+        if not args.no_merge and len(manifest["segments"]) > config.ISEF_MAX_SEGMENTS:
+            start_background_merge()
+            print("백그라운드 병합을 시작했습니다.")
+    elif args.command == "merge":
+        start = time.time()
+        merged = merge_segments()
+        print(f"세그먼트 {merged}개 병합 ({time.time() - start:.1f}초)")
+    else:
+        manifest = read_manifest()
+        print(f"버전 {manifest['version']}")
+        for name in manifest["segments"]:
+            print(f"  {name}: {len(read_isef_segment_records(name))}건")
+
+if __name__ == "__main__":
+    main()
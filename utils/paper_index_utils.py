@@ -0,0 +1,462 @@
+"""
+arXiv/Crossref 대량 메타데이터 덤프를 로컬 SQLite FTS5 색인으로 적재하고 검색합니다.
+
+사용 예:
+    python -m utils.paper_index_utils ingest --arxiv arxiv-metadata-oai-snapshot.json
+    python -m utils.paper_index_utils ingest --crossref crossref-snapshot/
+    python -m utils.paper_index_utils vectorize
+    python -m utils.paper_index_utils search "microplastics marine ecosystem"
+"""
+import argparse
+import glob
+import gzip
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import numpy as np
+import config
+from utils.vector_utils import IvfIndex
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    id INTEGER PRIMARY KEY,
+    paper_id TEXT UNIQUE,
+    title TEXT,
+    authors TEXT,
+    summary TEXT,
+    published TEXT,
+    url TEXT,
+    source TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, summary, authors,
+    content='papers', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts(rowid, title, summary, authors)
+    VALUES (new.id, new.title, new.summary, new.authors);
+END;
+"""
+
+# BM25 컬럼 가중치 (title, summary, authors)
+BM25_WEIGHTS = (10.0, 1.0, 0.5)
+
+_local = threading.local()
+
+# 경로별 벡터 색인 (meta.json 수정 시각이 바뀌면 다시 읽음)
+_ann_cache = {}
+_ann_lock = threading.Lock()
+
+def _get_connection(db_path):
+    """
+    스레드별로 SQLite 연결을 재사용합니다.
+    """
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path)
+        connections[db_path] = conn
+    return conn
+
+def _open_for_write(db_path):
+    """
+    적재용 연결을 열고 스키마를 생성합니다.
+    """
+    db_dir = os.path.dirname(db_path)
+    if db_dir and not os.path.exists(db_dir):
+        os.makedirs(db_dir)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def _clean_text(text):
+    """
+    덤프에 포함된 줄바꿈/태그를 정리합니다.
+    """
+    if not text:
+        return ""
+    text = re.sub(r'<[^>]+>', ' ', str(text))
+    return re.sub(r'\s+', ' ', text).strip()
+
+def _record_from_arxiv(obj):
+    """
+    arXiv 메타데이터 덤프(JSON Lines)의 한 줄을 검색 결과 형식으로 변환합니다.
+    """
+    arxiv_id = obj.get('id')
+    if not arxiv_id or not obj.get('title'):
+        return None
+    
+    published = obj.get('update_date') or ""
+    versions = obj.get('versions') or []
+    if versions and versions[0].get('created'):
+        # 최초 버전 날짜 사용 (예: "Mon, 2 Apr 2007 19:18:42 GMT")
+        try:
+            published = parsedate_to_datetime(versions[0]['created']).strftime('%Y-%m-%d')
+        except (TypeError, ValueError):
+            pass
+    
+    authors = obj.get('authors')
+    if obj.get('authors_parsed'):
+        authors = ', '.join(' '.join(p for p in reversed(parts[:2]) if p).strip()
+                            for parts in obj['authors_parsed'])
+    
+    return {
+        'paper_id': f"arxiv:{arxiv_id}",
+        'title': _clean_text(obj['title']),
+        'authors': _clean_text(authors),
+        'summary': _clean_text(obj.get('abstract')),
+        'published': published,
+        'url': f"https://arxiv.org/abs/{arxiv_id}",
+        'source': 'arXiv'
+    }
+
+def _record_from_crossref(item):
+    """
+    Crossref 스냅샷의 item 하나를 검색 결과 형식으로 변환합니다.
+    """
+    doi = item.get('DOI')
+    if not doi or not item.get('title'):
+        return None
+    
+    authors = []
+    for author in item.get('author', []):
+        name_parts = []
+        if 'given' in author:
+            name_parts.append(author['given'])
+        if 'family' in author:
+            name_parts.append(author['family'])
+        if name_parts:
+            authors.append(' '.join(name_parts))
+    
+    published = ""
+    for key in ('published-print', 'published-online', 'created'):
+        date_parts = item.get(key, {}).get('date-parts')
+        if date_parts and date_parts[0] and date_parts[0][0]:
+            published = str(date_parts[0][0])
+            break
+    
+    return {
+        'paper_id': f"doi:{doi.lower()}",
+        'title': _clean_text(item['title'][0]),
+        'authors': ', '.join(authors),
+        'summary': _clean_text(item.get('abstract')),
+        'published': published,
+        'url': item.get('URL'),
+        'source': 'Crossref'
+    }
+
+def _open_text(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+def iter_arxiv_dump(path):
+    """
+    arXiv 메타데이터 덤프 파일에서 레코드를 하나씩 읽습니다.
+    """
+    with _open_text(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = _record_from_arxiv(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+            if record:
+                yield record
+
+def iter_crossref_snapshot(path):
+    """
+    Crossref 스냅샷(디렉터리 또는 단일 파일)에서 레코드를 하나씩 읽습니다.
+    .json(.gz) 파일은 {"items": [...]} 형식, .jsonl(.gz) 파일은 한 줄에 item 하나로 간주합니다.
+    """
+    if os.path.isdir(path):
+        files = sorted(glob.glob(os.path.join(path, '**', '*.json*'), recursive=True))
+    else:
+        files = [path]
+    
+    for file_path in files:
+        with _open_text(file_path) as f:
+            if '.jsonl' in file_path:
+                items = (json.loads(line) for line in f if line.strip())
+            else:
+                data = json.load(f)
+                items = data.get('items', []) if isinstance(data, dict) else data
+            for item in items:
+                record = _record_from_crossref(item)
+                if record:
+                    yield record
+
+def ingest_records(records, db_path=config.LOCAL_PAPER_INDEX_PATH, batch_size=5000):
+    """
+    레코드를 색인에 적재합니다. 이미 있는 paper_id는 건너뜁니다.
+    적재된 레코드 수를 반환합니다.
+    """
+    conn = _open_for_write(db_path)
+    columns = ('paper_id', 'title', 'authors', 'summary', 'published', 'url', 'source')
+    sql = f"INSERT OR IGNORE INTO papers ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    
+    inserted = 0
+    batch = []
+    try:
+        for record in records:
+            batch.append(tuple(record.get(col) for col in columns))
+            if len(batch) >= batch_size:
+                inserted += conn.executemany(sql, batch).rowcount
+                conn.commit()
+                batch = []
+        if batch:
+            inserted += conn.executemany(sql, batch).rowcount
+            conn.commit()
+        # 세그먼트 병합으로 검색 속도 유지
+        conn.execute("INSERT INTO papers_fts(papers_fts) VALUES ('optimize')")
+        conn.commit()
+    finally:
+        conn.close()
+    
+    return inserted
+
+def _build_match_query(query):
+    """
+    자유 형식 질의를 FTS5 MATCH 구문으로 변환합니다 (토큰 OR 결합).
+    """
+    tokens = [t for t in re.findall(r'\w+', query.lower()) if len(t) >= 2]
+    if not tokens:
+        return None
+    return " OR ".join(f'"{t}"' for t in dict.fromkeys(tokens))
+
+def search_local_index(query, max_results=5, db_path=config.LOCAL_PAPER_INDEX_PATH):
+    """
+    로컬 색인에서 BM25 순위로 논문을 검색합니다.
+    search_arxiv/search_crossref와 같은 형식의 결과 리스트를 반환하며, 색인이 없으면 빈 리스트를 반환합니다.
+    """
+    if not os.path.exists(db_path):
+        return []
+    
+    match_query = _build_match_query(query)
+    if not match_query:
+        return []
+    
+    try:
+        conn = _get_connection(db_path)
+        rows = conn.execute(
+            f"""
+            SELECT p.title, p.authors, p.summary, p.published, p.url, p.source,
+                   bm25(papers_fts, {', '.join(str(w) for w in BM25_WEIGHTS)}) AS rank
+            FROM papers_fts
+            JOIN papers p ON p.id = papers_fts.rowid
+            WHERE papers_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+            """,
+            (match_query, max_results)
+        ).fetchall()
+    except sqlite3.Error as e:
+        print(f"로컬 색인 검색 오류: {str(e)}")
+        return []
+    
+    results = []
+    for title, authors, summary, published, url, source, rank in rows:
+        summary = summary or "요약 정보 없음"
+        results.append({
+            'title': title,
+            'authors': authors or "",
+            'summary': summary[:300] + "..." if len(summary) > 300 else summary,
+            'published': published or "날짜 없음",
+            'url': url,
+            'source': source,
+            'bm25_score': -rank,
+            'is_local_index': True
+        })
+    return results
+
+def _ann_directory(db_path):
+    return f"{db_path}.ivf"
+
+def _read_ann_meta(directory):
+    meta_path = os.path.join(directory, "meta.json")
+    if not os.path.exists(meta_path) or not IvfIndex.exists(directory):
+        return None
+    with open(meta_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def has_paper_vectors(db_path=config.LOCAL_PAPER_INDEX_PATH):
+    """
+    논문 벡터 색인이 있는지 확인합니다 (벡터 모델을 불러오기 전에 확인용).
+    """
+    return os.path.exists(os.path.join(_ann_directory(db_path), "meta.json"))
+
+def build_paper_vectors(model, model_id, db_path=config.LOCAL_PAPER_INDEX_PATH, batch_size=20000):
+    """
+    색인된 논문(제목 + 초록)을 벡터화해 IVF 색인에 추가합니다.
+    이전에 벡터화한 논문 이후에 적재된 논문만 처리하며 (점진적 삽입), 색인이 없으면 새로 학습합니다.
+    model_id(utils.data_utils.text_model_id)가 기존 색인과 다르면 전체를 다시 벡터화합니다.
+    추가된 논문 수를 반환합니다.
+    """
+    directory = _ann_directory(db_path)
+    meta = _read_ann_meta(directory)
+    if meta and (meta.get("dim") != model.components.shape[0] or meta.get("model_sha256") != model_id):
+        meta = None  # 모델이 바뀌면 다시 학습
+    last_id = meta["last_id"] if meta else 0
+    
+    conn = sqlite3.connect(db_path)
+    ids, vectors = [], []
+    try:
+        cursor = conn.execute("SELECT id, title, summary FROM papers WHERE id > ? ORDER BY id", (last_id,))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            ids.extend(row[0] for row in rows)
+            vectors.append(np.vstack([model.transform(f"{title} {summary or ''}") for _, title, summary in rows]))
+    finally:
+        conn.close()
+    
+    if not ids:
+        return 0
+    vectors = np.vstack(vectors).astype(np.float32)
+    if meta:
+        ann = IvfIndex.load(directory)
+        # 메모리 매핑된 조각을 복사해 추가 가능한 배열로 변환
+        ann.list_ids = [np.array(part) for part in ann.list_ids]
+        ann.list_vectors = [np.array(part) for part in ann.list_vectors]
+        ann.add(ids, vectors)
+    else:
+        ann = IvfIndex.train(vectors, ids=ids, n_lists=config.ANN_LISTS)
+    
+    ann.save(directory)
+    with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"last_id": max(ids), "dim": int(vectors.shape[1]), "count": len(ann), "model_sha256": model_id}, f)
+    return len(ids)
+
+def _get_paper_ann(db_path):
+    """
+    (IVF 색인, meta.json 내용)을 반환합니다 (색인이 없으면 (None, None)).
+    """
+    directory = _ann_directory(db_path)
+    meta_path = os.path.join(directory, "meta.json")
+    if not os.path.exists(meta_path):
+        return None, None
+    mtime = os.path.getmtime(meta_path)
+    cached = _ann_cache.get(db_path)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+    with _ann_lock:
+        try:
+            ann = IvfIndex.load(directory)
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"논문 벡터 색인 로드 오류: {str(e)}")
+            return None, None
+        _ann_cache[db_path] = (mtime, ann, meta)
+        return ann, meta
+
+def search_local_vectors(query_vector, model_id, max_results=5, db_path=config.LOCAL_PAPER_INDEX_PATH):
+    """
+    논문 벡터 색인에서 질의 벡터와 가까운 논문을 근사 검색합니다.
+    search_local_index와 같은 형식에 vector_score를 더한 결과를 반환하며, 벡터 색인이 없거나
+    질의 벡터 모델(model_id)과 다른 모델로 만든 색인이면 빈 리스트를 반환합니다 (vectorize로 다시 만들어야 함).
+    """
+    ann, meta = _get_paper_ann(db_path)
+    if ann is None or query_vector is None or not query_vector.any():
+        return []
+    if meta.get("model_sha256") != model_id:
+        return []
+    
+    hits = ann.search(query_vector, max_results, n_probe=config.ANN_PROBES)
+    if not hits:
+        return []
+    scores = dict(hits)
+    
+    try:
+        conn = _get_connection(db_path)
+        rows = conn.execute(
+            f"""
+            SELECT id, title, authors, summary, published, url, source
+            FROM papers WHERE id IN ({', '.join('?' * len(scores))})
+            """,
+            list(scores)
+        ).fetchall()
+    except sqlite3.Error as e:
+        print(f"로컬 벡터 검색 오류: {str(e)}")
+        return []
+    
+    results = []
+    for paper_id, title, authors, summary, published, url, source in rows:
+        summary = summary or "요약 정보 없음"
+        results.append({
+            'title': title,
+            'authors': authors or "",
+            'summary': summary[:300] + "..." if len(summary) > 300 else summary,
+            'published': published or "날짜 없음",
+            'url': url,
+            'source': source,
+            'vector_score': scores[paper_id],
+            'is_local_index': True
+        })
+    results.sort(key=lambda x: x['vector_score'], reverse=True)
+    return results
+
+def index_size(db_path=config.LOCAL_PAPER_INDEX_PATH):
+    """
+    색인에 적재된 논문 수를 반환합니다.
+    """
+    if not os.path.exists(db_path):
+        return 0
+    return _get_connection(db_path).execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 논문 색인 관리")
+    parser.add_argument("--db", default=config.LOCAL_PAPER_INDEX_PATH, help="색인 파일 경로")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    ingest_parser = subparsers.add_parser("ingest", help="메타데이터 덤프 적재")
+    ingest_parser.add_argument("--arxiv", nargs="*", default=[], help="arXiv 메타데이터 JSON Lines 파일")
+    ingest_parser.add_argument("--crossref", nargs="*", default=[], help="Crossref 스냅샷 디렉터리 또는 파일")
+    
+    subparsers.add_parser("vectorize", help="새로 적재된 논문을 벡터 색인에 추가")
+    
+    search_parser = subparsers.add_parser("search", help="색인 검색")
+    search_parser.add_argument("query")
+    search_parser.add_argument("-n", "--max-results", type=int, default=10)
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == "ingest":
+        start = time.time()
+        total = 0
+        for path in args.arxiv:
+            total += ingest_records(iter_arxiv_dump(path), db_path=args.db)
+        for path in args.crossref:
+            total += ingest_records(iter_crossref_snapshot(path), db_path=args.db)
+        print(f"{total}건 적재 완료 ({time.time() - start:.1f}초, 전체 {index_size(args.db)}건)")
+    elif args.command == "vectorize":
+        from utils.data_utils import get_text_model, text_model_id
+        model = get_text_model()
+        if model is None:
+            print("벡터 모델을 만들 ISEF 데이터가 없습니다.")
+            return
+        start = time.time()
+        added = build_paper_vectors(model, text_model_id(), db_path=args.db)
+        print(f"{added}건 벡터화 완료 ({time.time() - start:.1f}초)")
+    else:
+        start = time.perf_counter()
+        results = search_local_index(args.query, max_results=args.max_results, db_path=args.db)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for i, paper in enumerate(results, 1):
+            print(f"{i}. [{paper['source']}] {paper['title']} ({paper['published']})")
+        print(f"{len(results)}건, {elapsed_ms:.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import re
+
+# 섹션 제목에 들어 있는 키워드 -> paper_data 필드 (앞에서부터 먼저 일치하는 것 사용)
+SECTION_KEYWORDS = [
+    ('abstract', ('초록', '요약', 'abstract')),
+    ('introduction', ('서론', '배경', 'introduction')),
+    ('methods', ('연구 방법', '방법', 'method')),
+    ('results', ('예상 결과', '결과', 'result')),
+    ('conclusion', ('결론', '논의', 'conclusion', 'discussion')),
+    ('references', ('참고문헌', '참고 문헌', 'reference')),
+]
+
+_HEADING_PATTERN = re.compile(r'^(#{1,6})\s*(.+?)\s*#*$')
+_LIST_PATTERN = re.compile(r'^(?:(?:[-*+•]|\[?\d+[.)\]])\s+)+')
+
+def _plain_text(text):
+    """
+    굵게/기울임/코드/링크 마크다운 표시를 지웁니다.
+    """
+    text = re.sub(r'\*\*(.+?)\*\*|__(.+?)__', lambda m: m.group(1) or m.group(2), text)
+    text = re.sub(r'(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?!\w)', r'\1', text)
+    text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'\1 (\2)', text)
+    return text.replace('`', '').strip()
+
+def section_for_heading(heading):
+    """
+    섹션 제목에 해당하는 paper_data 필드명을 반환합니다 (없으면 None).
+    """
+    lowered = heading.lower()
+    for field, keywords in SECTION_KEYWORDS:
+        if any(keyword in lowered for keyword in keywords):
+            return field
+    return None
+
+def parse_paper_markdown(markdown, topic='', papers=None, authors='자동 생성됨'):
+    """
+    생성된 논문 마크다운을 줄 단위로 한 번 훑어 PDF용 paper_data 구조로 나눕니다.
+    첫 번째 # 제목을 논문 제목으로 쓰고(없으면 topic), 섹션은 ## 제목으로만 바꿉니다 (PROMPT_TEMPLATES["paper_generation"] 형식).
+    알 수 없는 ## 제목, ### 이하 소제목, 줄 전체가 굵은 글씨인 문단은 현재 섹션 본문에 포함합니다.
+    참고문헌 섹션이 없으면 검색된 실제 논문 목록(papers)으로 채웁니다.
+    """
+    title = ''
+    sections = {field: [] for field, _ in SECTION_KEYWORDS}
+    current = None
+    
+    for raw_line in (markdown or '').splitlines():
+        line = raw_line.strip()
+        heading = _HEADING_PATTERN.match(line)
+        heading_text = _plain_text(heading.group(2)) if heading else None
+        
+        if heading:
+            level = len(heading.group(1))
+            # 제목 키워드(결과, 방법 등)가 들어 있어도 첫 # 제목은 논문 제목
+            if level == 1 and not title:
+                title = heading_text
+                continue
+            field = section_for_heading(heading_text) if level == 2 else None
+            if field:
+                current = field
+                continue
+        
+        if current is None:
+            # 첫 섹션 이전의 문단은 초록으로 취급
+            if not line or heading:
+                continue
+            current = 'abstract'
+        elif heading:
+            line = heading_text
+        
+        if current == 'references':
+            if line:
+                sections['references'].append(_plain_text(_LIST_PATTERN.sub('', line)))
+            continue
+        sections[current].append(_plain_text(line) if line else '')
+    
+    paper_data = {'title': title or topic, 'authors': authors}
+    for field, _ in SECTION_KEYWORDS:
+        if field == 'references':
+            continue
+        # 빈 줄로 구분된 문단은 줄바꿈 하나로 유지
+        paragraphs = '\n'.join(sections[field]).strip()
+        paper_data[field] = re.sub(r'\n{2,}', '\n', paragraphs)
+    
+    references = sections['references']
+    if not references and papers:
+        references = [f"{paper.get('authors', '')} ({paper.get('published', '')}). {paper.get('title', '')}. "
+                      f"{paper.get('source', '')}" for paper in papers]
+    paper_data['references'] = references
+    return paper_data
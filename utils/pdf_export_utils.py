@@ -0,0 +1,136 @@
+"""
+생성된 논문 여러 편을 PDF로 한 번에 변환해 zip 파일로 묶습니다 (학급 단위 내보내기).
+
+사용 예:
+    python -m utils.pdf_export_utils papers.jsonl -o class_3.zip
+    python -m utils.pdf_export_utils papers_dir/ -o class_3.zip --workers 4
+
+입력은 논문 데이터(create_research_paper_pdf 형식 또는 생성된 논문 {topic, content, papers}) JSON 객체를
+한 줄에 하나씩 담은 JSONL 파일, 또는 그런 JSON 파일(객체 하나 또는 객체 목록)이 들어 있는 디렉터리입니다.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from utils.font_utils import load_font_metrics
+from utils.paper_parse_utils import parse_paper_markdown
+from utils.pdf_render_utils import render_research_paper_pdf, FONT_REGULAR_PATH, FONT_BOLD_PATH
+
+def read_paper_records(path):
+    """
+    JSONL 파일 또는 JSON 파일 디렉터리에서 논문 데이터 목록을 읽습니다.
+    """
+    if os.path.isdir(path):
+        records = []
+        for name in sorted(os.listdir(path)):
+            if not name.lower().endswith((".json", ".jsonl")):
+                continue
+            records.extend(read_paper_records(os.path.join(path, name)))
+        return records
+    
+    with open(path, encoding="utf-8") as f:
+        if path.lower().endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        data = json.load(f)
+    return data if isinstance(data, list) else [data]
+
+def _normalize_record(record):
+    """
+    PDF 렌더링에 필요한 필수 필드를 채웁니다.
+    생성된 논문 레코드({topic, content, papers})는 마크다운을 섹션별로 나눠 사용합니다.
+    """
+    if "content" in record and "abstract" not in record:
+        record = parse_paper_markdown(record["content"], topic=record.get("topic", ""),
+                                      papers=record.get("papers"))
+    paper_data = dict(record)
+    for field in ("title", "authors", "abstract"):
+        paper_data[field] = str(paper_data.get(field) or "")
+    paper_data["references"] = [str(ref) for ref in paper_data.get("references") or []]
+    return paper_data
+
+def pdf_file_name(index, paper_data):
+    """
+    zip 안에서 쓸 파일 이름 (번호_제목.pdf, 번호로 중복 방지).
+    """
+    title = re.sub(r'[\\/:*?"<>|\s]+', "_", paper_data["title"]).strip("_")[:60] or "paper"
+    return f"{index + 1:03d}_{title}.pdf"
+
+def _init_worker():
+    """
+    워커 프로세스마다 폰트 메트릭을 한 번 미리 읽어 둡니다.
+    """
+    load_font_metrics(FONT_REGULAR_PATH)
+    if os.path.exists(FONT_BOLD_PATH):
+        load_font_metrics(FONT_BOLD_PATH)
+
+def _render_worker(task):
+    index, paper_data = task
+    try:
+        return index, render_research_paper_pdf(paper_data), None
+    except Exception as e:
+        return index, None, str(e)
+
+def export_pdfs(records, out_path, workers=None, progress=None):
+    """
+    논문 데이터 목록을 프로세스 풀에서 PDF로 렌더링하며 완료되는 대로 zip에 기록합니다.
+    진행 중인 작업 수를 제한해 메모리에 쌓이는 PDF가 워커 수의 몇 배를 넘지 않게 합니다.
+    (성공 수, 실패 목록 [(번호, 제목, 오류)], 소요 시간)을 반환합니다.
+    """
+    workers = workers or os.cpu_count() or 1
+    records = [_normalize_record(record) for record in records]
+    tasks = iter(enumerate(records))
+    failures = []
+    done_count = 0
+    start = time.time()
+    
+    with zipfile.ZipFile(out_path, "w", zipfile.ZIP_STORED) as archive, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        pending = set()
+        while True:
+            # PDF 스트림은 이미 압축되어 있으므로 zip에는 그대로 저장
+            for task in tasks:
+                pending.add(executor.submit(_render_worker, task))
+                if len(pending) >= workers * 4:
+                    break
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index, pdf_bytes, error = future.result()
+                if pdf_bytes is None:
+                    failures.append((index + 1, records[index]["title"], error))
+                else:
+                    archive.writestr(pdf_file_name(index, records[index]), pdf_bytes)
+                    done_count += 1
+                if progress:
+                    progress(done_count + len(failures), len(records), time.time() - start)
+    
+    return done_count, failures, time.time() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="논문 PDF 일괄 내보내기")
+    parser.add_argument("input", help="논문 데이터 JSONL 파일 또는 JSON 파일 디렉터리")
+    parser.add_argument("-o", "--out", default="papers.zip", help="출력 zip 파일")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args(argv)
+    
+    records = read_paper_records(args.input)
+    if not records:
+        print("내보낼 논문이 없습니다.")
+        return
+    
+    def report(done, total, elapsed):
+        print(f"\r{done}/{total}건 ({done / max(elapsed, 1e-9):.1f}건/초)", end="", file=sys.stderr)
+    
+    done_count, failures, elapsed = export_pdfs(records, args.out, args.workers, progress=report)
+    print(file=sys.stderr)
+    print(f"{done_count}건 저장 → {args.out} ({elapsed:.1f}초, {done_count / max(elapsed, 1e-9):.1f}건/초)")
+    for number, title, error in failures:
+        print(f"  실패 {number}: {title} ({error})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+import os
+import threading
+from collections import OrderedDict
+from fpdf import FPDF
+import config
+from utils.font_utils import register_font, subset_widths, glyph_widths, char_width
+
+FONT_REGULAR_PATH = 'assets/NanumGothic-Regular.ttf'
+FONT_BOLD_PATH = 'assets/NanumGothic-Bold.ttf'
+
+# 섹션 텍스트의 줄 배치 결과 ((폰트, 크기, 폭, 텍스트) -> [(줄, 단어 간격)]), 프로세스 공용 LRU
+# 논문 일부 섹션만 다시 생성되면 나머지 섹션은 줄 나눔을 다시 계산하지 않음
+_section_layout_cache = OrderedDict()
+_layout_cache_lock = threading.Lock()
+
+class ResearchPaperPDF(FPDF):
+    """
+    연구 논문 형식의 PDF를 생성하는 클래스
+    """
+    def __init__(self):
+        super().__init__()
+        self.set_auto_page_break(auto=True, margin=15)
+        self.add_page()
+        self.set_margins(20, 20, 20)
+        
+        # 나눔고딕 폰트 설정 (메트릭은 프로세스당 한 번만 파싱)
+        register_font(self, 'NanumGothic', '', FONT_REGULAR_PATH)
+        if os.path.exists(FONT_BOLD_PATH):
+            register_font(self, 'NanumGothic', 'B', FONT_BOLD_PATH)
+        
+        self.set_font('NanumGothic', '', 11)
+    
+    def set_font(self, family, style='', size=0):
+        # 등록되지 않은 스타일(이탤릭, 굵은 폰트 파일이 없는 경우)은 일반 폰트로 대체해
+        # 같은 폰트 파일이 문서에 두 번 포함되지 않게 함
+        if family.lower() in self.fonts and family.lower() + style.upper() not in self.fonts:
+            style = ''
+        super().set_font(family, style, size)
+    
+    def _putTTfontwidths(self, font, maxUni):
+        # 폰트 전체(수만 자)가 아니라 문서에서 사용한 글자의 폭만 기록
+        self._out(subset_widths(font['cw'], font['subset']))
+    
+    def header(self):
+        # 페이지 번호 (첫 페이지 제외)
+        if self.page_no() > 1:
+            self.set_font('NanumGothic', '', 9)
+            self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'R')
+            self.ln(10)
+    
+    def footer(self):
+        # 저작권 고지 추가
+        self.set_y(-15)
+        self.set_font('NanumGothic', 'I', 8)
+        self.cell(0, 10, '이 문서는 AI 생성 참조용 자료입니다. 실제 연구에 인용 시 원본 출처를 확인하세요.', 0, 0, 'C')
+    
+    def layout_text(self, text, w):
+        """
+        현재 폰트의 글자 폭 조회표로 text를 폭 w에 맞춰 줄 단위로 나눕니다.
+        줄바꿈 규칙은 multi_cell과 같지만 글자마다 한 번만 폭을 더하는 선형 순회입니다.
+        [(줄, 양쪽 정렬용 단어 간격 또는 None)] 목록을 반환합니다 (None은 정렬하지 않는 줄).
+        """
+        font = self.current_font
+        widths = glyph_widths(font)
+        s = text.replace("\r", '')
+        if s.endswith("\n"):
+            s = s[:-1]
+        wmax = (w - 2 * self.c_margin) * 1000.0 / self.font_size
+        
+        lines = []
+        for paragraph in s.split("\n"):
+            start = 0
+            sep = -1
+            l = ls = 0
+            ns = 0
+            for i, c in enumerate(paragraph):
+                cw = widths.get(c)
+                if cw is None:
+                    cw = widths[c] = char_width(font, c)
+                if c == ' ':
+                    sep = i
+                    ls = l
+                    ns += 1
+                l += cw
+                while l > wmax:
+                    if sep != -1:
+                        # 마지막 공백에서 줄바꿈하고 남은 글자 폭은 다음 줄로 넘김
+                        ws = (wmax - ls) / 1000.0 * self.font_size / (ns - 1) if ns > 1 else 0
+                        lines.append((paragraph[start:sep], ws))
+                        l -= ls + widths[' ']
+                        start = sep + 1
+                    else:
+                        # 공백이 없으면 글자 단위로 자름
+                        cut = i if i > start else i + 1
+                        lines.append((paragraph[start:cut], None))
+                        l = cw if cut == i else 0
+                        start = cut
+                    sep = -1
+                    ns = 0
+            lines.append((paragraph[start:], None))
+        return lines
+    
+    def section_lines(self, text):
+        """
+        현재 폰트/위치 기준의 줄 배치 결과를 캐시에서 찾고, 없으면 계산해 저장합니다.
+        """
+        w = self.w - self.r_margin - self.x
+        key = (self.font_family, self.font_style, self.font_size_pt, round(w, 3), text)
+        with _layout_cache_lock:
+            lines = _section_layout_cache.get(key)
+            if lines is not None:
+                _section_layout_cache.move_to_end(key)
+                return lines
+        
+        lines = self.layout_text(text, w)
+        with _layout_cache_lock:
+            _section_layout_cache[key] = lines
+            while len(_section_layout_cache) > config.PDF_LAYOUT_CACHE_ITEMS:
+                _section_layout_cache.popitem(last=False)
+        return lines
+    
+    def write_lines(self, lines, h):
+        """
+        배치된 줄을 양쪽 정렬로 출력합니다 (페이지 넘김은 자동 페이지 나눔이 처리).
+        """
+        w = self.w - self.r_margin - self.x
+        for line, ws in lines:
+            if ws is not None:
+                self.ws = ws
+                self._out('%.3f Tw' % (ws * self.k))
+            elif self.ws > 0:
+                self.ws = 0
+                self._out('0 Tw')
+            self.cell(w, h, line, 0, 2, 'J')
+        if self.ws > 0:
+            self.ws = 0
+            self._out('0 Tw')
+        self.x = self.l_margin
+    
+    def add_title(self, title):
+        self.set_font('NanumGothic', 'B', 16)
+        self.multi_cell(0, 10, title, 0, 'C')
+        self.ln(5)
+    
+    def add_authors(self, authors):
+        self.set_font('NanumGothic', 'I', 12)
+        self.multi_cell(0, 8, authors, 0, 'C')
+        self.ln(10)
+    
+    def add_abstract(self, abstract):
+        self.set_font('NanumGothic', 'B', 12)
+        self.cell(0, 8, '초록 (Abstract)', 0, 1, 'L')
+        self.ln(2)
+        
+        self.set_font('NanumGothic', '', 10)
+        
+        # 글자 폭 기준으로 한 번만 줄바꿈 (문단 구분 줄바꿈은 유지)
+        self.write_lines(self.section_lines(abstract), 5)
+        self.ln(10)
+    
+    def add_section(self, section_title, content):
+        self.set_font('NanumGothic', 'B', 12)
+        self.cell(0, 8, section_title, 0, 1, 'L')
+        self.ln(2)
+        
+        self.set_font('NanumGothic', '', 10)
+        
+        # 글자 폭 기준으로 한 번만 줄바꿈 (문단 구분 줄바꿈은 유지)
+        self.write_lines(self.section_lines(content), 5)
+        self.ln(5)
+    
+    def add_references(self, references):
+        self.set_font('NanumGothic', 'B', 12)
+        self.cell(0, 8, '참고문헌 (References)', 0, 1, 'L')
+        self.ln(2)
+        
+        self.set_font('NanumGothic', '', 10)
+        
+        # 각 참고문헌 항목 추가
+        for ref in references:
+            self.write_lines(self.section_lines(ref), 5)
+            self.ln(3)
+        
+        self.ln(5)
+
+def _build_pdf(paper_data):
+    """
+    논문 데이터로 PDF 객체를 만듭니다.
+    """
+    # 폰트 파일 경로 확인
+    font_dir = "assets"
+    if not os.path.exists(font_dir):
+        os.makedirs(font_dir)
+    
+    # 폰트 파일이 없으면 기본 폰트 사용 (굵은 폰트만 없으면 일반 폰트로 대체)
+    if not os.path.exists(FONT_REGULAR_PATH):
+        pdf = FPDF()
+        pdf.set_auto_page_break(auto=True, margin=15)
+        pdf.add_page()
+        pdf.set_margins(20, 20, 20)
+        font_available = False
+    else:
+        pdf = ResearchPaperPDF()
+        font_available = True
+    
+    # 제목 추가
+    if font_available:
+        pdf.add_title(paper_data['title'])
+    else:
+        pdf.set_font("Arial", "B", 16)
+        pdf.cell(0, 10, paper_data['title'], 0, 1, "C")
+        pdf.ln(5)
+    
+    # 저자 추가
+    if font_available:
+        pdf.add_authors(paper_data['authors'])
+    else:
+        pdf.set_font("Arial", "I", 12)
+        pdf.cell(0, 8, paper_data['authors'], 0, 1, "C")
+        pdf.ln(10)
+    
+    # 초록 추가
+    if font_available:
+        pdf.add_abstract(paper_data['abstract'])
+    else:
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(0, 8, "초록 (Abstract)", 0, 1, "L")
+        pdf.ln(2)
+        pdf.set_font("Arial", "", 10)
+        pdf.multi_cell(0, 5, paper_data['abstract'])
+        pdf.ln(10)
+    
+    # 본문 섹션 추가
+    sections = [
+        ('1. 서론 (Introduction)', paper_data.get('introduction')),
+        ('2. 연구 방법 (Methods)', paper_data.get('methods')),
+        ('3. 예상 결과 (Expected Results)', paper_data.get('results')),
+        ('4. 결론 (Conclusion)', paper_data.get('conclusion')),
+    ]
+    for section_title, content in sections:
+        if not content:
+            continue
+        if font_available:
+            pdf.add_section(section_title, content)
+        else:
+            pdf.set_font("Arial", "B", 12)
+            pdf.cell(0, 8, section_title, 0, 1, "L")
+            pdf.ln(2)
+            pdf.set_font("Arial", "", 10)
+            pdf.multi_cell(0, 5, content)
+            pdf.ln(5)
+    
+    # 참고문헌 추가
+    references = paper_data.get('references') or []
+    if references:
+        if font_available:
+            pdf.add_references(references)
+        else:
+            pdf.set_font("Arial", "B", 12)
+            pdf.cell(0, 8, "참고문헌 (References)", 0, 1, "L")
+            pdf.ln(2)
+            pdf.set_font("Arial", "", 10)
+            for ref in references:
+                pdf.multi_cell(0, 5, ref)
+                pdf.ln(3)
+    
+    return pdf
+
+def render_research_paper_pdf(paper_data):
+    """
+    논문 데이터를 PDF bytes로 렌더링합니다 (캐시 없음, 파일을 만들지 않음).
+    """
+    return _build_pdf(paper_data).output(dest='S').encode('latin-1')
+
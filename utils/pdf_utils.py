@@ -1,92 +1,147 @@
 import os
-from fpdf import FPDF
-import tempfile
-import textwrap
-import streamlit as st
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+import config
+from utils.ui_utils import show_error
 
-class ResearchPaperPDF(FPDF):
+# 레이아웃/렌더링 코드(utils.pdf_render_utils)가 바뀌면 올려서 기존 캐시를 무효화
+PDF_LAYOUT_VERSION = 4
+
+# 최근 생성한 PDF (키 -> bytes), 프로세스 공용 LRU
+_pdf_memory_cache = OrderedDict()
+_pdf_cache_lock = threading.Lock()
+
+def render_research_paper_pdf(paper_data):
     """
-    연구 논문 형식의 PDF를 생성하는 클래스
+    논문 데이터를 PDF bytes로 렌더링합니다 (캐시 없음, 파일을 만들지 않음).
+    fpdf와 폰트 처리 모듈은 실제로 렌더링할 때 처음 불러옵니다 (캐시 적중 시에는 불러오지 않음).
     """
-    def __init__(self):
-        super().__init__()
-        self.set_auto_page_break(auto=True, margin=15)
-        self.add_page()
-        self.set_margins(20, 20, 20)
-        
-        # 나눔고딕 폰트 설정
-        self.add_font('NanumGothic', '', 'assets/NanumGothic-Regular.ttf', uni=True)
-        self.add_font('NanumGothic', 'B', 'assets/NanumGothic-Bold.ttf', uni=True)
-        # 이탤릭 대신 일반 폰트 사용 (나눔고딕 이탤릭이 없는 경우)
-        self.add_font('NanumGothic', 'I', 'assets/NanumGothic-Regular.ttf', uni=True)
-        
-        self.set_font('NanumGothic', '', 11)
-    
-    def header(self):
-        # 페이지 번호 (첫 페이지 제외)
-        if self.page_no() > 1:
-            self.set_font('NanumGothic', '', 9)
-            self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'R')
-            self.ln(10)
+    from utils.pdf_render_utils import render_research_paper_pdf as render
+    return render(paper_data)
+
+def pdf_cache_key(paper_data, options=None):
+    """
+    논문 데이터와 렌더링 옵션의 내용 해시 (같은 내용이면 같은 PDF).
+    """
+    payload = json.dumps({"layout": PDF_LAYOUT_VERSION, "data": paper_data, "options": options or {}},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _disk_cache_path(key):
+    return os.path.join(config.PDF_CACHE_DIR, f"{key}.pdf")
+
+def _remember_in_memory(key, pdf_bytes):
+    with _pdf_cache_lock:
+        _pdf_memory_cache[key] = pdf_bytes
+        _pdf_memory_cache.move_to_end(key)
+        while len(_pdf_memory_cache) > config.PDF_CACHE_MEMORY_ITEMS:
+            _pdf_memory_cache.popitem(last=False)
+
+def _write_disk_cache(key, pdf_bytes):
+    """
+    디스크 캐시에 저장하고, 전체 크기가 상한을 넘으면 가장 오래 사용하지 않은 파일부터 지웁니다.
+    """
+    os.makedirs(config.PDF_CACHE_DIR, exist_ok=True)
+    path = _disk_cache_path(key)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pdf_bytes)
+    os.replace(tmp_path, path)
+    _evict_cache_files(config.PDF_CACHE_DIR, config.PDF_CACHE_DISK_MB * 1024 * 1024, path)
+
+def _evict_cache_files(directory, limit, keep_path):
+    """
+    디렉터리의 전체 파일 크기가 limit(바이트)을 넘으면 가장 오래 사용하지 않은 파일부터 지웁니다 (keep_path 제외).
+    """
+    entries = []
+    for name in os.listdir(directory):
+        entry_path = os.path.join(directory, name)
+        try:
+            stat = os.stat(entry_path)
+        except OSError:
+            continue
+        if name.endswith(".tmp"):
+            # 중단된 쓰기로 남은 임시 파일 정리
+            if stat.st_mtime < os.path.getmtime(keep_path) - 3600:
+                os.remove(entry_path)
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry_path))
     
-    def footer(self):
-        # 저작권 고지 추가
-        self.set_y(-15)
-        self.set_font('NanumGothic', 'I', 8)
-        self.cell(0, 10, '이 문서는 AI 생성 참조용 자료입니다. 실제 연구에 인용 시 원본 출처를 확인하세요.', 0, 0, 'C')
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry_path in sorted(entries):
+        if total <= limit:
+            break
+        if entry_path != keep_path:
+            try:
+                os.remove(entry_path)
+                total -= size
+            except OSError:
+                pass
+
+def get_research_paper_pdf(paper_data, options=None):
+    """
+    논문 PDF bytes를 반환합니다. 같은 내용/옵션이면 메모리 LRU → 디스크 캐시 순으로 재사용하고,
+    없을 때만 새로 렌더링합니다. 실패하면 None을 반환합니다.
+    """
+    key = pdf_cache_key(paper_data, options)
     
-    def add_title(self, title):
-        self.set_font('NanumGothic', 'B', 16)
-        self.multi_cell(0, 10, title, 0, 'C')
-        self.ln(5)
+    with _pdf_cache_lock:
+        pdf_bytes = _pdf_memory_cache.get(key)
+        if pdf_bytes is not None:
+            _pdf_memory_cache.move_to_end(key)
+            return pdf_bytes
     
-    def add_authors(self, authors):
-        self.set_font('NanumGothic', 'I', 12)
-        self.multi_cell(0, 8, authors, 0, 'C')
-        self.ln(10)
+    path = _disk_cache_path(key)
+    try:
+        with open(path, "rb") as f:
+            pdf_bytes = f.read()
+        os.utime(path)  # LRU 순서 갱신
+        _remember_in_memory(key, pdf_bytes)
+        return pdf_bytes
+    except OSError:
+        pass
     
-    def add_abstract(self, abstract):
-        self.set_font('NanumGothic', 'B', 12)
-        self.cell(0, 8, '초록 (Abstract)', 0, 1, 'L')
-        self.ln(2)
-        
-        self.set_font('NanumGothic', '', 10)
-        
-        # 여러 줄 텍스트 처리
-        abstract_wrapped = textwrap.fill(abstract, width=100)
-        self.multi_cell(0, 5, abstract_wrapped)
-        self.ln(10)
+    try:
+        pdf_bytes = render_research_paper_pdf(paper_data)
+    except Exception as e:
+        show_error(f"PDF 생성 중 오류가 발생했습니다: {str(e)}")
+        return None
     
-    def add_section(self, section_title, content):
-        self.set_font('NanumGothic', 'B', 12)
-        self.cell(0, 8, section_title, 0, 1, 'L')
-        self.ln(2)
-        
-        self.set_font('NanumGothic', '', 10)
-        
-        # 여러 줄 텍스트 처리
-        content_wrapped = textwrap.fill(content, width=100)
-        self.multi_cell(0, 5, content_wrapped)
-        self.ln(5)
+    _remember_in_memory(key, pdf_bytes)
+    try:
+        _write_disk_cache(key, pdf_bytes)
+    except OSError as e:
+        print(f"PDF 캐시 저장 오류: {str(e)}")
+    return pdf_bytes
+
+def get_pdf_static_url(paper_data, pdf_bytes):
+    """
+    PDF를 Streamlit 정적 파일 디렉터리에 두고 미리보기 URL을 반환합니다 (base64 인라인 대신).
+    디스크 캐시 파일이 있으면 복사하지 않고 하드 링크합니다.
+    """
+    key = pdf_cache_key(paper_data)
+    os.makedirs(config.PDF_STATIC_DIR, exist_ok=True)
+    path = os.path.join(config.PDF_STATIC_DIR, f"{key}.pdf")
+    if not os.path.exists(path):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.link(_disk_cache_path(key), tmp_path)
+        except OSError:
+            with open(tmp_path, "wb") as f:
+                f.write(pdf_bytes)
+        os.replace(tmp_path, path)
+        _evict_cache_files(config.PDF_STATIC_DIR, config.PDF_CACHE_DISK_MB * 1024 * 1024, path)
     
-    def add_references(self, references):
-        self.set_font('NanumGothic', 'B', 12)
-        self.cell(0, 8, '참고문헌 (References)', 0, 1, 'L')
-        self.ln(2)
-        
-        self.set_font('NanumGothic', '', 10)
-        
-        # 각 참고문헌 항목 추가
-        for ref in references:
-            ref_wrapped = textwrap.fill(ref, width=100)
-            self.multi_cell(0, 5, ref_wrapped)
-            self.ln(3)
-        
-        self.ln(5)
+    # static/ 아래 파일은 app/static/ 경로로 제공됨
+    relative = os.path.relpath(path, "static").replace(os.sep, "/")
+    return f"app/static/{relative}"
 
 def create_research_paper_pdf(paper_data):
     """
-    연구 논문 데이터를 PDF로 변환합니다.
+    연구 논문 데이터를 PDF로 변환하고 파일 경로를 반환합니다 (실패 시 None).
+    임시 파일을 새로 만들지 않고 캐시된 PDF 파일 경로를 반환합니다.
     
     paper_data 형식:
     {
@@ -100,48 +155,11 @@ def create_research_paper_pdf(paper_data):
         'references': ['참고문헌1', '참고문헌2', ...]
     }
     """
-    try:
-        # 폰트 파일 경로 확인
-        font_dir = "assets"
-        if not os.path.exists(font_dir):
-            os.makedirs(font_dir)
-        
-        font_normal = os.path.join(font_dir, "NanumGothic-Regular.ttf")
-        font_bold = os.path.join(font_dir, "NanumGothic-Bold.ttf")
-        
-        # 폰트 파일이 없으면 기본 폰트 사용
-        if not (os.path.exists(font_normal) and os.path.exists(font_bold)):
-            pdf = FPDF()
-            pdf.set_auto_page_break(auto=True, margin=15)
-            pdf.add_page()
-            pdf.set_margins(20, 20, 20)
-            font_available = False
-        else:
-            pdf = ResearchPaperPDF()
-            font_available = True
-        
-        # 제목 추가
-        if font_available:
-            pdf.add_title(paper_data['title'])
-        else:
-            pdf.set_font("Arial", "B", 16)
-            pdf.cell(0, 10, paper_data['title'], 0, 1, "C")
-            pdf.ln(5)
-        
-        # 저자 추가
-        if font_available:
-            pdf.add_authors(paper_data['authors'])
-        else:
-            pdf.set_font("Arial", "I", 12)
-            pdf.cell(0, 8, paper_data['authors'], 0, 1, "C")
-            pdf.ln(10)
-        
-        # 초록 추가
-        if font_available:
-            pdf.add_abstract(paper_data['abstract'])
-        else:
-            pdf.set_font("Arial", "B", 12)
-            pdf.cell(0, 8, "초록 (Abstract)", 0, 1, "L")
-            pdf.ln(2)
-            pdf.set_font("Arial", "", 10)
-            pdf.multi_cell(0, 5, paper_data['abstract'])
+    pdf_bytes = get_research_paper_pdf(paper_data)
+    if pdf_bytes is None:
+        return None
+    
+    path = _disk_cache_path(pdf_cache_key(paper_data))
+    if not os.path.exists(path):
+        _write_disk_cache(pdf_cache_key(paper_data), pdf_bytes)
+    return path
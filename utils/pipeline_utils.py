@@ -0,0 +1,132 @@
+"""
+Streamlit 없이 주제 → 주제 분석 → 유사 주제 → 논문 초안 → 틈새 주제 단계를 실행합니다 (배치 작업/벤치마크용).
+
+사용 예:
+    python -m utils.pipeline_utils "미세플라스틱이 토양 미생물에 미치는 영향" -o result.json
+    python -m utils.pipeline_utils "주제" --steps topic_analysis,similar_topics
+    python -m utils.pipeline_utils "주제" --select "선택할 세부 주제" --pdf paper.pdf
+
+결과는 웹 화면의 세션 상태(및 결과 저장소)와 같은 키를 쓰는 dict입니다.
+"""
+import argparse
+import json
+import sys
+import time
+from utils.gpt_utils import analyze_topic, generate_similar_topics, generate_paper_structure, generate_niche_topics
+from utils.prompt_utils import prompt_cache_stats
+
+# 실행 순서대로의 단계 (utils.result_store_utils.RESULT_KINDS와 같은 키)
+PIPELINE_STEPS = ("topic_analysis", "similar_topics", "generated_paper", "niche_topics")
+
+def pick_selected_topic(topic, similar_topics):
+    """
+    선택 주제가 따로 없으면 유사 주제 중 관련성이 가장 높은 주제를, 그것도 없으면 원래 주제를 사용합니다.
+    """
+    for candidate in (similar_topics or {}).get("combined_results") or []:
+        if candidate.get("title"):
+            return candidate["title"]
+    return topic
+
+def is_complete_result(step, result):
+    """
+    단계 결과가 완성되었는지 확인합니다.
+    유사 주제 결과는 GPT 호출이 실패해도 dict로 반환되므로 GPT 생성 결과(ai_generated)가 있어야 완성으로 봅니다.
+    """
+    if not result:
+        return False
+    if step == "similar_topics":
+        return bool(result.get("ai_generated"))
+    return True
+
+def run_step(step, topic, selected_topic=None, deadline=None):
+    """
+    단계 하나를 실행해 결과를 반환합니다 (실패하면 None).
+    topic_analysis/similar_topics는 원래 주제, generated_paper/niche_topics는 선택 주제를 사용합니다.
+    deadline이 없으면 각 단계가 config.STEP_SLO 기준으로 새로 만듭니다.
+    """
+    if step == "topic_analysis":
+        return analyze_topic(topic, deadline=deadline)
+    if step == "similar_topics":
+        return generate_similar_topics(topic, deadline=deadline)
+    
+    selected_topic = selected_topic or topic
+    if step == "generated_paper":
+        paper_result = generate_paper_structure(selected_topic, deadline=deadline)
+        if not paper_result or "content" not in paper_result:
+            return None
+        return {
+            "topic": selected_topic,
+            "content": paper_result["content"],
+            "papers": paper_result.get("papers", [])
+        }
+    if step == "niche_topics":
+        return generate_niche_topics(selected_topic, deadline=deadline)
+    raise ValueError(f"알 수 없는 단계: {step}")
+
+def run_pipeline(topic, selected_topic=None, steps=PIPELINE_STEPS, on_step=None):
+    """
+    주어진 단계들을 순서대로 실행하고 {topic, selected_topic, 단계별 결과, timings}를 반환합니다.
+    selected_topic이 없으면 유사 주제 결과에서 고릅니다. on_step(step, result, elapsed)는 단계마다 호출됩니다.
+    """
+    results = {"topic": topic, "selected_topic": selected_topic, "timings": {}}
+    for step in PIPELINE_STEPS:
+        if step not in steps:
+            continue
+        if step in ("generated_paper", "niche_topics") and not results["selected_topic"]:
+            results["selected_topic"] = pick_selected_topic(topic, results.get("similar_topics"))
+        
+        start = time.time()
+        result = run_step(step, topic, results["selected_topic"])
+        elapsed = time.time() - start
+        results[step] = result
+        results["timings"][step] = round(elapsed, 3)
+        if on_step:
+            on_step(step, result, elapsed)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="연구 주제 파이프라인 (Streamlit 없이 실행)")
+    parser.add_argument("topic", help="연구 주제")
+    parser.add_argument("--select", default=None, help="논문/틈새 주제 단계에 쓸 선택 주제 (기본: 유사 주제 중 첫 번째)")
+    parser.add_argument("--steps", default=",".join(PIPELINE_STEPS),
+                        help=f"실행할 단계 (쉼표 구분, 기본: {','.join(PIPELINE_STEPS)})")
+    parser.add_argument("-o", "--out", default=None, help="결과 JSON 파일 (기본: 표준 출력)")
+    parser.add_argument("--pdf", default=None, help="생성된 논문을 저장할 PDF 파일")
+    args = parser.parse_args(argv)
+    
+    steps = [step.strip() for step in args.steps.split(",") if step.strip()]
+    unknown = [step for step in steps if step not in PIPELINE_STEPS]
+    if unknown:
+        parser.error(f"알 수 없는 단계: {', '.join(unknown)}")
+    
+    def report(step, result, elapsed):
+        status = "완료" if is_complete_result(step, result) else "실패"
+        print(f"{step}: {status} ({elapsed:.1f}초)", file=sys.stderr)
+    
+    results = run_pipeline(args.topic, selected_topic=args.select, steps=steps, on_step=report)
+    usage = prompt_cache_stats()["total"]
+    print(f"GPT 입력 토큰 {usage['prompt_tokens']:,}개 중 {usage['cached_tokens']:,}개 캐시 ({usage['cache_ratio']:.0%})",
+          file=sys.stderr)
+    
+    output = json.dumps(results, ensure_ascii=False, indent=2, default=str)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+    
+    if args.pdf and results.get("generated_paper"):
+        # PDF 렌더링(fpdf)은 필요할 때만 불러옴
+        from utils.paper_parse_utils import parse_paper_markdown
+        from utils.pdf_utils import render_research_paper_pdf
+        generated_paper = results["generated_paper"]
+        paper_data = parse_paper_markdown(generated_paper["content"], topic=generated_paper["topic"],
+                                          papers=generated_paper["papers"])
+        with open(args.pdf, "wb") as f:
+            f.write(render_research_paper_pdf(paper_data))
+    
+    failed = [step for step in steps if not is_complete_result(step, results.get(step))]
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
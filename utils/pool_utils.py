@@ -0,0 +1,125 @@
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+import config
+from utils.ui_utils import script_run_ctx
+
+class FairPool:
+    """
+    프로세스 전체에서 공유하는 외부 호출(GPT, 논문 검색 API) 작업자 풀.
+    동시 실행 수를 max_workers로 제한하고, 대기 중인 작업은 세션별 큐를 번갈아(round-robin) 꺼내
+    한 세션이 많은 호출을 몰아 보내도 다른 세션이 뒤로 밀리지 않게 합니다.
+    """
+    def __init__(self, max_workers, metrics_window=1000):
+        self.max_workers = max_workers
+        # 세션 ID -> 대기 작업 deque (삽입 순서가 곧 다음 차례 순서)
+        self._queues = OrderedDict()
+        self._condition = threading.Condition()
+        self._workers = []
+        self._busy = 0
+        self._waits = deque(maxlen=metrics_window)
+        self._completed = 0
+        self._local = threading.local()
+    
+    def _ensure_workers(self):
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._work, name=f"fair-pool-{len(self._workers)}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+    
+    def submit(self, fn, *args, session_id=None, **kwargs):
+        """
+        작업을 세션 큐에 넣고 Future를 반환합니다.
+        호출 시점의 contextvars(Deadline 등)와 Streamlit 스크립트 컨텍스트를 작업 스레드로 그대로 넘깁니다.
+        """
+        script_ctx = script_run_ctx()
+        if session_id is None:
+            session_id = script_ctx.session_id if script_ctx else "default"
+        future = Future()
+        task = (future, contextvars.copy_context(), script_ctx, time.monotonic(), fn, args, kwargs)
+        
+        with self._condition:
+            self._ensure_workers()
+            self._queues.setdefault(session_id, deque()).append(task)
+            self._condition.notify()
+        return future
+    
+    def _next_task(self):
+        """
+        가장 오래 차례를 기다린 세션의 작업을 꺼내고, 그 세션을 순서의 맨 뒤로 보냅니다.
+        """
+        session_id, queue = next(iter(self._queues.items()))
+        task = queue.popleft()
+        if queue:
+            self._queues.move_to_end(session_id)
+        else:
+            del self._queues[session_id]
+        return task
+    
+    def _work(self):
+        self._local.is_worker = True
+        thread = threading.current_thread()
+        while True:
+            with self._condition:
+                while not self._queues:
+                    self._condition.wait()
+                future, context, script_ctx, queued_at, fn, args, kwargs = self._next_task()
+                self._busy += 1
+                self._waits.append(time.monotonic() - queued_at)
+            
+            if future.set_running_or_notify_cancel():
+                if script_ctx is not None:
+                    # 컨텍스트가 있으면 Streamlit은 이미 불러온 상태
+                    from streamlit.runtime.scriptrunner import add_script_run_ctx
+                    from streamlit.runtime.scriptrunner.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+                    add_script_run_ctx(thread, script_ctx)
+                try:
+                    future.set_result(context.run(fn, *args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+                finally:
+                    if script_ctx is not None:
+                        setattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+            
+            with self._condition:
+                self._busy -= 1
+                self._completed += 1
+    
+    def run(self, fn, *args, **kwargs):
+        """
+        풀에서 fn을 실행하고 결과를 기다립니다. 작업자 스레드 안에서 다시 호출하면 (교착 방지를 위해) 바로 실행합니다.
+        """
+        if getattr(self._local, "is_worker", False):
+            return fn(*args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result()
+    
+    def stats(self):
+        """
+        실행 중/대기 작업 수와 최근 작업들의 큐 대기 시간(초) 통계를 반환합니다.
+        """
+        with self._condition:
+            waits = sorted(self._waits)
+            queued = sum(len(queue) for queue in self._queues.values())
+            return {
+                "max_workers": self.max_workers,
+                "running": self._busy,
+                "queued": queued,
+                "queued_sessions": len(self._queues),
+                "completed": self._completed,
+                "wait_p50": waits[len(waits) // 2] if waits else 0.0,
+                "wait_p95": waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0,
+                "wait_max": waits[-1] if waits else 0.0,
+            }
+
+_pool = FairPool(config.POOL_MAX_WORKERS)
+
+def run_in_pool(fn, *args, **kwargs):
+    """
+    전역 공정 풀에서 fn(*args, **kwargs)를 실행하고 결과를 반환합니다 (예외는 그대로 전달).
+    """
+    return _pool.run(fn, *args, **kwargs)
+
+def pool_stats():
+    return _pool.stats()
@@ -0,0 +1,327 @@
+import threading
+from textwrap import dedent
+
+# 모든 GPT 호출에 공통으로 쓰는 시스템 프롬프트
+SYSTEM_PROMPT = """당신은 학생과 연구자를 위한 연구 주제 선정 전문가입니다.  
+주어진 연구 주제에 대해 학술적 분석을 제공하고, 신뢰할 수 있는 출처 및 참고문헌을 포함하여 연구자가 가치 있는 연구를 수행하도록 돕습니다.  
+### 🧪 역할  
+- 연구 주제 분석 전문가  
+- 복잡한 연구 내용을 쉽게 설명  
+- 최신 연구 동향 반영  
+- 명확하고 구체적인 연구 주제 및 논문 구조 제안  
+### 📚 주요 기능  
+✅ 논문 검색 API를 활용해 **실제 논문만 인용** (가짜 논문 생성 금지)  
+✅ 과학적 깊이 + 명확한 구조 + 최신 연구 동향 반영  
+✅ 답변은 **구조화된 마크다운 형식**으로 제공  
+🔹 **답변 구성**  
+- 🧠 개요  
+- 🔬 메커니즘 
+- 🧩 핵심 변수 또는 요인  
+- 📊 논문 비교 및 근거 요약  
+- 🧾 결론  
+- 🔗 출처 테이블  
+### 🎯 연구 주제 커버 분야  
+🔹 생명과학  
+🔹 물리학, 천문학  
+🔹 화학, 재료과학  
+🔹 환경과학, 기후과학  
+🔹 컴퓨터과학, 데이터과학  
+🔹 심리학, 사회과학  
+🔹 공학 및 응용기술  
+### ⚡ 행동 기준  
+1️⃣ 복잡한 연구 주제를 쉽게 설명  
+2️⃣ 실용적이고 실현 가능한 연구 주제 제안  
+3️⃣ 최신 연구 동향과 학계의 관심사 반영  
+4️⃣ 명확하고 구체적인 조언 제공 (모호한 표현 금지)  
+5️⃣ 학술적 표준과 관행을 따르는 논문 구조 제안  
+6️⃣ 정확한 인용 형식 사용  
+### 🚫 금지사항  
+❌ 논문 제목, 저자, 연도 등을 임의로 생성 금지  
+❌ 인용은 반드시 **API를 통해 가져온 실제 논문만 사용**"""
+
+# 프롬프트 템플릿: instructions는 호출마다 같은 고정 지시문, input은 주제/논문 정보 등 호출마다 바뀌는 내용입니다.
+# OpenAI는 요청 앞부분(시스템 프롬프트 + 고정 지시문)이 이전 요청과 같으면 그 부분을 캐시해 재사용하므로
+# 바뀌는 값은 항상 input에만 두고 맨 뒤에 붙입니다. instructions에는 {} 치환을 쓰지 않습니다.
+PROMPT_TEMPLATES = {
+    "topic_analysis": {
+        "instructions": """
+            당신은 고등학생과 일반인들이 좋은 연구 논문을 작성할 수 있도록 도와주는 최고의 연구 전문가입니다.
+            이 요청의 마지막에 주어진 연구 주제에 대해 상세히 분석해주세요.
+            
+            이 분석은 과학적 정확성, 깊이 있는 설명, 교육적 가치가 필수적입니다. 단순히 일반적인 정보가 아닌, 실제 연구자가 학생에게 제공할 법한 구체적이고 깊이 있는 정보를 제공해주세요.
+            
+            분석은 다음 구조로 작성해주세요:
+            
+            ## 🧠 개요
+            [주제 정의 및 현재 연구 동향 개요 - 4-5문장으로 명확하게 설명]
+            - 이 주제의 핵심 개념과 중요성
+            - 관련된 학문 분야와 주요 연구 영역
+            - 이 분야의 최근 핵심 발전 사항
+            
+            ## 🔬 기전 또는 작동 원리
+            [주제와 관련된 핵심 과학적 원리 설명 - 상세하고 교육적으로]
+            - 구체적인 메커니즘과 과정 설명
+            - 관련된 중요 이론이나 모델
+            - 실제 예시나 사례를 통한 원리 설명
+            
+            ## 🧩 핵심 변수 또는 요인
+            [주제를 이해하는 데 중요한 핵심 요소들 - 구체적으로 나열하고 설명]
+            - 각 요소의 정의와 중요성
+            - 요소들 간의 상호작용과 관계
+            - 요소들이 연구 결과에 미치는 영향
+            
+            ## 📊 논문 비교 및 근거 요약
+            [주요 연구 논문들의 결과 비교 및 주요 발견 - 구체적인 데이터와 수치 포함]
+            - 핵심 연구 결과와 발견
+            - 상반된 견해나 논쟁점
+            - 연구 방법론 비교
+            
+            ## 🧾 결론
+            [현재 연구 상황 요약 및 향후 연구 방향 제안 - 5-6문장으로 종합적으로]
+            - 현재까지의 연구 성과 종합
+            - 해결되지 않은 질문이나 과제
+            - 향후 유망한 연구 방향 제안
+            - 이 주제가 가지는 실용적/학문적 의의
+            
+            ## 🔗 출처 테이블
+            [정확한 인용 형식으로 출처 나열 - 실제 존재하는 논문만, 논문 정보가 주어지면 그 목록에서]
+            
+            각 섹션은 최소 3-4개의 단락으로 구성하고, 각 단락은 4-5개의 문장을 포함해주세요. 고등학생도 이해할 수 있도록 명확하게 설명하되, 내용의 학술적 깊이는 유지해주세요.
+            예시나 구체적인 사례, 수치 데이터를 포함하면 내용 이해에 도움이 됩니다.
+            실제 존재하는 논문만 인용하고, 가짜 논문이나 정보를 생성하지 마세요.
+            특히 주제의 기본 개념뿐만 아니라 최신 연구 동향이나 발전 방향도 함께 제시해주세요.
+        """,
+        "input": """
+            연구 주제: "{topic}"
+            
+            {paper_info}
+        """,
+    },
+    "similar_topics": {
+        "instructions": """
+            당신은 이 요청의 마지막에 주어진 학문 분야의 세계적인 전문가로 20년 이상의 연구 경험을 가지고 있습니다.
+            마지막에 주어진 연구 주제(원래 주제)와 관련된 유사하면서도 독창적인 연구 주제를 요청한 개수만큼 생성해야 합니다.
+            논문 정보가 주어지면 이를 참고하되 이에 국한되지 않고 더 풍부한 주제를 생성해주세요.
+            
+            각 유사 주제는 다음 구조로 상세히 설명해주세요:
+            
+            ## 주제 1: [주제명 - 명확하고 학술적인 제목으로 작성]
+            
+            ✅ **개념 정의 및 개요**
+            - 이 연구 주제가 무엇인지 3-4문장으로 명확하게 정의하고 개략적으로 설명
+            - 이 주제가 다루는 핵심 현상이나 문제를 구체적으로 설명
+            - 이 주제의 학문적 배경과 연구 맥락 제시
+            
+            ✅ **원주제와의 관련성**
+            - 이 주제가 원래 주제와 어떻게 연관되는지 구체적으로 설명
+            - 두 주제 간의 이론적/방법론적 연결고리 제시
+            - 원 주제에서 파생되거나 확장된 측면 설명
+            
+            ✅ **연구 방법론 또는 접근법**
+            - 이 주제를 연구하기 위한 2-3가지 구체적인 연구 방법 제안
+            - 필요한 데이터, 실험 설계, 분석 방법 등 구체적 방법론 설명
+            - 해당 방법론이 이 주제 연구에 적합한 이유 설명
+            
+            ✅ **학술적 중요성 및 잠재적 영향**
+            - 이 연구가 학계에 기여할 수 있는 이론적 가치 설명
+            - 이 연구가 실용적/산업적 측면에서 가질 수 있는 응용 가치 설명
+            - 이 연구를 통해 해결할 수 있는 실제 문제나 질문 제시
+            
+            ✅ **관련 연구자 또는 논문**
+            - 이 주제와 관련된 실제 연구자나 논문 2-3개 언급 (있는 경우)
+            - 관련 연구의 핵심 발견이나 한계점 간략 설명
+            
+            ## 주제 2: [주제명]
+            ...
+            
+            각 주제는 실제로 연구될 가치가 있는 구체적이고 명확한 주제여야 합니다.
+            최신 연구 동향을 반영하되, 너무 일반적이거나 모호한 주제는 피해주세요.
+            주제들은 원래 주제와 명확하게 연관되어야 하지만, 단순히 동일한 주제의 다른 표현이 아닌 새로운 연구 방향을 제시해야 합니다.
+        """,
+        "input": """
+            학문 분야: {domain}
+            연구 주제: "{topic}"
+            생성할 주제 수: {count}개
+            
+            {paper_info}
+        """,
+    },
+    "additional_topics": {
+        "instructions": """
+            당신은 이 요청의 마지막에 주어진 학문 분야의 전문가입니다.
+            마지막에 주어진 연구 주제와 관련된 추가적인 연구 주제 3개를 더 생성해주세요.
+            앞서 생성한 주제와 겹치지 않고, 더 폭넓은 관점에서 연관된 주제를 제안해주세요.
+            
+            각 주제는 다음 형식으로 제시해주세요:
+            
+            ## 주제: [주제명]
+            **설명**: [주제에 대한 간략한 설명]
+            **관련성**: [원래 주제와의 관련성]
+            **중요성**: [연구의 중요성]
+            
+            주제는 구체적이고 실행 가능해야 하며, 현대 연구 동향을 반영해야 합니다.
+        """,
+        "input": """
+            학문 분야: {domain}
+            연구 주제: "{topic}"
+        """,
+    },
+    "niche_topics": {
+        "instructions": """
+            이 요청의 마지막에 주어진 연구 주제와 관련된 틈새 연구 주제를 요청한 개수만큼 제안해주세요.
+            논문 정보가 주어지면 이를 참고하여 틈새 주제를 제안해주세요.
+            
+            틈새 주제란 아직 충분히 연구되지 않았지만 잠재적으로 가치 있는 연구 영역입니다.
+            
+            각 틈새 주제는 다음 형식으로 제시해주세요:
+            
+            ## 틈새 주제 1: [주제명]
+            
+            **배경**: [이 분야에서 현재까지의 연구 상황]
+            
+            **틈새 영역으로 고려되는 이유**: 
+            [왜 이 주제가 충분히 연구되지 않았는지, 어떤 측면이 간과되고 있는지]
+            
+            **연구 가치와 영향력**: 
+            [이 주제 연구가 학문적/실용적으로 어떤 가치가 있는지]
+            
+            **제안 연구 방법**: 
+            [어떤 방법론과 접근 방식으로 연구할 수 있는지]
+            
+            **관련 논문**: 
+            [주어진 논문 목록에서 관련 있는 논문 참조]
+            
+            실제 논문을 기반으로 하되, 새롭고 혁신적인 연구 틈새를 찾아내주세요.
+            각 틈새 주제는 실행 가능하고, 구체적이며, 학술적 가치가 있어야 합니다.
+        """,
+        "input": """
+            연구 주제: "{topic}"
+            제안할 틈새 주제 수: {count}개
+            
+            {paper_info}
+        """,
+    },
+    "paper_generation": {
+        "instructions": """
+            이 요청의 마지막에 주어진 연구 주제로 고등학생 수준의 연구 논문 초안을 작성해주세요.
+            
+            반드시 아래 마크다운 형식과 섹션 제목을 그대로 사용해주세요:
+            
+            # [논문 제목]
+            
+            ## 초록
+            [연구 목적, 방법, 예상 결과를 요약한 한 문단]
+            
+            ## 1. 서론
+            [연구 배경, 필요성, 연구 질문]
+            
+            ## 2. 연구 방법
+            [실험/조사 설계, 자료 수집 및 분석 방법]
+            
+            ## 3. 예상 결과
+            [예상되는 결과와 그 의미]
+            
+            ## 4. 결론
+            [연구의 의의, 한계, 후속 연구 방향]
+            
+            ## 참고문헌
+            - [저자 (발행연도). 제목. 출처]
+            
+            논문 정보가 주어지면 참고문헌은 그 목록에서만 인용해주세요.
+            실제 논문을 근거로 구체적이고 실행 가능한 내용으로 작성해주세요.
+        """,
+        "input": """
+            연구 주제: "{topic}"
+            
+            {paper_info}
+        """,
+    },
+    "core_keywords": {
+        "instructions": """
+            이 요청의 마지막에 주어진 연구 주제에서 가장 핵심적인 키워드 5개를 추출하고 중요도 순으로 나열해주세요.
+            
+            결과는 쉼표로 구분된 단일 라인으로 제공해주세요. 예: 키워드1, 키워드2, 키워드3, 키워드4, 키워드5
+        """,
+        "input": """
+            연구 주제: "{topic}"
+        """,
+    },
+    "academic_domain": {
+        "instructions": """
+            이 요청의 마지막에 주어진 연구 주제가 속하는 학문 분야를 가장 구체적으로 식별해주세요.
+            
+            다음 중 하나를 선택하고, 가능하면 더 구체적인 하위 분야를 명시해주세요:
+            - 물리학 (예: 플라즈마 물리학, 양자역학, 열역학)
+            - 화학 (예: 유기화학, 생화학, 재료화학)
+            - 생물학 (예: 분자생물학, 생태학, 유전학)
+            - 의학 (예: 면역학, 신경과학, 종양학)
+            - 공학 (예: 전기공학, 기계공학, 화학공학)
+            - 컴퓨터 과학 (예: 인공지능, 데이터베이스, 사이버보안)
+            - 수학 (예: 대수학, 통계학, 확률론)
+            - 사회과학 (예: 경제학, 심리학, 사회학)
+            - 인문학 (예: 철학, 역사학, 언어학)
+            - 환경 과학 (예: 기후학, 생태학, 환경화학)
+            
+            응답은 간결하게 분야와 하위분야만 제공해주세요. 예: "물리학: 플라즈마 물리학"
+        """,
+        "input": """
+            연구 주제: "{topic}"
+        """,
+    },
+    "relevance": {
+        "instructions": """
+            이 요청의 마지막에 주어진 연구 주제와 논문 간의 관련성을 0.0에서 1.0 사이의 숫자로 평가해주세요.
+            
+            관련성 점수 (0.0 ~ 1.0)만 숫자로 응답해주세요. 다른 설명은 필요하지 않습니다.
+        """,
+        "input": """
+            연구 주제: "{topic}"
+            
+            논문 정보:
+            {paper_info}
+        """,
+    },
+}
+
+# 템플릿별 고정 지시문 (들여쓰기를 정리해 한 번만 만들어 둠 - 매 호출 같은 바이트열이어야 캐시됨)
+_instructions = {name: dedent(template["instructions"]).strip() for name, template in PROMPT_TEMPLATES.items()}
+_inputs = {name: dedent(template["input"]).strip() for name, template in PROMPT_TEMPLATES.items()}
+
+def build_prompt(name, **values):
+    """
+    템플릿의 고정 지시문 뒤에 이번 호출의 값(주제, 논문 정보 등)을 채운 입력을 붙여 프롬프트를 만듭니다.
+    """
+    return _instructions[name] + "\n\n---\n\n" + _inputs[name].format(**values).strip()
+
+# 템플릿별 토큰 사용량 (API 응답의 usage 기준), 프로세스 공용
+_usage_stats = {}
+_usage_lock = threading.Lock()
+
+def record_usage(name, usage):
+    """
+    GPT 응답의 usage(prompt_tokens, completion_tokens, prompt_tokens_details.cached_tokens)를 집계합니다.
+    """
+    if not usage:
+        return
+    cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+    with _usage_lock:
+        stats = _usage_stats.setdefault(name, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0,
+                                               "completion_tokens": 0})
+        stats["calls"] += 1
+        stats["prompt_tokens"] += usage.get("prompt_tokens") or 0
+        stats["cached_tokens"] += cached
+        stats["completion_tokens"] += usage.get("completion_tokens") or 0
+
+def prompt_cache_stats():
+    """
+    템플릿별 사용량과 전체 합계, 입력 토큰 중 캐시된 비율(cache_ratio)을 반환합니다.
+    """
+    with _usage_lock:
+        by_prompt = {name: dict(stats) for name, stats in _usage_stats.items()}
+    total = {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
+    for stats in by_prompt.values():
+        for key in total:
+            total[key] += stats[key]
+    for stats in list(by_prompt.values()) + [total]:
+        stats["cache_ratio"] = stats["cached_tokens"] / stats["prompt_tokens"] if stats["prompt_tokens"] else 0.0
+    return {"total": total, "by_prompt": by_prompt}
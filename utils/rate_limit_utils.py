@@ -0,0 +1,107 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+_current_limit = contextvars.ContextVar("rate_limit", default=None)
+_skipped_calls = contextvars.ContextVar("rate_limit_skipped", default=None)
+
+class RateLimit:
+    """
+    GPT 호출 속도/횟수 예산 (일괄 처리용).
+    with 블록 안(및 그 컨텍스트를 넘겨받은 작업자 스레드)에서의 호출을 분당 calls_per_minute회로 고르게 나누고,
+    max_calls회를 다 쓰거나 할당량 초과 응답을 받으면 소진 상태가 되어 이후 호출을 건너뛰게 합니다.
+    """
+    def __init__(self, calls_per_minute, max_calls=None):
+        self.interval = 60.0 / calls_per_minute if calls_per_minute else 0.0
+        self.max_calls = max_calls
+        self.calls = 0
+        self.exhausted = False
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+        self._tokens = []
+    
+    def acquire(self):
+        """
+        다음 호출 차례까지 기다립니다. 예산이 소진되었으면 기다리지 않고 False를 반환합니다.
+        """
+        with self._lock:
+            if self.exhausted:
+                return False
+            if self.max_calls is not None and self.calls >= self.max_calls:
+                self.exhausted = True
+                return False
+            self.calls += 1
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+        return True
+    
+    def pause(self, seconds):
+        """
+        속도 제한 응답(429)을 받으면 다음 호출들을 seconds초 뒤로 미룹니다.
+        """
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+    
+    def stop(self):
+        with self._lock:
+            self.exhausted = True
+    
+    def __enter__(self):
+        self._tokens.append(_current_limit.set(self))
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_limit.reset(self._tokens.pop())
+        return False
+
+def acquire_call():
+    """
+    현재 예산에서 호출 한 번을 받습니다 (필요하면 대기). 예산이 없으면 항상 True입니다.
+    """
+    limit = _current_limit.get()
+    if limit is None:
+        return True
+    if limit.acquire():
+        return True
+    report_failed_call()
+    return False
+
+def report_failed_call():
+    """
+    응답을 받지 못한 GPT 호출(예산 소진, 응답 시간 초과, API 오류)을 track_skipped_calls 목록에 기록합니다.
+    """
+    skipped = _skipped_calls.get()
+    if skipped is not None:
+        skipped.append(time.time())
+
+@contextmanager
+def track_skipped_calls():
+    """
+    with 블록 안에서 건너뛰거나 실패한 호출을 기록할 목록을 돌려줍니다 (결과가 불완전한지 판단용).
+    """
+    skipped = []
+    token = _skipped_calls.set(skipped)
+    try:
+        yield skipped
+    finally:
+        _skipped_calls.reset(token)
+
+def report_rate_limited(response):
+    """
+    429 응답을 현재 예산에 반영합니다. 할당량 초과(insufficient_quota)이면 소진, 아니면 Retry-After만큼 쉽니다.
+    """
+    limit = _current_limit.get()
+    if limit is None:
+        return
+    if "insufficient_quota" in response.text:
+        limit.stop()
+        return
+    try:
+        retry_after = float(response.headers.get("Retry-After", 20))
+    except ValueError:
+        retry_after = 20.0
+    limit.pause(retry_after)
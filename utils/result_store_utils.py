@@ -0,0 +1,207 @@
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+import zlib
+import streamlit as st
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    session TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (session, topic, kind)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sessions (
+    session TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    updated REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+# 저장/복원하는 세션 상태 키 (단계 순서)
+RESULT_KINDS = ("topic_analysis", "similar_topics", "generated_paper", "niche_topics")
+
+_local = threading.local()
+_pruned = False
+_prune_lock = threading.Lock()
+
+def _get_connection(db_path):
+    """
+    스레드별로 SQLite 연결을 재사용합니다 (처음 열 때 스키마 생성).
+    """
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir, exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        connections[db_path] = conn
+        _prune_once(conn)
+    return conn
+
+def _prune_once(conn):
+    """
+    프로세스당 한 번, 보관 기간이 지난 결과를 지웁니다.
+    """
+    global _pruned
+    with _prune_lock:
+        if _pruned:
+            return
+        _pruned = True
+    cutoff = time.time() - config.RESULT_STORE_MAX_AGE_DAYS * 86400
+    with conn:
+        conn.execute("DELETE FROM results WHERE updated < ?", (cutoff,))
+        conn.execute("DELETE FROM sessions WHERE updated < ?", (cutoff,))
+
+def _json_default(value):
+    # numpy 스칼라 등은 파이썬 기본 타입으로
+    return value.item() if hasattr(value, "item") else str(value)
+
+def _encode(value):
+    return zlib.compress(json.dumps(value, ensure_ascii=False, default=_json_default).encode("utf-8"))
+
+def _decode(payload):
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+def save_result(session, topic, kind, value, db_path=config.RESULT_STORE_PATH):
+    """
+    (세션, 주제, 종류)별 결과를 압축 JSON으로 저장합니다 (같은 키는 덮어씀).
+    """
+    conn = _get_connection(db_path)
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO results (session, topic, kind, payload, updated) VALUES (?, ?, ?, ?, ?)",
+                     (session, topic, kind, _encode(value), time.time()))
+
+def load_results(session, topic, db_path=config.RESULT_STORE_PATH):
+    """
+    세션과 주제에 저장된 결과를 {종류: 값}으로 반환합니다.
+    """
+    rows = _get_connection(db_path).execute(
+        "SELECT kind, payload FROM results WHERE session = ? AND topic = ?", (session, topic)).fetchall()
+    return {kind: _decode(payload) for kind, payload in rows}
+
+def delete_result(session, topic, kind, db_path=config.RESULT_STORE_PATH):
+    conn = _get_connection(db_path)
+    with conn:
+        conn.execute("DELETE FROM results WHERE session = ? AND topic = ? AND kind = ?", (session, topic, kind))
+
+def set_current_topic(session, topic, db_path=config.RESULT_STORE_PATH):
+    """
+    새로고침/재시작 후 복원할 세션의 현재 주제를 기록합니다.
+    """
+    conn = _get_connection(db_path)
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO sessions (session, topic, updated) VALUES (?, ?, ?)",
+                     (session, topic, time.time()))
+
+def get_current_topic(session, db_path=config.RESULT_STORE_PATH):
+    row = _get_connection(db_path).execute("SELECT topic FROM sessions WHERE session = ?", (session,)).fetchone()
+    return row[0] if row else ""
+
+def session_token():
+    """
+    결과 저장소에서 쓰는 세션 토큰. URL 쿼리(?sid=)에 두어 새로고침/재시작 후에도 유지합니다.
+    """
+    token = st.session_state.get("result_session") or st.query_params.get("sid")
+    if not token:
+        token = secrets.token_urlsafe(16)
+    st.session_state.result_session = token
+    # 페이지 이동 시 쿼리가 지워져도 다시 기록
+    if st.query_params.get("sid") != token:
+        st.query_params["sid"] = token
+    return token
+
+def _apply_results(results):
+    """
+    저장된 결과를 세션 상태에 채우고 진행 단계를 맞춥니다.
+    """
+    for kind in RESULT_KINDS:
+        st.session_state[kind] = results.get(kind) or ({} if kind in ("topic_analysis", "generated_paper") else [])
+
+    generated_paper = results.get("generated_paper")
+    st.session_state.selected_topic = generated_paper.get("topic", "") if generated_paper else ""
+    if results.get("niche_topics"):
+        st.session_state.step = 5
+    elif generated_paper:
+        st.session_state.step = 4
+    elif results.get("topic_analysis"):
+        st.session_state.step = 2
+
+def restore_session_state():
+    """
+    세션 상태가 비어 있으면(새로고침/재시작) 저장소에서 현재 주제의 결과를 복원합니다. 세션당 한 번만 실행합니다.
+    """
+    token = session_token()
+    if st.session_state.get("results_restored"):
+        return
+    st.session_state.results_restored = True
+    if st.session_state.get("topic"):
+        return
+
+    try:
+        topic = get_current_topic(token)
+        if topic:
+            st.session_state.topic = topic
+            _apply_results(load_results(token, topic))
+    except sqlite3.Error as e:
+        print(f"결과 복원 오류: {str(e)}")
+
+def set_session_topic(topic):
+    """
+    세션의 현재 주제를 바꾸고, 그 주제로 이미 저장된 결과를 세션 상태에 불러옵니다 (불러온 결과 반환).
+    """
+    token = session_token()
+    st.session_state.topic = topic
+    try:
+        set_current_topic(token, topic)
+        results = load_results(token, topic)
+    except sqlite3.Error as e:
+        print(f"결과 저장소 오류: {str(e)}")
+        results = {}
+    _apply_results(results)
+    return results
+
+def clear_session():
+    """
+    세션의 현재 주제와 저장된 결과를 모두 지웁니다 (처음으로 돌아가기). 새로고침해도 이전 결과가 복원되지 않습니다.
+    """
+    token = session_token()
+    try:
+        conn = _get_connection(config.RESULT_STORE_PATH)
+        with conn:
+            conn.execute("DELETE FROM results WHERE session = ?", (token,))
+            conn.execute("DELETE FROM sessions WHERE session = ?", (token,))
+    except sqlite3.Error as e:
+        print(f"결과 삭제 오류: {str(e)}")
+
+def remember_result(kind, value):
+    """
+    세션 상태에 결과를 넣고 현재 주제로 저장소에도 저장합니다.
+    """
+    st.session_state[kind] = value
+    try:
+        save_result(session_token(), st.session_state.get("topic", ""), kind, value)
+    except sqlite3.Error as e:
+        print(f"결과 저장 오류: {str(e)}")
+
+def forget_result(kind):
+    """
+    세션 상태와 저장소에서 결과를 지웁니다 (다시 생성할 때).
+    """
+    st.session_state.pop(kind, None)
+    try:
+        delete_result(session_token(), st.session_state.get("topic", ""), kind)
+    except sqlite3.Error as e:
+        print(f"결과 삭제 오류: {str(e)}")
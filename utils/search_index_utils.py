@@ -0,0 +1,153 @@
+import heapq
+import math
+import re
+from collections import defaultdict
+
+STOPWORDS = {
+    'the', 'a', 'an', 'and', 'or', 'but', 'is', 'are', 'in', 'on', 'at', 'to', 'for', 'of',
+    'with', 'by', 'from', 'as', 'its', 'it', 'be', 'via', 'into', 'using', 'their', 'this', 'that'
+}
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+|[가-힣]+')
+
+def normalize_token(token):
+    """
+    간단한 복수형 정규화 (plastics -> plastic, studies -> study).
+    """
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+def tokenize(text):
+    """
+    텍스트를 색인/검색용 토큰 리스트로 변환합니다.
+    """
+    if not isinstance(text, str):
+        return []
+    return [normalize_token(t) for t in _TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+class InvertedIndex:
+    """
+    필드별 BM25 점수를 지원하는 역색인.
+    문서는 0부터 시작하는 정수 ID로 식별하며, 원본 데이터는 보관하지 않습니다.
+    """
+    def __init__(self, field_weights, k1=1.2, b=0.75):
+        self.field_weights = dict(field_weights)
+        self.k1 = k1
+        self.b = b
+        self.doc_count = 0
+        # field -> term -> [(doc_id, tf), ...]
+        self.postings = {field: defaultdict(list) for field in self.field_weights}
+        self.doc_lengths = {field: [] for field in self.field_weights}
+        self.total_lengths = {field: 0 for field in self.field_weights}
+    
+    def add(self, fields):
+        """
+        문서 하나를 추가하고 문서 ID를 반환합니다. fields는 {필드명: 텍스트} 형식입니다.
+        """
+        doc_id = self.doc_count
+        self.doc_count += 1
+        for field in self.field_weights:
+            tokens = tokenize(fields.get(field))
+            counts = defaultdict(int)
+            for token in tokens:
+                counts[token] += 1
+            for term, tf in counts.items():
+                self.postings[field][term].append((doc_id, tf))
+            self.doc_lengths[field].append(len(tokens))
+            self.total_lengths[field] += len(tokens)
+        return doc_id
+    
+    def _idf(self, doc_freq):
+        return math.log(1 + (self.doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+    
+    def score(self, query, allowed=None):
+        """
+        질의와 일치하는 문서별 BM25 점수를 {doc_id: score}로 반환합니다.
+        비용은 질의 토큰의 posting 길이 합에 비례합니다.
+        allowed(문서 ID 집합 또는 문서별 불리언 마스크)가 주어지면 해당 문서만 점수를 계산합니다.
+        """
+        terms = set(tokenize(query))
+        scores = defaultdict(float)
+        if not terms or self.doc_count == 0:
+            return scores
+        if allowed is not None:
+            is_allowed = allowed.__contains__ if isinstance(allowed, (set, frozenset, dict)) else allowed.__getitem__
+        
+        for field, weight in self.field_weights.items():
+            avg_length = self.total_lengths[field] / self.doc_count or 1.0
+            lengths = self.doc_lengths[field]
+            for term in terms:
+                postings = self.postings[field].get(term)
+                if not postings:
+                    continue
+                idf = self._idf(len(postings))
+                for doc_id, tf in postings:
+                    if allowed is not None and not is_allowed(doc_id):
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * lengths[doc_id] / avg_length)
+                    scores[doc_id] += weight * idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+    
+    def search(self, query, top_k=10, allowed=None):
+        """
+        BM25 상위 top_k개 문서를 [(doc_id, score), ...]로 반환합니다 (힙 선택, 전체 정렬 없음).
+        """
+        scores = self.score(query, allowed=allowed)
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+
+
+_HANGUL_PATTERN = re.compile(r'[가-힣]')
+
+def char_ngrams(term):
+    """
+    용어의 문자 n-gram 집합을 반환합니다 (한글은 음절 2-gram, 그 외는 경계 표시를 붙인 3-gram).
+    """
+    if _HANGUL_PATTERN.search(term):
+        n, padded = 2, term
+    else:
+        n, padded = 3, f"^{term}$"
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+class NgramIndex:
+    """
+    용어 사전에 대한 문자 n-gram 역색인.
+    붙여 쓴 한국어 복합어나 철자가 조금 다른 용어처럼 정확히 일치하지 않는 토큰을 부분 일치로 찾습니다.
+    """
+    def __init__(self, terms=()):
+        self.terms = []
+        self.gram_counts = []
+        # n-gram -> [term_id, ...]
+        self.postings = defaultdict(list)
+        for term in terms:
+            self.add(term)
+    
+    def add(self, term):
+        term_id = len(self.terms)
+        grams = char_ngrams(term)
+        self.terms.append(term)
+        self.gram_counts.append(len(grams))
+        for gram in grams:
+            self.postings[gram].append(term_id)
+        return term_id
+    
+    def lookup(self, token, min_similarity=0.6, top_k=3):
+        """
+        n-gram 다이스 계수가 min_similarity 이상인 용어를 [(용어, 유사도), ...]로 반환합니다.
+        """
+        grams = char_ngrams(token)
+        overlaps = defaultdict(int)
+        for gram in grams:
+            for term_id in self.postings.get(gram, ()):
+                overlaps[term_id] += 1
+        
+        matches = []
+        for term_id, overlap in overlaps.items():
+            similarity = 2 * overlap / (len(grams) + self.gram_counts[term_id])
+            if similarity >= min_similarity:
+                matches.append((self.terms[term_id], similarity))
+        return heapq.nlargest(top_k, matches, key=lambda item: item[1])
@@ -0,0 +1,47 @@
+import sys
+from contextlib import nullcontext
+
+def script_run_ctx():
+    """
+    현재 스레드의 Streamlit 스크립트 컨텍스트를 반환합니다 (Streamlit 밖이면 None).
+    Streamlit을 이미 불러온 경우에만 확인하므로 CLI/배치 실행 시 Streamlit을 불러오지 않습니다.
+    """
+    if "streamlit" not in sys.modules:
+        return None
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    return get_script_run_ctx(suppress_warning=True)
+
+def in_streamlit():
+    """
+    Streamlit 스크립트(또는 그 컨텍스트를 넘겨받은 작업자 스레드) 안에서 실행 중인지 확인합니다.
+    """
+    return script_run_ctx() is not None
+
+def show_error(message):
+    """
+    오류 메시지를 화면(Streamlit) 또는 표준 오류(CLI)에 표시합니다.
+    """
+    if in_streamlit():
+        import streamlit as st
+        st.error(message)
+    else:
+        print(message, file=sys.stderr)
+
+def show_warning(message):
+    if in_streamlit():
+        import streamlit as st
+        st.warning(message)
+    else:
+        print(message, file=sys.stderr)
+
+def spinner(message):
+    """
+    진행 중 표시. Streamlit 밖에서는 아무것도 하지 않습니다.
+    """
+    if in_streamlit():
+        import streamlit as st
+        return st.spinner(message)
+    return nullcontext()
@@ -0,0 +1,317 @@
+import json
+import os
+import zlib
+import numpy as np
+from utils.search_index_utils import tokenize
+
+def text_features(text):
+    """
+    텍스트에서 단어, 단어 bigram, 단어 내부 문자 4-gram 특성을 추출합니다.
+    문자 n-gram은 철자가 비슷한 단어(예: photosynthesis/photosynthetic)를 연결해 줍니다.
+    """
+    tokens = tokenize(text)
+    features = list(tokens)
+    features += [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    for token in tokens:
+        padded = f"<{token}>"
+        if len(padded) > 4:
+            features += ["#" + padded[i:i + 4] for i in range(len(padded) - 3)]
+    return features
+
+def hash_feature(feature, dim):
+    """
+    프로세스와 무관하게 항상 같은 값을 주는 해시 (파이썬 hash()는 실행마다 달라짐).
+    """
+    return zlib.crc32(feature.encode("utf-8")) % dim
+
+def hashed_counts(text, dim):
+    """
+    텍스트의 해시 특성별 빈도를 (열 인덱스 배열, 빈도 배열)로 반환합니다.
+    """
+    columns = np.fromiter((hash_feature(f, dim) for f in text_features(text)), dtype=np.int64)
+    if columns.size == 0:
+        return columns, np.zeros(0, dtype=np.float32)
+    columns, counts = np.unique(columns, return_counts=True)
+    return columns, counts.astype(np.float32)
+
+class SparseRows:
+    """
+    CSR 형식의 희소 행렬 (numpy 배열만 사용).
+    """
+    def __init__(self, indptr, indices, data, n_cols):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.n_rows = len(indptr) - 1
+        self.n_cols = n_cols
+        self._row_ids = np.repeat(np.arange(self.n_rows), np.diff(indptr))
+        self._csc_order = None
+    
+    def dot(self, dense, chunk_nnz=200000):
+        """
+        희소 행렬 @ dense 행렬.
+        """
+        out = np.zeros((self.n_rows, dense.shape[1]), dtype=np.float32)
+        self._segment_sum(self._row_ids, self.indices, out, dense, chunk_nnz)
+        return out
+    
+    def t_dot(self, dense, chunk_nnz=200000):
+        """
+        희소 행렬의 전치 @ dense 행렬.
+        """
+        if self._csc_order is None:
+            self._csc_order = np.argsort(self.indices, kind="stable")
+        order = self._csc_order
+        out = np.zeros((self.n_cols, dense.shape[1]), dtype=np.float32)
+        self._segment_sum(self.indices[order], self._row_ids[order], out, dense, chunk_nnz, order)
+        return out
+    
+    def _segment_sum(self, targets, sources, out, dense, chunk_nnz, order=None):
+        # targets가 정렬되어 있으므로 reduceat으로 구간 합을 계산
+        data = self.data if order is None else self.data[order]
+        for start in range(0, len(targets), chunk_nnz):
+            end = min(start + chunk_nnz, len(targets))
+            chunk_targets = targets[start:end]
+            products = data[start:end, None] * dense[sources[start:end]]
+            boundaries = np.flatnonzero(np.r_[True, chunk_targets[1:] != chunk_targets[:-1]])
+            out[chunk_targets[boundaries]] += np.add.reduceat(products, boundaries, axis=0)
+
+def _orthonormalize(matrix):
+    q, _ = np.linalg.qr(matrix)
+    return q.astype(np.float32)
+
+def randomized_svd_components(matrix, rank, oversample=10, n_iter=2, seed=0):
+    """
+    희소 행렬의 상위 rank개 오른쪽 특이벡터(rank × n_cols)를 무작위 SVD로 구합니다.
+    """
+    rng = np.random.default_rng(seed)
+    sketch = rng.standard_normal((matrix.n_cols, rank + oversample)).astype(np.float32)
+    q = _orthonormalize(matrix.dot(sketch))
+    for _ in range(n_iter):
+        q = _orthonormalize(matrix.t_dot(q))
+        q = _orthonormalize(matrix.dot(q))
+    # B = Q^T X 의 SVD
+    b = matrix.t_dot(q).T
+    _, _, vt = np.linalg.svd(b, full_matrices=False)
+    return vt[:rank].astype(np.float32)
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+class LsaModel:
+    """
+    해시 n-gram TF-IDF + SVD(잠재 의미 분석)로 텍스트를 저차원 밀집 벡터로 변환합니다.
+    문서 벡터는 L2 정규화되어 있어 내적이 곧 코사인 유사도입니다.
+    """
+    def __init__(self, idf, components, hash_dim):
+        self.idf = idf
+        self.components = components
+        self.hash_dim = hash_dim
+    
+    @classmethod
+    def fit(cls, texts, hash_dim, rank):
+        """
+        텍스트 목록으로 모델을 학습하고 (모델, 문서 벡터 행렬)을 반환합니다.
+        """
+        rows = [hashed_counts(text, hash_dim) for text in texts]
+        lengths = np.array([len(cols) for cols, _ in rows], dtype=np.int64)
+        indptr = np.r_[0, np.cumsum(lengths)]
+        indices = np.concatenate([cols for cols, _ in rows]) if rows else np.zeros(0, dtype=np.int64)
+        counts = np.concatenate([vals for _, vals in rows]) if rows else np.zeros(0, dtype=np.float32)
+        
+        doc_freq = np.bincount(indices, minlength=hash_dim)
+        idf = (np.log((1 + len(texts)) / (1 + doc_freq)) + 1).astype(np.float32)
+        
+        # 서브선형 TF * IDF, 행 정규화
+        data = (1 + np.log(counts)) * idf[indices]
+        row_ids = np.repeat(np.arange(len(texts)), lengths)
+        norms = np.sqrt(np.bincount(row_ids, weights=data * data, minlength=len(texts)))
+        norms[norms == 0] = 1.0
+        data = (data / norms[row_ids]).astype(np.float32)
+        
+        matrix = SparseRows(indptr, indices, data, hash_dim)
+        rank = min(rank, max(1, len(texts) - 1))
+        components = randomized_svd_components(matrix, rank)
+        vectors = _normalize_rows(matrix.dot(components.T)).astype(np.float32)
+        return cls(idf, components, hash_dim), vectors
+    
+    def transform(self, text):
+        """
+        질의 텍스트를 정규화된 밀집 벡터로 변환합니다 (0이 아닌 특성 열만 사용).
+        """
+        columns, counts = hashed_counts(text, self.hash_dim)
+        vector = np.zeros(self.components.shape[0], dtype=np.float32)
+        if columns.size == 0:
+            return vector
+        weights = (1 + np.log(counts)) * self.idf[columns]
+        vector = np.asarray(self.components[:, columns] @ weights, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+    
+    def save(self, directory, prefix):
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, f"{prefix}.idf.npy"), self.idf)
+        np.save(os.path.join(directory, f"{prefix}.components.npy"), self.components)
+        with open(os.path.join(directory, f"{prefix}.lsa.json"), "w", encoding="utf-8") as f:
+            json.dump({"hash_dim": self.hash_dim}, f)
+    
+    @classmethod
+    def load(cls, directory, prefix):
+        with open(os.path.join(directory, f"{prefix}.lsa.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        idf = np.load(os.path.join(directory, f"{prefix}.idf.npy"), mmap_mode="r")
+        components = np.load(os.path.join(directory, f"{prefix}.components.npy"), mmap_mode="r")
+        return cls(idf, components, meta["hash_dim"])
+
+def top_k_similar(matrix, query_vector, top_k, allowed=None):
+    """
+    행렬-벡터 곱 한 번과 argpartition으로 코사인 유사도 상위 top_k를 [(행, 점수), ...]로 반환합니다.
+    allowed(행 번호 배열)가 주어지면 해당 행 안에서만 찾습니다.
+    """
+    if allowed is not None:
+        rows = np.asarray(allowed)
+        scores = matrix[rows] @ query_vector
+    else:
+        rows = None
+        scores = matrix @ query_vector
+    if scores.size == 0:
+        return []
+    k = min(top_k, scores.size)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    candidates = candidates[np.argsort(-scores[candidates])]
+    if rows is not None:
+        return [(int(rows[i]), float(scores[i])) for i in candidates]
+    return [(int(i), float(scores[i])) for i in candidates]
+
+def _spherical_kmeans(vectors, n_clusters, n_iter=10, sample_size=100000, seed=0):
+    """
+    정규화된 벡터에 대한 구면 k-means 중심점을 구합니다 (큰 데이터는 표본으로 학습).
+    """
+    rng = np.random.default_rng(seed)
+    if len(vectors) > sample_size:
+        vectors = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+    vectors = np.asarray(vectors, dtype=np.float32)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        for cluster in range(n_clusters):
+            members = vectors[assignment == cluster]
+            if len(members):
+                centroids[cluster] = members.sum(axis=0)
+            else:
+                # 빈 군집은 임의 벡터로 다시 시작
+                centroids[cluster] = vectors[rng.integers(len(vectors))]
+        centroids = _normalize_rows(centroids).astype(np.float32)
+    return centroids
+
+class IvfIndex:
+    """
+    역파일(IVF) 방식의 근사 최근접 이웃 색인.
+    벡터를 n_lists개 군집으로 나누고, 질의 시 가장 가까운 n_probe개 군집만 탐색합니다.
+    n_probe를 키우면 재현율이, 줄이면 속도가 올라갑니다.
+    """
+    def __init__(self, centroids, list_ids, list_vectors):
+        self.centroids = centroids
+        # 군집별 (id 배열, 벡터 행렬) - 디스크에서 읽은 경우 메모리 매핑 조각
+        self.list_ids = list_ids
+        self.list_vectors = list_vectors
+    
+    @classmethod
+    def train(cls, vectors, ids=None, n_lists=0):
+        """
+        벡터로 군집 중심을 학습하고 모든 벡터를 추가한 색인을 만듭니다.
+        n_lists가 0이면 sqrt(N)개를 사용합니다.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if ids is None:
+            ids = np.arange(len(vectors))
+        if not n_lists:
+            n_lists = max(1, int(np.sqrt(len(vectors))))
+        n_lists = min(n_lists, len(vectors))
+        centroids = _spherical_kmeans(vectors, n_lists)
+        dim = vectors.shape[1]
+        index = cls(centroids,
+                    [np.zeros(0, dtype=np.int64) for _ in range(n_lists)],
+                    [np.zeros((0, dim), dtype=np.float32) for _ in range(n_lists)])
+        index.add(ids, vectors)
+        return index
+    
+    def __len__(self):
+        return sum(len(ids) for ids in self.list_ids)
+    
+    def add(self, ids, vectors, batch_size=100000):
+        """
+        벡터를 가장 가까운 군집에 추가합니다 (재학습 없이 점진적으로 삽입).
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        for start in range(0, len(ids), batch_size):
+            batch_ids = ids[start:start + batch_size]
+            batch_vectors = vectors[start:start + batch_size]
+            assignment = np.argmax(batch_vectors @ self.centroids.T, axis=1)
+            for cluster in np.unique(assignment):
+                mask = assignment == cluster
+                self.list_ids[cluster] = np.concatenate([self.list_ids[cluster], batch_ids[mask]])
+                self.list_vectors[cluster] = np.concatenate([self.list_vectors[cluster], batch_vectors[mask]])
+    
+    def search(self, query_vector, top_k, n_probe=8, allowed=None):
+        """
+        근사 코사인 유사도 상위 top_k를 [(id, 점수), ...]로 반환합니다.
+        allowed(id 집합 또는 불리언 마스크)가 주어지면 해당 id만 결과에 포함합니다.
+        """
+        n_probe = min(n_probe, len(self.centroids))
+        centroid_scores = self.centroids @ query_vector
+        probe = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+        
+        ids = np.concatenate([self.list_ids[c] for c in probe])
+        if ids.size == 0:
+            return []
+        scores = np.concatenate([np.asarray(self.list_vectors[c] @ query_vector) for c in probe])
+        
+        if allowed is not None:
+            if isinstance(allowed, np.ndarray) and allowed.dtype == bool:
+                keep = allowed[ids]
+            else:
+                keep = np.isin(ids, np.fromiter(allowed, dtype=np.int64))
+            ids, scores = ids[keep], scores[keep]
+            if ids.size == 0:
+                return []
+        
+        k = min(top_k, scores.size)
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(int(ids[i]), float(scores[i])) for i in best]
+    
+    def save(self, directory):
+        """
+        군집 순서로 연속 저장합니다 (centroids/ids/vectors/offsets .npy).
+        """
+        os.makedirs(directory, exist_ok=True)
+        offsets = np.r_[0, np.cumsum([len(ids) for ids in self.list_ids])].astype(np.int64)
+        dim = self.centroids.shape[1]
+        ids = np.concatenate(self.list_ids) if self.list_ids else np.zeros(0, dtype=np.int64)
+        vectors = np.concatenate(self.list_vectors) if self.list_vectors else np.zeros((0, dim), dtype=np.float32)
+        for name, array in (("centroids", self.centroids), ("offsets", offsets), ("ids", ids), ("vectors", vectors)):
+            tmp_path = os.path.join(directory, f"{name}.tmp.npy")
+            np.save(tmp_path, np.asarray(array))
+            os.replace(tmp_path, os.path.join(directory, f"{name}.npy"))
+    
+    @classmethod
+    def load(cls, directory):
+        """
+        저장된 색인을 메모리 매핑으로 읽습니다.
+        """
+        centroids = np.load(os.path.join(directory, "centroids.npy"))
+        offsets = np.load(os.path.join(directory, "offsets.npy"))
+        ids = np.load(os.path.join(directory, "ids.npy"), mmap_mode="r")
+        vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r")
+        list_ids = [ids[offsets[i]:offsets[i + 1]] for i in range(len(centroids))]
+        list_vectors = [vectors[offsets[i]:offsets[i + 1]] for i in range(len(centroids))]
+        return cls(centroids, list_ids, list_vectors)
+    
+    @staticmethod
+    def exists(directory):
+        return all(os.path.exists(os.path.join(directory, f"{name}.npy"))
+                   for name in ("centroids", "offsets", "ids", "vectors"))